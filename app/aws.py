@@ -1,10 +1,180 @@
+import threading
+
 import boto3
+from botocore.config import Config
+
 from .config import settings
+from app.core.metrics import AWS_POOL_IN_USE, AWS_POOL_MAX
+from app.core.tracing import instrument_tracing
+
+# Os clients são construídos sob demanda (e cacheados) para que importar o app
+# não pague o custo de carregar os service models do botocore.
+_lock = threading.RLock()
+_session: boto3.session.Session | None = None
+_clients: dict = {}
+
+
+def get_session() -> boto3.session.Session:
+    """Sessão boto3 única do processo."""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = boto3.session.Session(region_name=settings.aws_region)
+    return _session
+
+
+def client_config(**overrides) -> Config:
+    """
+    Config único de pool/keep-alive/timeouts/retries para todos os clients boto3.
+    `overrides` permite ajustes específicos (ex.: s3 addressing_style).
+    """
+    params = dict(
+        max_pool_connections=settings.aws_max_pool_connections,
+        tcp_keepalive=settings.aws_tcp_keepalive,
+        connect_timeout=settings.aws_connect_timeout_seconds,
+        read_timeout=settings.aws_read_timeout_seconds,
+        retries={"max_attempts": settings.aws_max_attempts, "mode": settings.aws_retry_mode},
+    )
+    params.update(overrides)
+    return Config(**params)
+
+
+def instrument_pool(client, service: str):
+    """Registra hooks que mantêm o gauge de conexões em uso do pool."""
+    meta = getattr(client, "meta", None)
+    if meta is None:  # client fake/stub sem event system
+        return client
+    gauge = AWS_POOL_IN_USE.labels(service=service)
+    AWS_POOL_MAX.labels(service=service).set(meta.config.max_pool_connections)
+
+    def _acquire(**kwargs):
+        gauge.inc()  # não retorna nada: before-send só curto-circuita se houver retorno
+
+    def _release(**kwargs):
+        gauge.dec()  # None: não interfere na decisão de retry do botocore
+
+    # por tentativa HTTP (inclui retries). needs-retry sai depois de toda tentativa,
+    # com resposta ou com exceção de rede; response-received não sai quando o
+    # send levanta (timeout, reset) e o gauge ficaria subindo para sempre
+    meta.events.register("before-send", _acquire)
+    meta.events.register("needs-retry", _release)
+    return client
+
+
+def get_memory_backend():
+    """Estado compartilhado do backend em memória (AWS_BACKEND=memory)."""
+    return _cached("memory", _new_memory_backend)
+
+
+def _new_memory_backend():
+    # o dublê vive em tests/ (fora do pacote e da imagem): só testes e benchmarks o têm
+    try:
+        from tests.memory_aws import MemoryAWS
+    except ImportError:
+        raise RuntimeError("AWS_BACKEND=memory é só para testes/benchmarks (requer tests/memory_aws.py no path)") from None
+    return MemoryAWS(settings.aws_endpoint_url)
+
+
+def _new_client(service: str, pool_label: str | None = None, **config_overrides):
+    """`pool_label` separa o gauge de pool quando o mesmo serviço tem mais de um client."""
+    if settings.aws_backend == "memory":
+        return get_memory_backend().client(service)
+    client = get_session().client(
+        service, endpoint_url=settings.aws_endpoint_url, config=client_config(**config_overrides)
+    )
+    return instrument_tracing(instrument_pool(client, pool_label or service), service)
+
+
+def _new_resource(service: str):
+    if settings.aws_backend == "memory":
+        return get_memory_backend().resource(service)
+    resource = get_session().resource(service, endpoint_url=settings.aws_endpoint_url, config=client_config())
+    instrument_pool(resource.meta.client, service)
+    instrument_tracing(resource.meta.client, service)
+    return resource
+
+
+def _cached(name: str, factory):
+    obj = _clients.get(name)
+    if obj is None:
+        with _lock:
+            obj = _clients.get(name)
+            if obj is None:
+                obj = factory()
+                _clients[name] = obj
+    return obj
+
+
+def get_s3():
+    return _cached("s3", lambda: _new_client("s3"))
+
+
+def get_s3_path_style():
+    """Client S3 path-style do app.services.storage (evita issues de virtual-host no LocalStack)."""
+    return _cached("s3_path", lambda: _new_client("s3", "s3_path", s3={"addressing_style": "path"}))
+
+
+def get_sqs():
+    return _cached("sqs", lambda: _new_client("sqs"))
+
+
+def get_ddb():
+    return _cached("ddb", lambda: _new_resource("dynamodb"))
+
+
+def _videos_table():
+    if settings.aws_backend == "memory":
+        # sem infra para provisionar: a tabela nasce com o schema do Terraform
+        return get_memory_backend().dynamodb.ensure_table(settings.ddb_table, "id_video")
+    return get_ddb().Table(settings.ddb_table)
+
+
+def get_table_videos():
+    return _cached("table_videos", _videos_table)
+
+
+def init_clients() -> None:
+    """Constrói todos os clients de uma vez (warm-up opcional no lifespan)."""
+    get_s3()
+    get_sqs()
+    get_table_videos()
+
+
+def reset_clients() -> None:
+    """Descarta clients/sessão cacheados (e o estado do backend em memória); o próximo uso reconstrói."""
+    global _session
+    with _lock:
+        for name in ("s3", "s3_path", "sqs"):
+            client = _clients.get(name)
+            close = getattr(client, "close", None)
+            if close:
+                try:
+                    close()
+                except Exception:
+                    pass
+        _clients.clear()
+        _session = None
+
+
+class _LazyClient:
+    """Proxy que adia a construção do client até o primeiro acesso de atributo."""
+
+    __slots__ = ("_factory",)
+
+    def __init__(self, factory):
+        self._factory = factory
+
+    def __getattr__(self, name):
+        return getattr(self._factory(), name)
+
+    def __repr__(self) -> str:
+        return f"<lazy {self._factory.__name__}>"
 
-_session = boto3.session.Session(region_name=settings.aws_region)
 
-s3 = _session.client("s3", endpoint_url=settings.aws_endpoint_url)
-ddb = _session.resource("dynamodb", endpoint_url=settings.aws_endpoint_url)
-sqs = _session.client("sqs", endpoint_url=settings.aws_endpoint_url)
+# Mantém os nomes públicos de antes (`from app.aws import s3, sqs`)
+s3 = _LazyClient(get_s3)
+ddb = _LazyClient(get_ddb)
+sqs = _LazyClient(get_sqs)
 
-table_videos = ddb.Table(settings.ddb_table)
+table_videos = _LazyClient(get_table_videos)
@@ -17,7 +17,68 @@ class Settings(BaseSettings):
     s3_bucket: str = "video-service-bucket"
     ddb_table: str = "videos"
     sqs_queue_url: str = ""
+    # Filas por classe de job (vazias = usa sqs_queue_url)
+    sqs_queue_url_small: Optional[str] = None
+    sqs_queue_url_large: Optional[str] = None
+    sqs_queue_url_priority: Optional[str] = None
+    job_large_threshold_mb: int = 50
+    job_priority_roles: str = "admin"   # roles (UserContext.role) separados por vírgula
+    # Corpo do job acima disso vai gzip+base64 (envelope compacto, ver services/job_codec)
+    job_message_gzip_threshold_bytes: int = 1024
     max_upload_mb: int = 200
+    # Uploads até N MB ficam em memória; acima disso o parser já grava em disco
+    # (UPLOAD_SPOOL_DIR: volume dedicado; None = tempdir padrão do sistema)
+    upload_spool_max_memory_mb: int = 8
+    upload_spool_dir: Optional[str] = None
+    # POST /videos/upload:batch: máximo de arquivos por request e quantos vão ao S3 em paralelo
+    upload_batch_max_files: int = 50
+    upload_batch_concurrency: int = 4
+    # Tracing OpenTelemetry (desligado = sem custo; ver app/core/tracing.py)
+    otel_enabled: bool = False
+    otel_service_name: str = "video-upload-service"
+    otel_exporter_otlp_endpoint: Optional[str] = None  # ex.: http://localhost:4318/v1/traces
+    otel_sample_ratio: float = 1.0
+    # Profiling: /debug/profile (admin) limita a duração; >0 liga a captura de
+    # stacks de requests acima de N ms (últimas PROFILE_SLOW_KEEP em /debug/profile/slow)
+    profile_max_seconds: int = 60
+    profile_slow_request_ms: int = 0
+    profile_slow_keep: int = 20
+    # Lag do event loop (0 = desligado); LOOP_BLOCK_DEBUG loga a stack de quem
+    # segurar o loop além de LOOP_BLOCK_THRESHOLD_MS
+    loop_lag_interval_ms: int = 100
+    loop_block_threshold_ms: int = 100
+    loop_block_debug: bool = False
+    # Devolve a quebra de tempo por etapa no header Server-Timing (o log de acesso sempre tem).
+    # Desligado por padrão: expõe tempos internos a qualquer cliente; ligar só em dev/staging
+    server_timing_header: bool = False
+    # Write-behind no DynamoDB: put() entra num buffer em memória e uma thread grava
+    # com BatchWriteItem (25 por chamada); buffer cheio = gravação síncrona
+    ddb_write_behind: bool = False
+    ddb_write_behind_max_items: int = 1000
+    ddb_write_behind_flush_ms: int = 50
+    ddb_write_behind_max_retries: int = 5
+    # VideoRepo.update_status_many: updates condicionais em paralelo
+    ddb_batch_update_concurrency: int = 8
+    # "boto3" (AWS/LocalStack) ou "memory" (stand-in em processo p/ testes e benchmarks)
+    aws_backend: str = "boto3"
+    # Constrói os clients AWS no startup (lifespan) em vez de no primeiro uso
+    aws_eager_init: bool = False
+
+    # Pool/timeout/retry dos clients boto3 (um único botocore Config p/ todos)
+    # max_pool_connections ~ concorrência do worker (threadpool do anyio = 40 + folga)
+    aws_max_pool_connections: int = 50
+    aws_connect_timeout_seconds: float = 5
+    aws_read_timeout_seconds: float = 60
+    aws_tcp_keepalive: bool = True
+    aws_retry_mode: str = "adaptive"
+    aws_max_attempts: int = 5
+
+    # Upload multipart no S3: acima do threshold o corpo vai em partes paralelas
+    # (S3 exige parte >= 5 MiB, exceto a última)
+    s3_multipart_threshold_mb: int = 16
+    s3_part_size_mb: int = 8
+    s3_upload_concurrency: int = 4
+    s3_part_max_retries: int = 3
 
     # Vars do Auth (obrigatório: auth_base_url)
     # Mapear tanto MAIÚSCULA (env) quanto snake_case se quiser
@@ -34,6 +95,43 @@ class Settings(BaseSettings):
         validation_alias=AliasChoices("AUTH_CACHE_TTL_SECONDS", "auth_cache_ttl_seconds"),
     )
 
+    # Pool httpx do AuthClient
+    auth_max_connections: int = Field(
+        100,
+        validation_alias=AliasChoices("AUTH_MAX_CONNECTIONS", "auth_max_connections"),
+    )
+    auth_max_keepalive_connections: int = Field(
+        20,
+        validation_alias=AliasChoices("AUTH_MAX_KEEPALIVE_CONNECTIONS", "auth_max_keepalive_connections"),
+    )
+    auth_keepalive_expiry_seconds: float = Field(
+        30,
+        validation_alias=AliasChoices("AUTH_KEEPALIVE_EXPIRY_SECONDS", "auth_keepalive_expiry_seconds"),
+    )
+    # HTTP/2 (multiplexação) para o Auth Service; requer o pacote `h2` e negocia via ALPN (https)
+    auth_http2: bool = Field(
+        False,
+        validation_alias=AliasChoices("AUTH_HTTP2", "auth_http2"),
+    )
+
+    # Circuit breaker do /me + grace mode (serve payload expirado enquanto o Auth cai)
+    auth_breaker_failure_rate: float = 0.5
+    auth_breaker_window: int = 20
+    auth_breaker_min_calls: int = 5
+    auth_breaker_open_seconds: float = 30
+    auth_stale_grace_seconds: int = 300
+
+    # Cache negativo de tokens rejeitados (401/403), por hash do token
+    auth_negative_cache_ttl_seconds: int = 5
+    auth_negative_cache_max_entries: int = 10000
+
+    # Cache do /me: L1 no processo (LRU) + L2 opcional compartilhado ("memory" | "redis")
+    auth_cache_max_entries: int = 10000
+    auth_cache_backend: str = "memory"
+    auth_cache_redis_url: Optional[str] = None
+    # Renova em background entradas a menos de N s de expirar (0 desliga)
+    auth_refresh_ahead_seconds: float = 5
+
     # pydantic-settings v2
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -1,24 +1,54 @@
 # app/core/auth.py
-from typing import Any, Dict, Optional
-from fastapi import Depends, HTTPException, status, Security
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+"""
+Subsistema único de autenticação: um AuthClient (pool httpx + cache do /me)
+compartilhado por todas as dependencies. `app.auth` só reexporta os nomes
+públicos deste módulo, mantido por compatibilidade de imports.
+"""
+from __future__ import annotations
+from typing import Any, Dict, Iterable, Optional
+from fastapi import Depends, HTTPException, Request, Security, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from app.infrastructure.clients.auth_client import AuthClient
+from app.domain.models.user_model import UserContext
+from app.core.logging import set_request_context
+from app.core.timing import timed
 import httpx
 import hashlib
 import logging
 
-auth_client: Optional[AuthClient] = None  # inicializado no lifespan (main.py)
-security_scheme = HTTPBearer(auto_error=False)
 logger = logging.getLogger("auth")
 
+_auth_client: Optional[AuthClient] = None  # único client do processo (lifespan ou on-demand)
+bearer_scheme = HTTPBearer(auto_error=False)
+security_scheme = bearer_scheme
+
+
 def _safe_token_id(token: str) -> str:
+    # não loga o token; loga um identificador abreviado
     return hashlib.sha1(token.encode()).hexdigest()[:8]
 
+
+def set_auth_client(client: Optional[AuthClient]) -> None:
+    """
+    Injeta o client compartilhado (lifespan, testes ou inicialização manual).
+    Ex.: set_auth_client(AuthClient(base_url="http://auth-service:8000", ...))
+    """
+    global _auth_client
+    _auth_client = client
+
+
+async def close_auth_client() -> None:
+    global _auth_client
+    client, _auth_client = _auth_client, None
+    if client is not None:
+        await client.aclose()
+
+
 def _ensure_client():
-    global auth_client
-    if auth_client is not None:
-        return auth_client
+    global _auth_client
+    if _auth_client is not None:
+        return _auth_client
     # cria on-demand a partir de settings
     try:
         from app.config import settings
@@ -39,9 +69,10 @@ def _ensure_client():
             detail="Serviço de autenticação indisponível"
         )
 
-    auth_client = AuthClient(base_url=base_url, timeout_seconds=timeout, cache_ttl=ttl)
+    _auth_client = AuthClient(base_url=base_url, timeout_seconds=timeout, cache_ttl=ttl)
     logger.info("AuthClient criado on-demand (base_url=%s)", base_url)
-    return auth_client
+    return _auth_client
+
 
 async def _fetch_me(token: str):
     tid = _safe_token_id(token)
@@ -49,10 +80,14 @@ async def _fetch_me(token: str):
     try:
         logger.debug("Chamando /me (token_id=%s)", tid)
         data = await client.me(token)
-        logger.info("Auth OK (token_id=%s)", tid)
+        logger.debug("Auth OK (token_id=%s)", tid)
         return data
     except httpx.HTTPStatusError as e:
-        body = e.response.text[:200]
+        body = ""
+        try:
+            body = e.response.text[:200]
+        except Exception:
+            pass
         sc = getattr(e.response, "status_code", "unknown")
         url = getattr(e.request, "url", "unknown")
         logger.warning(
@@ -75,9 +110,77 @@ async def _fetch_me(token: str):
             detail="Auth Service inacessível"
         )
 
+
+async def require_user(
+    credentials: HTTPAuthorizationCredentials = Security(bearer_scheme),
+    request: Request = None,
+) -> UserContext:
+    # memoizado por request: router e endpoint compartilham o mesmo UserContext
+    if request is not None:
+        cached = getattr(request.state, "user", None)
+        if cached is not None:
+            return cached
+
+    if not credentials:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing bearer token")
+
+    token = credentials.credentials
+    with timed("auth"):
+        payload = await _fetch_me(token)  # GET no auth-service /me (cacheado no AuthClient)
+
+    try:
+        user = UserContext(**payload)
+    except Exception as e:
+        # fallback amigável para diferenças de key (se algum campo vier faltando, etc.)
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Invalid /me payload: {e}")
+
+    if request is not None:
+        request.state.user = user  # handlers, middleware de log e rate limiting reaproveitam
+    if payload.get("id") is not None:
+        set_request_context(user_id=str(payload["id"]))
+    return user
+
+
+async def require_admin(user: UserContext = Depends(require_user)) -> UserContext:
+    if getattr(user, "role", None) != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Acesso restrito a administradores")
+    return user
+
+
+def current_user(request: Request) -> Optional[UserContext]:
+    """UserContext já resolvido neste request (None se a rota não autentica)."""
+    return getattr(request.state, "user", None)
+
+
+def _has_every(scope_needed: Iterable[str], scopes_user: Iterable[str]) -> bool:
+    want = set(s.strip() for s in scope_needed if s and s.strip())
+    have = set(s.strip() for s in scopes_user if s and s.strip())
+    return want.issubset(have)
+
+
+async def require_scopes(
+    scope_list: Iterable[str],
+    credentials: HTTPAuthorizationCredentials = Security(bearer_scheme)
+) -> Dict[str, Any]:
+    """
+    Exemplo opcional de dependency para checar escopos além de validar o token.
+    Uso: Depends(partial(require_scopes, ["videos:read"]))
+    """
+    user = await require_user(credentials)
+    user_scopes = user.get("scopes") or user.get("scope") or []
+    # "scope" pode vir como string "a b c"
+    if isinstance(user_scopes, str):
+        user_scopes = [s for s in user_scopes.split() if s]
+
+    if not _has_every(scope_list, user_scopes):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Escopo insuficiente")
+    return user
+
+
 def get_auth_client() -> AuthClient:
-    assert auth_client is not None, "AuthClient não inicializado"
-    return auth_client
+    assert _auth_client is not None, "AuthClient não inicializado"
+    return _auth_client
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Security(security_scheme),
@@ -2,6 +2,8 @@
 import logging, json, sys, contextvars
 from datetime import datetime
 
+from app.core.tracing import current_trace_id
+
 _request_id: contextvars.ContextVar[str | None] = contextvars.ContextVar("req_id", default=None)
 _user_id:    contextvars.ContextVar[str | None] = contextvars.ContextVar("user_id", default=None)
 
@@ -19,8 +21,11 @@ class JsonFormatter(logging.Formatter):
             "request_id": _request_id.get(),
             "user_id": _user_id.get(),
         }
+        trace_id = current_trace_id()
+        if trace_id:
+            payload["trace_id"] = trace_id
         # anexar extras usuais se existirem
-        for k in ("path", "method", "status", "duration_ms", "size_bytes"):
+        for k in ("path", "method", "status", "duration_ms", "size_bytes", "timings"):
             v = getattr(record, k, None)
             if v is not None: payload[k] = v
         return json.dumps(payload, ensure_ascii=False)
@@ -0,0 +1,105 @@
+# app/core/loop_monitor.py
+"""
+Saúde do event loop: lag de agendamento contínuo + detector de bloqueio.
+
+* Uma task acorda a cada LOOP_LAG_INTERVAL_MS e mede quanto atrasou em
+  relação ao sleep pedido (o tempo que outro callback segurou o loop);
+  vai para o histograma `event_loop_lag_seconds`.
+* Com LOOP_BLOCK_DEBUG=true, uma thread watchdog olha o último "batimento"
+  da task: se o loop ficar parado mais que LOOP_BLOCK_THRESHOLD_MS, loga a
+  stack da thread do loop *enquanto* o callback culpado ainda está rodando
+  (ex.: chamada boto3 síncrona dentro de um endpoint async).
+"""
+import asyncio
+import logging
+import threading
+import time
+from typing import Optional
+
+from app.core.metrics import EVENT_LOOP_BLOCKS, EVENT_LOOP_LAG
+from app.core.profiling import thread_stack
+
+logger = logging.getLogger("loop")
+
+
+class LoopMonitor:
+    def __init__(self, interval: float = 0.1, block_threshold: float = 0.1, debug: bool = False):
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.debug = debug
+        self.max_lag = 0.0
+        self.blocks = 0
+        self._beat = time.monotonic()
+        self._loop_thread: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    async def _measure(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            self._beat = time.monotonic()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - start - self.interval)
+            self.max_lag = max(self.max_lag, lag)
+            EVENT_LOOP_LAG.observe(lag)
+
+    def _watch(self) -> None:
+        reported = None
+        while not self._stop.wait(min(self.block_threshold / 2, self.interval)):
+            beat = self._beat
+            blocked = time.monotonic() - beat - self.interval
+            if blocked < self.block_threshold or reported == beat:
+                continue
+            reported = beat  # um log por bloqueio, mesmo que dure vários ciclos
+            self.blocks += 1
+            EVENT_LOOP_BLOCKS.inc()
+            stack = thread_stack(self._loop_thread)
+            logger.warning(
+                "Event loop bloqueado há %.0fms (limite %.0fms); stack do loop:\n  %s",
+                blocked * 1000.0, self.block_threshold * 1000.0, "\n  ".join(stack[-25:]),
+            )
+
+    def start(self) -> "LoopMonitor":
+        """Chamar de dentro do loop (lifespan)."""
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._measure(), name="loop-lag-monitor")
+        if self.debug:
+            self._watchdog = threading.Thread(target=self._watch, name="loop-block-watchdog", daemon=True)
+            self._watchdog.start()
+        return self
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._watchdog is not None:
+            self._watchdog.join()
+
+
+_monitor: Optional[LoopMonitor] = None
+
+
+def start_loop_monitor(interval_ms: float, block_threshold_ms: float, debug: bool = False) -> Optional[LoopMonitor]:
+    global _monitor
+    if interval_ms <= 0:
+        return None
+    _monitor = LoopMonitor(interval_ms / 1000.0, block_threshold_ms / 1000.0, debug).start()
+    return _monitor
+
+
+async def stop_loop_monitor() -> None:
+    global _monitor
+    monitor, _monitor = _monitor, None
+    if monitor is not None:
+        await monitor.stop()
+
+
+def loop_monitor() -> Optional[LoopMonitor]:
+    return _monitor
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Response
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
 
 # HTTP
 REQUESTS = Counter("http_requests_total", "HTTP requests", ["path", "method", "status"])
@@ -7,12 +7,63 @@ LATENCY  = Histogram(
     "http_request_duration_seconds", "HTTP request duration (s)", ["path", "method"],
     buckets=(0.05,0.1,0.2,0.5,1,2,5,10)
 )
+# Buckets por classe de rota (LATENCY acima continua igual para os painéis existentes)
+LATENCY_READ = Histogram(
+    "http_read_request_duration_seconds", "Read routes duration: status, listing, health (s)", ["path", "method"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+)
+LATENCY_UPLOAD = Histogram(
+    "http_upload_request_duration_seconds", "Upload routes duration (s)", ["path"],
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 180, 300, 600)
+)
 
 # Domínio
 UPLOAD_BYTES = Counter("video_upload_bytes_total", "Total bytes received in uploads")
-S3_OPS = Counter("s3_operations_total", "S3 operations", ["op","status"])                 # op: put,get,sign
-SQS_OPS = Counter("sqs_operations_total", "SQS operations", ["op","status"])              # op: send,receive,delete
-DDB_OPS = Counter("dynamodb_operations_total", "DynamoDB operations", ["op","status"])    # op: put,get,update,query
+_MB = 1024 * 1024
+UPLOAD_SIZE = Histogram(
+    "video_upload_size_bytes", "Accepted upload size (bytes)",
+    buckets=(_MB // 4, _MB, 5 * _MB, 10 * _MB, 25 * _MB, 50 * _MB, 100 * _MB, 200 * _MB, 500 * _MB, 1024 * _MB, 2048 * _MB)
+)
+UPLOAD_SECONDS_PER_MB = Histogram(
+    "video_upload_seconds_per_mb", "Upload request duration normalized by size (s/MB)",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+)
+UPLOAD_BATCH_FILES = Counter("video_upload_batch_files_total", "Files received by /videos/upload:batch", ["status"])  # status: ok,error
+S3_OPS = Counter("s3_operations_total", "S3 operations", ["op","status"])                 # op: put,get,sign,delete
+SQS_OPS = Counter("sqs_operations_total", "SQS operations", ["op","status"])              # op: send,send_batch,receive,delete
+SQS_JOBS = Counter("sqs_jobs_total", "Processing jobs sent per job class", ["job_class","status"])  # job_class: small,large,priority
+DDB_OPS = Counter("dynamodb_operations_total", "DynamoDB operations", ["op","status"])    # op: put,batch_write,get,update,query
+# Write-behind do VideoRepo (DDB_WRITE_BEHIND=true)
+DDB_WRITE_BUFFER_DEPTH = Gauge("dynamodb_write_behind_buffer_items", "Items waiting in the DynamoDB write-behind buffer")
+DDB_WRITE_FLUSH = Histogram(
+    "dynamodb_write_behind_flush_seconds", "Write-behind BatchWriteItem flush duration, retries included (s)",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+)
+DDB_WRITE_BEHIND_FAILED = Counter("dynamodb_write_behind_failed_items_total", "Items dropped after exhausting BatchWriteItem retries")
+S3_UPLOAD_THROUGHPUT = Histogram(
+    "s3_upload_throughput_mb_per_second", "Throughput per S3 upload (MB/s)", ["mode"],   # mode: single,multipart
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500)
+)
+
+# Pool HTTP dos clients boto3
+AWS_POOL_IN_USE = Gauge("aws_http_connections_in_use", "In-flight boto3 HTTP requests (pool usage)", ["service"])
+AWS_POOL_MAX = Gauge("aws_http_pool_max_connections", "Configured boto3 max_pool_connections", ["service"])
+
+# Auth Service (circuit breaker + grace mode)
+AUTH_CIRCUIT_STATE = Gauge("auth_circuit_state", "Auth circuit breaker state (0=closed, 1=half_open, 2=open)")
+AUTH_STALE_SERVED = Counter("auth_stale_cache_served_total", "Expired /me payloads served while the Auth Service is down")
+AUTH_REFRESH_AHEAD = Counter("auth_refresh_ahead_total", "Background /me refreshes before expiry", ["result"])
+AUTH_NEGATIVE_CACHE_HITS = Counter("auth_negative_cache_hits_total", "Rejected tokens answered from the negative cache")
+
+# Event loop
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds", "Event loop scheduling lag (delay beyond the requested sleep)",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+)
+EVENT_LOOP_BLOCKS = Counter("event_loop_blocked_total", "Times the event loop was blocked beyond LOOP_BLOCK_THRESHOLD_MS")
+
+# Profiling
+SLOW_REQUEST_CAPTURES = Counter("slow_request_stack_captures_total", "Stack captures of requests over PROFILE_SLOW_REQUEST_MS")
 
 router_metrics = APIRouter()
 @router_metrics.get("/metrics")
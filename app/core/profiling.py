@@ -0,0 +1,235 @@
+# app/core/profiling.py
+"""
+Profiling sob demanda e captura de stacks de requests lentos.
+
+* CPU: thread de amostragem lendo `sys._current_frames()` a cada N ms
+  (todas as threads: event loop + threadpool do boto3), sem dependências.
+* Memória: snapshot do tracemalloc depois de N segundos, por traceback.
+
+Os dois saem no formato "folded" (`frame;frame;frame peso`), aceito por
+flamegraph.pl, speedscope e pelo painel Flame Graph do Grafana.
+
+O monitor de requests lentos (PROFILE_SLOW_REQUEST_MS > 0) usa uma única
+thread: request que passa do limite tem as stacks de todas as threads
+capturadas uma vez, logadas e guardadas para /debug/profile/slow.
+"""
+import asyncio
+import itertools
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from app.core.metrics import SLOW_REQUEST_CAPTURES
+
+logger = logging.getLogger("profiling")
+
+_profile_lock = threading.Lock()  # um profile por vez no processo
+
+
+class ProfilerBusy(RuntimeError):
+    pass
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+def _stack(frame, max_depth: int = 128) -> List[str]:
+    labels = []
+    while frame is not None and len(labels) < max_depth:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()  # raiz primeiro, como o formato folded espera
+    return labels
+
+
+def _thread_names() -> Dict[int, str]:
+    return {t.ident: t.name for t in threading.enumerate() if t.ident is not None}
+
+
+def thread_stack(ident: int) -> List[str]:
+    """Stack atual de uma thread (raiz primeiro); vazia se a thread não existir."""
+    frame = sys._current_frames().get(ident)
+    return _stack(frame) if frame is not None else []
+
+
+def current_stacks(skip: Tuple[int, ...] = ()) -> Dict[str, List[str]]:
+    """Stack atual de cada thread (nome -> frames, raiz primeiro)."""
+    names = _thread_names()
+    return {
+        names.get(ident, str(ident)): _stack(frame)
+        for ident, frame in sys._current_frames().items()
+        if ident not in skip
+    }
+
+
+def folded(samples: Counter) -> str:
+    return "\n".join(f"{stack} {count}" for stack, count in samples.most_common()) + "\n"
+
+
+class SamplingProfiler:
+    """Amostra as stacks de todas as threads a cada `interval` segundos."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.total = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = _thread_names()
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = ";".join([names.get(ident, str(ident))] + _stack(frame))
+                self.samples[stack] += 1
+            self.total += 1
+
+    def start(self) -> "SamplingProfiler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> str:
+        self._stop.set()
+        self._thread.join()
+        return folded(self.samples)
+
+
+def _acquire() -> None:
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusy("já existe um profile em andamento")
+
+
+async def profile_cpu(seconds: float, interval: float = 0.005) -> str:
+    """Profile de CPU (folded) dos próximos `seconds`; o event loop segue atendendo."""
+    _acquire()
+    try:
+        profiler = SamplingProfiler(interval).start()
+        await asyncio.sleep(seconds)
+        out = profiler.stop()
+        logger.info("Profile de CPU capturado (%.1fs, %d amostras)", seconds, profiler.total)
+        return out
+    finally:
+        _profile_lock.release()
+
+
+async def profile_memory(seconds: float, limit: int = 200, depth: int = 32) -> str:
+    """Alocações vivas (bytes, folded por traceback) após `seconds` de tracemalloc."""
+    _acquire()
+    started = not tracemalloc.is_tracing()
+    try:
+        if started:
+            tracemalloc.start(depth)
+        await asyncio.sleep(seconds)
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        samples: Counter = Counter()
+        for stat in snapshot.statistics("traceback")[:limit]:
+            frames = [f"{os.path.basename(f.filename)}:{f.lineno}" for f in reversed(stat.traceback)]
+            samples[";".join(frames)] += stat.size
+        logger.info("Snapshot de memória capturado (%.1fs, %d tracebacks)", seconds, len(samples))
+        return folded(samples)
+    finally:
+        if started:
+            tracemalloc.stop()
+        _profile_lock.release()
+
+
+# ---------- requests lentos ----------
+
+class SlowRequestMonitor:
+    """
+    Registra requests em andamento; uma thread verifica os prazos e, para cada
+    request que estourar `threshold`, captura as stacks de todas as threads
+    (inclusive o event loop, se for ele que estiver travado).
+    """
+
+    def __init__(self, threshold: float, keep: int = 20, check_interval: Optional[float] = None):
+        self.threshold = threshold
+        self.captures: Deque[dict] = deque(maxlen=keep)
+        self._check = check_interval or max(0.01, min(threshold / 4, 0.25))
+        self._inflight: Dict[int, Tuple[float, str, str]] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "SlowRequestMonitor":
+        self._thread = threading.Thread(target=self._run, name="slow-request-monitor", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def begin(self, path: str, request_id: str) -> int:
+        token = next(self._ids)
+        with self._lock:
+            self._inflight[token] = (time.monotonic() + self.threshold, path, request_id)
+        return token
+
+    def end(self, token: int) -> None:
+        with self._lock:
+            self._inflight.pop(token, None)
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while not self._stop.wait(self._check):
+            now = time.monotonic()
+            with self._lock:
+                due = [(t, v) for t, v in self._inflight.items() if v[0] <= now]
+                for token, _ in due:
+                    del self._inflight[token]  # uma captura por request
+            for _, (deadline, path, request_id) in due:
+                self._capture(path, request_id, now - deadline + self.threshold, me)
+
+    def _capture(self, path: str, request_id: str, elapsed: float, me: int) -> None:
+        stacks = current_stacks(skip=(me,))
+        self.captures.append({
+            "path": path,
+            "request_id": request_id,
+            "elapsed_ms": round(elapsed * 1000.0, 1),
+            "captured_at": time.time(),
+            "stacks": stacks,
+        })
+        SLOW_REQUEST_CAPTURES.inc()
+        busiest = max(stacks.items(), key=lambda kv: len(kv[1]), default=("", []))
+        logger.warning(
+            "Request lento (%s request_id=%s > %.0fms); stack de %s: %s",
+            path, request_id, self.threshold * 1000.0, busiest[0], " <- ".join(reversed(busiest[1][-8:])),
+        )
+
+
+_slow_monitor: Optional[SlowRequestMonitor] = None
+
+
+def start_slow_request_monitor(threshold_ms: float, keep: int = 20) -> Optional[SlowRequestMonitor]:
+    global _slow_monitor
+    stop_slow_request_monitor()
+    if threshold_ms > 0:
+        _slow_monitor = SlowRequestMonitor(threshold_ms / 1000.0, keep=keep).start()
+    return _slow_monitor
+
+
+def stop_slow_request_monitor() -> None:
+    global _slow_monitor
+    monitor, _slow_monitor = _slow_monitor, None
+    if monitor is not None:
+        monitor.stop()
+
+
+def slow_request_monitor() -> Optional[SlowRequestMonitor]:
+    return _slow_monitor
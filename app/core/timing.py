@@ -0,0 +1,69 @@
+# app/core/timing.py
+"""
+Quebra de tempo por request (auth, corpo, S3, DynamoDB, SQS...).
+
+O middleware abre um coletor num contextvar (como `_request_id` em
+app.core.logging); as etapas registram spans com `timed("s3")`. O coletor é
+um objeto mutável, então spans gravados na task do endpoint (call_next) e
+nas threads do threadpool (repositório/boto3) chegam ao mesmo lugar. No fim
+vira o header `Server-Timing` e o campo `timings` do log de acesso.
+"""
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+
+class RequestTimings:
+    """Durações acumuladas por etapa (ms); etapas repetidas somam."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.spans: Dict[str, float] = {}
+
+    def add(self, name: str, duration_ms: float) -> None:
+        with self._lock:
+            self.spans[name] = self.spans.get(name, 0.0) + duration_ms
+
+    def as_dict(self) -> Dict[str, float]:
+        with self._lock:
+            return {name: round(ms, 1) for name, ms in self.spans.items()}
+
+    def server_timing(self, total_ms: Optional[float] = None) -> str:
+        parts = [f"{name};dur={ms}" for name, ms in self.as_dict().items()]
+        if total_ms is not None:
+            parts.append(f"total;dur={total_ms:.1f}")
+        return ", ".join(parts)
+
+
+_timings: contextvars.ContextVar[Optional[RequestTimings]] = contextvars.ContextVar("timings", default=None)
+
+
+def start_request_timings() -> RequestTimings:
+    timings = RequestTimings()
+    _timings.set(timings)
+    return timings
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _timings.get()
+
+
+def add_timing(name: str, duration_ms: float) -> None:
+    timings = _timings.get()
+    if timings is not None:  # fora de um request (workers, scripts) é no-op
+        timings.add(name, duration_ms)
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """Registra a duração do bloco como a etapa `name` do request atual."""
+    if _timings.get() is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_timing(name, (time.perf_counter() - start) * 1000.0)
@@ -0,0 +1,175 @@
+# app/core/tracing.py
+"""
+Tracing OpenTelemetry (opcional).
+
+Desligado por padrão (OTEL_ENABLED=false) ou sem os pacotes opentelemetry
+instalados: `span()` devolve um nullcontext compartilhado e nenhum hook é
+registrado nos clients boto3, então o custo é um `if` por chamada.
+
+Ligado, gera:
+* span SERVER por request (ObservabilityMiddleware), continuando um
+  `traceparent` recebido;
+* spans CLIENT para AuthClient.me e para cada chamada boto3 (hooks
+  before-parameter-build/after-call do botocore, como em app.aws.instrument_pool);
+* contexto W3C (`traceparent`/`tracestate`) nos headers do /me e nos
+  MessageAttributes do SQS, para o worker continuar o mesmo trace.
+
+Export OTLP/HTTP para OTEL_EXPORTER_OTLP_ENDPOINT (ex.: collector local em
+http://localhost:4318/v1/traces).
+"""
+import logging
+from contextlib import nullcontext
+from typing import Any, Dict, Mapping, Optional
+
+from app.config import settings
+
+logger = logging.getLogger("tracing")
+
+_NOOP = nullcontext()
+_tracer = None    # None = tracing desligado
+_provider = None
+_TRACE_KEYS = ("traceparent", "tracestate")
+
+
+def tracing_enabled() -> bool:
+    return _tracer is not None
+
+
+def setup_tracing(span_processor=None) -> bool:
+    """
+    Configura o TracerProvider (lifespan). `span_processor` substitui o export
+    OTLP (ex.: SimpleSpanProcessor(InMemorySpanExporter()) em testes).
+    """
+    global _tracer, _provider
+    if not settings.otel_enabled and span_processor is None:
+        return False
+    try:
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    except ImportError:
+        logger.warning("OTEL_ENABLED=true, mas opentelemetry-sdk não está instalado; tracing desligado")
+        return False
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.otel_service_name}),
+        sampler=ParentBased(TraceIdRatioBased(settings.otel_sample_ratio)),
+    )
+    if span_processor is None:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        span_processor = BatchSpanProcessor(OTLPSpanExporter(endpoint=settings.otel_exporter_otlp_endpoint))
+    provider.add_span_processor(span_processor)
+
+    _provider = provider
+    _tracer = provider.get_tracer("video-upload-service")
+    logger.info("Tracing OpenTelemetry ativo (service=%s)", settings.otel_service_name)
+    return True
+
+
+def shutdown_tracing() -> None:
+    """Exporta o que estiver pendente e volta ao modo sem custo."""
+    global _tracer, _provider
+    provider, _provider, _tracer = _provider, None, None
+    if provider is not None:
+        provider.shutdown()
+
+
+def span(name: str, kind: str = "internal", **attributes: Any):
+    """Context manager de um span filho do contexto atual (no-op se desligado)."""
+    if _tracer is None:
+        return _NOOP
+    from opentelemetry.trace import SpanKind
+    return _tracer.start_as_current_span(name, kind=getattr(SpanKind, kind.upper()), attributes=attributes)
+
+
+def server_span(method: str, route: str, headers: Mapping[str, str]):
+    """Span SERVER do request, filho do `traceparent` recebido (se houver)."""
+    if _tracer is None:
+        return _NOOP
+    from opentelemetry.propagate import extract
+    from opentelemetry.trace import SpanKind
+    return _tracer.start_as_current_span(
+        f"{method} {route}",
+        context=extract(headers),
+        kind=SpanKind.SERVER,
+        attributes={"http.request.method": method, "http.route": route},
+    )
+
+
+def current_trace_id() -> Optional[str]:
+    if _tracer is None:
+        return None
+    from opentelemetry import trace
+    ctx = trace.get_current_span().get_span_context()
+    return format(ctx.trace_id, "032x") if ctx.is_valid else None
+
+
+# ---------- propagação ----------
+
+def inject_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    """Acrescenta traceparent/tracestate a headers HTTP de saída."""
+    if _tracer is not None:
+        from opentelemetry.propagate import inject
+        inject(headers)
+    return headers
+
+
+def inject_message_attributes(attributes: Dict[str, Dict[str, str]]) -> Dict[str, Dict[str, str]]:
+    """Contexto W3C como MessageAttributes do SQS (String), para o worker."""
+    if _tracer is None:
+        return attributes
+    carrier: Dict[str, str] = {}
+    from opentelemetry.propagate import inject
+    inject(carrier)
+    for key in _TRACE_KEYS:
+        if carrier.get(key):
+            attributes[key] = {"DataType": "String", "StringValue": carrier[key]}
+    return attributes
+
+
+def context_from_message_attributes(attributes: Optional[Mapping[str, Any]]):
+    """Contexto OTel de uma mensagem recebida (usar como `context=` do span do worker)."""
+    from opentelemetry.propagate import extract
+    carrier = {}
+    for key in _TRACE_KEYS:
+        value = (attributes or {}).get(key)
+        if isinstance(value, dict):
+            value = value.get("StringValue")
+        if value:
+            carrier[key] = value
+    return extract(carrier)
+
+
+# ---------- boto3 ----------
+
+def instrument_tracing(client, service: str):
+    """Um span CLIENT por chamada de API do client boto3 (inclui retries)."""
+    meta = getattr(client, "meta", None)
+    if _tracer is None or meta is None:
+        return client
+    from opentelemetry import trace
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+    tracer = _tracer
+    make_api_call = client._make_api_call
+
+    def _traced_api_call(operation_name, api_params):
+        # o context manager fecha o span e desanexa o contexto mesmo quando a
+        # chamada falha antes do envio (ParamValidationError, endpoint, checksum)
+        with tracer.start_as_current_span(
+            f"{service}.{operation_name}",
+            kind=SpanKind.CLIENT,
+            attributes={"rpc.system": "aws-api", "rpc.service": service, "rpc.method": operation_name},
+        ):
+            return make_api_call(operation_name, api_params)
+
+    def _after(http_response, **kwargs):
+        current = trace.get_current_span()
+        current.set_attribute("http.response.status_code", http_response.status_code)
+        if http_response.status_code >= 400:
+            current.set_status(Status(StatusCode.ERROR))
+
+    # os métodos de API chamam self._make_api_call: trocar no client cobre todas as operações
+    client._make_api_call = _traced_api_call
+    meta.events.register("after-call", _after)
+    return client
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 
 class UploadResponse(BaseModel):
@@ -11,6 +11,17 @@ class UploadResponse(BaseModel):
     s3_key: str
     links: Optional[Dict[str, str]] = None  # <- acrescentado
 
+class BatchUploadItem(BaseModel):
+    filename: str | None = None
+    status_code: int  # mesmo código que o upload unitário devolveria para o arquivo
+    detail: str | None = None
+    video: UploadResponse | None = None
+
+class BatchUploadResponse(BaseModel):
+    accepted: int
+    failed: int
+    results: List[BatchUploadItem]  # na ordem dos arquivos enviados
+
 class StatusResponse(BaseModel):
     id_video: str
     titulo: str | None = Field(default=None, max_length=200)
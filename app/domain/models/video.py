@@ -7,9 +7,20 @@ class VideoItem(BaseModel):
     titulo: str = Field(..., max_length=200)
     autor: str = Field(..., max_length=100)
     status: str
+    version: int = 0  # incrementada a cada transição de status (update condicional)
     file_path: str
     data_criacao: datetime = Field(default_factory=datetime.utcnow)
     data_upload: datetime = Field(default_factory=datetime.utcnow)
     email: Optional[str] = None
     username: Optional[str] = None
-    id: Optional[str] = None
\ No newline at end of file
+    id: Optional[str] = None
+    size_bytes: Optional[int] = None
+    # SHA-256 (hex) calculado no upload e validado pelo S3; workers não precisam re-hashear
+    checksum_sha256: Optional[str] = None
+    # metadados lidos dos headers no upload (workers planejam sem baixar o vídeo)
+    container: Optional[str] = None
+    duration_ms: Optional[int] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    video_codec: Optional[str] = None
+    audio_codec: Optional[str] = None
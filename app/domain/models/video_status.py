@@ -0,0 +1,57 @@
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, FrozenSet, Optional
+
+
+class VideoStatus(str, Enum):
+    UPLOADED = "UPLOADED"
+    PROCESSING = "PROCESSING"
+    DONE = "DONE"
+    ERROR = "ERROR"
+
+
+# destino -> de onde pode vir (ERROR -> PROCESSING é o reprocessamento)
+TRANSITIONS: Dict[VideoStatus, FrozenSet[VideoStatus]] = {
+    VideoStatus.UPLOADED: frozenset(),
+    VideoStatus.PROCESSING: frozenset({VideoStatus.UPLOADED, VideoStatus.ERROR}),
+    VideoStatus.DONE: frozenset({VideoStatus.PROCESSING}),
+    VideoStatus.ERROR: frozenset({VideoStatus.UPLOADED, VideoStatus.PROCESSING}),
+}
+
+
+class InvalidStatusTransition(ValueError):
+    pass
+
+
+class StatusConflict(RuntimeError):
+    """O item não estava num status de origem válido (ou a versão mudou)."""
+
+    def __init__(self, id_video: str, status: str, current: Optional[dict]):
+        self.id_video = id_video
+        self.status = status
+        self.current = current  # estado lido depois da falha (None = vídeo não existe)
+        found = "inexistente" if current is None else f"{current.get('status')} v{current.get('version', 0)}"
+        super().__init__(f"Transição para {status} recusada para {id_video} (atual: {found})")
+
+
+def allowed_previous(status: str) -> FrozenSet[VideoStatus]:
+    try:
+        target = VideoStatus(status)
+    except ValueError:
+        raise InvalidStatusTransition(f"Status desconhecido: {status}") from None
+    previous = TRANSITIONS[target]
+    if not previous:
+        raise InvalidStatusTransition(f"{target.value} é só o status inicial (definido no upload)")
+    return previous
+
+
+@dataclass
+class StatusUpdateResult:
+    id_video: str
+    status: str
+    item: Optional[dict] = None  # item completo depois do update (ALL_NEW)
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
@@ -1,8 +1,10 @@
 # app/domain/repositories/video_repository_interface.py
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Iterable, Optional, Tuple
 from typing import List
 
+from app.domain.models.video_status import StatusUpdateResult
+
 
 class IVideoRepository(ABC):
     """Contrato para persistência de vídeos"""
@@ -12,15 +14,33 @@ class IVideoRepository(ABC):
         """Insere um novo vídeo"""
         pass
 
+    def put_many(self, items: Iterable[dict]) -> None:
+        """Insere vários vídeos (implementações podem agrupar em lote)"""
+        for item in items:
+            self.put(item)
+
     @abstractmethod
     def get(self, id_video: str) -> Optional[dict]:
         """Busca um vídeo pelo ID"""
         pass
 
     @abstractmethod
-    def update_status(self, id_video: str, status: str) -> None:
-        """Atualiza o status de um vídeo"""
+    def update_status(self, id_video: str, status: str, *, expected_version: Optional[int] = None) -> dict:
+        """
+        Transição de status condicional (ver domain.models.video_status);
+        devolve o item atualizado ou levanta StatusConflict
+        """
         pass
 
+    def update_status_many(self, changes: Iterable[Tuple[str, str]]) -> List[StatusUpdateResult]:
+        """Várias transições (id_video, status); uma falha não impede as outras"""
+        results = []
+        for id_video, status in changes:
+            try:
+                results.append(StatusUpdateResult(id_video, status, item=self.update_status(id_video, status)))
+            except Exception as e:
+                results.append(StatusUpdateResult(id_video, status, error=e))
+        return results
+
     @abstractmethod
     def list_by_user(self, user_id) -> List[dict]: ...  # <-- novo
\ No newline at end of file
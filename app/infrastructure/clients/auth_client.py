@@ -1,35 +1,156 @@
 # app/infrastructure/clients/auth_client.py
 from __future__ import annotations
+import asyncio
+import hashlib
 import time
+from collections import OrderedDict
 from typing import Any, Dict, Optional
 
 import httpx
 import logging
 
+from app.core.metrics import (
+    AUTH_CIRCUIT_STATE,
+    AUTH_NEGATIVE_CACHE_HITS,
+    AUTH_REFRESH_AHEAD,
+    AUTH_STALE_SERVED,
+)
+from app.core.tracing import inject_headers, span
+from app.infrastructure.clients.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.infrastructure.clients.token_cache import (
+    CacheEntry,
+    InMemoryTokenCache,
+    TokenCacheBackend,
+    build_shared_cache,
+)
+
 
 logger = logging.getLogger("auth")
 
+
+def _setting(name: str, default: Any) -> Any:
+    """Lê um valor de app.config.settings sem quebrar se settings não carregar."""
+    try:
+        from app.config import settings
+        return getattr(settings, name, default)
+    except Exception:
+        return default
+
+
+def _setting_or_default(name: str) -> Any:
+    """Como `_setting`, mas o fallback é o default declarado em Settings (uma fonte só)."""
+    from app.config import Settings
+    return _setting(name, Settings.model_fields[name].default)
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
 class AuthClient:
     """Client fino para conversar com o Auth Service."""
-    def __init__(self, base_url: str, timeout_seconds: int = 5, cache_ttl: int = 30):
+    def __init__(
+        self,
+        base_url: str,
+        timeout_seconds: int = 5,
+        cache_ttl: int = 30,
+        *,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        http2: Optional[bool] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        stale_grace_seconds: Optional[int] = None,
+        negative_ttl: Optional[int] = None,
+        negative_max_entries: Optional[int] = None,
+        shared_cache: Optional[TokenCacheBackend] = None,
+        refresh_ahead_seconds: Optional[float] = None,
+    ):
         self._base_url = base_url.rstrip("/")
         self._timeout = timeout_seconds
         self._cache_ttl = cache_ttl
         self._client: Optional[httpx.AsyncClient] = None
-        # cache em memória para /me (token -> payload,exp)
-        self._cache: Dict[str, tuple[float, Dict[str, Any]]] = {}
+        # cache do /me em dois níveis (chave = sha256 do token):
+        # L1 no processo; L2 opcional compartilhado entre workers/pods
+        self._cache = InMemoryTokenCache(_setting("auth_cache_max_entries", 10000))
+        self._shared_cache = shared_cache or build_shared_cache(
+            _setting("auth_cache_backend", "memory"), _setting("auth_cache_redis_url", None)
+        )
+        # cache negativo (sha256(token) -> exp,status) para 401/403; LRU limitado
+        self._neg_cache: "OrderedDict[str, tuple[float, int]]" = OrderedDict()
+        self._neg_ttl = negative_ttl if negative_ttl is not None else _setting("auth_negative_cache_ttl_seconds", 5)
+        self._neg_max = (
+            negative_max_entries if negative_max_entries is not None
+            else _setting("auth_negative_cache_max_entries", 10000)
+        )
+
+        # limites do pool: argumentos explícitos (inclusive 0) > settings
+        self._limits = httpx.Limits(
+            max_connections=(
+                max_connections if max_connections is not None
+                else _setting_or_default("auth_max_connections")
+            ),
+            max_keepalive_connections=(
+                max_keepalive_connections if max_keepalive_connections is not None
+                else _setting_or_default("auth_max_keepalive_connections")
+            ),
+            keepalive_expiry=(
+                keepalive_expiry if keepalive_expiry is not None
+                else _setting_or_default("auth_keepalive_expiry_seconds")
+            ),
+        )
+        want_http2 = _setting("auth_http2", False) if http2 is None else http2
+        if want_http2 and not _http2_available():
+            logger.warning("HTTP/2 pedido para o AuthClient, mas o pacote 'h2' não está instalado; usando HTTP/1.1")
+            want_http2 = False
+        self._http2 = bool(want_http2)
+
+        # circuit breaker em volta do /me + janela em que um payload expirado ainda pode ser servido
+        self._breaker = breaker or CircuitBreaker(
+            failure_rate=_setting("auth_breaker_failure_rate", 0.5),
+            window_size=_setting("auth_breaker_window", 20),
+            min_calls=_setting("auth_breaker_min_calls", 5),
+            open_seconds=_setting("auth_breaker_open_seconds", 30),
+            on_state_change=self._on_breaker_change,
+        )
+        self._stale_grace = (
+            stale_grace_seconds if stale_grace_seconds is not None
+            else _setting("auth_stale_grace_seconds", 300)
+        )
+
+        # refresh-ahead: entradas a menos de N s de expirar são renovadas em background
+        self._refresh_ahead = (
+            refresh_ahead_seconds if refresh_ahead_seconds is not None
+            else _setting("auth_refresh_ahead_seconds", 5)
+        )
+        self._refreshing: Dict[str, asyncio.Task] = {}  # uma renovação por token (coalescida)
+
+    @staticmethod
+    def _on_breaker_change(state: str) -> None:
+        AUTH_CIRCUIT_STATE.set({CircuitBreaker.CLOSED: 0, CircuitBreaker.HALF_OPEN: 1, CircuitBreaker.OPEN: 2}[state])
+        logger.warning("Auth circuit breaker -> %s", state)
 
     async def _get_client(self) -> httpx.AsyncClient:
         if self._client is None:
             async def on_request(request):
+                if not logger.isEnabledFor(logging.DEBUG):
+                    return
                 request.extensions["start"] = time.time()
                 logger.debug("HTTPX request: %s %s", request.method, request.url)
 
             async def on_response(response):
+                # ler o corpo só para log custa caro no caminho quente: só em DEBUG
+                if not logger.isEnabledFor(logging.DEBUG):
+                    return
                 start = response.request.extensions.get("start")
                 dur = f"{(time.time() - start):.3f}s" if start else "?"
                 body_snip = ""
                 try:
+                    await response.aread()
                     body_snip = response.text[:200]
                 except Exception:
                     pass
@@ -42,6 +163,8 @@ class AuthClient:
             self._client = httpx.AsyncClient(
                 base_url=self._base_url,
                 timeout=self._timeout,
+                limits=self._limits,
+                http2=self._http2,
                 event_hooks={"request": [on_request], "response": [on_response]},
             )
         return self._client
@@ -52,24 +175,128 @@ class AuthClient:
         resp.raise_for_status()
         return resp.json()
 
+    def _rejected(self, key: str, now: float) -> Optional[int]:
+        """Status (401/403) se o token foi rejeitado há pouco; None caso contrário."""
+        entry = self._neg_cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= now:
+            del self._neg_cache[key]
+            return None
+        return entry[1]
+
+    def _remember_rejection(self, key: str, status_code: int, now: float) -> None:
+        if self._neg_ttl <= 0:
+            return
+        self._neg_cache[key] = (now + self._neg_ttl, status_code)
+        self._neg_cache.move_to_end(key)
+        while len(self._neg_cache) > self._neg_max:
+            self._neg_cache.popitem(last=False)
+
+    def _stale(self, cached: Optional[CacheEntry], now: float) -> Optional[Dict[str, Any]]:
+        """Payload expirado ainda dentro da janela de graça (Auth Service fora)."""
+        if cached and now < cached[0] + self._stale_grace:
+            AUTH_STALE_SERVED.inc()
+            return cached[1]
+        return None
+
+    def _maybe_refresh(self, token: str, key: str, entry: CacheEntry, now: float) -> None:
+        if self._refresh_ahead <= 0 or entry[0] - now > self._refresh_ahead:
+            return
+        if key in self._refreshing:
+            return  # já tem uma renovação em voo para este token
+        task = asyncio.create_task(self._refresh(token, key, entry))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _t: self._refreshing.pop(key, None))
+
+    async def _refresh(self, token: str, key: str, entry: CacheEntry) -> None:
+        try:
+            await self._load(token, key, time.time(), entry)
+            AUTH_REFRESH_AHEAD.labels(result="ok").inc()
+        except Exception as e:
+            # quem pediu já recebeu o valor cacheado; a próxima leitura tenta de novo
+            AUTH_REFRESH_AHEAD.labels(result="error").inc()
+            logger.debug("Refresh-ahead do /me falhou: %s", e)
+
     async def me(self, token: str) -> Dict[str, Any]:
+        with span("AuthClient.me", kind="client"):
+            return await self._me(token)
+
+    async def _me(self, token: str) -> Dict[str, Any]:
         now = time.time()
-        cached = self._cache.get(token)
+        key = hashlib.sha256(token.encode()).hexdigest()
+        cached = await self._cache.get(key)
         if cached and cached[0] > now:
+            self._maybe_refresh(token, key, cached, now)
             return cached[1]
 
+        if self._shared_cache is not None:
+            shared = await self._shared_cache.get(key)
+            if shared and shared[0] > now:
+                await self._cache.set(key, shared[0], shared[1])
+                self._maybe_refresh(token, key, shared, now)
+                return shared[1]
+            if shared and (cached is None or shared[0] > cached[0]):
+                cached = shared  # mais recente, útil para o grace mode
+
+        return await self._load(token, key, now, cached)
+
+    async def _load(self, token: str, key: str, now: float, cached: Optional[CacheEntry]) -> Dict[str, Any]:
+        """Busca o /me no Auth Service (cache negativo, breaker e grace mode) e cacheia."""
+        rejected = self._rejected(key, now)
+        if rejected is not None:
+            AUTH_NEGATIVE_CACHE_HITS.inc()
+            req = httpx.Request("GET", f"{self._base_url}/api/v1/auth/me")
+            raise httpx.HTTPStatusError(
+                f"Token rejeitado recentemente (cache negativo, status={rejected})",
+                request=req,
+                response=httpx.Response(rejected, request=req),
+            )
+
+        if not self._breaker.allow():
+            stale = self._stale(cached, now)
+            if stale is not None:
+                return stale
+            raise CircuitOpenError("Auth Service indisponível (circuit breaker aberto)")
+
         client = await self._get_client()
-        resp = await client.get(
-            "/api/v1/auth/me",
-            headers={"Authorization": f"Bearer {token}"}
-        )
+        try:
+            resp = await client.get(
+                "/api/v1/auth/me",
+                headers=inject_headers({"Authorization": f"Bearer {token}"}),
+            )
+        except httpx.RequestError:
+            self._breaker.record_failure()
+            stale = self._stale(cached, now)
+            if stale is not None:
+                return stale
+            raise
+
+        if resp.status_code >= 500:
+            self._breaker.record_failure()
+            stale = self._stale(cached, now)
+            if stale is not None:
+                return stale
+        else:
+            # 2xx/4xx: o serviço respondeu, então está saudável
+            self._breaker.record_success()
+            if resp.status_code in (401, 403):
+                self._remember_rejection(key, resp.status_code, now)
         resp.raise_for_status()
         data = resp.json()
-        # guarda no cache por TTL
-        self._cache[token] = (now + self._cache_ttl, data)
+        # guarda no cache por TTL (L2 retém também a janela de graça)
+        expires_at = now + self._cache_ttl
+        await self._cache.set(key, expires_at, data)
+        if self._shared_cache is not None:
+            await self._shared_cache.set(key, expires_at, data, self._cache_ttl + self._stale_grace)
         return data
 
     async def aclose(self) -> None:
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        self._refreshing.clear()
         if self._client:
             await self._client.aclose()
             self._client = None
+        if self._shared_cache is not None:
+            await self._shared_cache.aclose()
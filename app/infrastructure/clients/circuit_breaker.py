@@ -0,0 +1,93 @@
+# app/infrastructure/clients/circuit_breaker.py
+from __future__ import annotations
+import time
+from collections import deque
+from typing import Callable, Deque, Optional
+
+import httpx
+
+
+class CircuitOpenError(httpx.RequestError):
+    """Falha rápida: o circuito está aberto e a chamada nem foi feita."""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker por taxa de falhas em janela deslizante (últimas N chamadas).
+
+    closed    -> chamadas passam; abre quando a taxa de falha >= failure_rate
+                 (com pelo menos min_calls na janela)
+    open      -> falha rápida até open_seconds passarem
+    half_open -> deixa passar half_open_max_calls de teste; sucesso fecha, falha reabre
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        window_size: int = 20,
+        min_calls: int = 5,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        on_state_change: Optional[Callable[[str], None]] = None,
+    ):
+        self._failure_rate = failure_rate
+        self._min_calls = min_calls
+        self._open_seconds = open_seconds
+        self._half_open_max_calls = half_open_max_calls
+        self._clock = clock
+        self._on_state_change = on_state_change
+        self._window: Deque[bool] = deque(maxlen=window_size)  # True = falha
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._trials = 0
+        self._trial_at = 0.0
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self._open_seconds:
+            self._transition(self.HALF_OPEN)
+        return self._state
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN:
+            now = self._clock()
+            # chamada de teste que nunca reportou (ex.: cancelada) não trava o half-open
+            if self._trials >= self._half_open_max_calls and now - self._trial_at >= self._open_seconds:
+                self._trials = 0
+            if self._trials < self._half_open_max_calls:
+                self._trials += 1
+                self._trial_at = now
+                return True
+        return False
+
+    def record_success(self) -> None:
+        if self._state == self.HALF_OPEN:
+            self._transition(self.CLOSED)
+            return
+        self._window.append(False)
+
+    def record_failure(self) -> None:
+        if self._state == self.HALF_OPEN:
+            self._transition(self.OPEN)
+            return
+        self._window.append(True)
+        if len(self._window) >= self._min_calls:
+            if sum(self._window) / len(self._window) >= self._failure_rate:
+                self._transition(self.OPEN)
+
+    def _transition(self, state: str) -> None:
+        self._state = state
+        self._trials = 0
+        if state == self.OPEN:
+            self._opened_at = self._clock()
+        self._window.clear()
+        if self._on_state_change:
+            self._on_state_change(state)
@@ -0,0 +1,192 @@
+# app/infrastructure/clients/token_cache.py
+from __future__ import annotations
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+from app.infrastructure.clients.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+logger = logging.getLogger("auth")
+
+CacheEntry = tuple[float, Dict[str, Any]]  # (expira_em, payload do /me)
+
+
+class TokenCacheBackend(ABC):
+    """Contrato de cache do payload do /me (chave = hash do token, nunca o token)."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        """Retorna (expira_em, payload) ou None; entradas expiradas podem voltar (grace mode)."""
+
+    @abstractmethod
+    async def set(self, key: str, expires_at: float, payload: Dict[str, Any], keep_seconds: float) -> None:
+        """Guarda o payload; `keep_seconds` é por quanto tempo o backend deve retê-lo."""
+
+    async def aclose(self) -> None:
+        pass
+
+
+class InMemoryTokenCache(TokenCacheBackend):
+    """Cache do processo (L1): LRU limitado; expiração é decidida por quem lê."""
+
+    def __init__(self, max_entries: int = 10000):
+        self._max_entries = max_entries
+        self._data: "OrderedDict[str, CacheEntry]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._data.get(key)
+        if entry is not None:
+            self._data.move_to_end(key)
+        return entry
+
+    async def set(self, key: str, expires_at: float, payload: Dict[str, Any], keep_seconds: float = 0) -> None:
+        self._data[key] = (expires_at, payload)
+        self._data.move_to_end(key)
+        while len(self._data) > self._max_entries:
+            self._data.popitem(last=False)
+
+
+class RedisError(RuntimeError):
+    pass
+
+
+def _encode_command(*args: Any) -> bytes:
+    out = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode()
+        out.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(out)
+
+
+async def _read_reply(reader: asyncio.StreamReader) -> Any:
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("conexão com o cache fechada")
+    kind, rest = line[:1], line[1:-2]
+    if kind == b"+":
+        return rest.decode()
+    if kind == b"-":
+        raise RedisError(rest.decode())
+    if kind == b":":
+        return int(rest)
+    if kind == b"$":
+        size = int(rest)
+        if size < 0:
+            return None
+        data = await reader.readexactly(size + 2)
+        return data[:-2]
+    if kind == b"*":
+        size = int(rest)
+        if size < 0:
+            return None
+        return [await _read_reply(reader) for _ in range(size)]
+    raise RedisError(f"resposta RESP inesperada: {line!r}")
+
+
+class RedisTokenCache(TokenCacheBackend):
+    """
+    Cache compartilhado (L2) entre workers/pods via protocolo Redis (RESP).
+
+    Client mínimo em asyncio puro (GET / SET PX), uma conexão serializada por
+    lock. Qualquer erro vira cache miss: o cache nunca derruba a autenticação.
+    Depois de uma falha o circuito fica aberto por `retry_after_seconds`: os
+    misses vão direto ao /me em vez de enfileirar timeouts de conexão no lock.
+    """
+
+    def __init__(self, url: str, prefix: str = "auth:me:", timeout_seconds: float = 0.25,
+                 retry_after_seconds: float = 5.0):
+        parsed = urlparse(url)
+        self._host = parsed.hostname or "localhost"
+        self._port = parsed.port or 6379
+        self._password = parsed.password
+        self._db = int((parsed.path or "/0").lstrip("/") or 0)
+        self._prefix = prefix
+        self._timeout = timeout_seconds
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+        # uma falha abre; depois de retry_after_seconds um único comando testa de novo
+        self._breaker = CircuitBreaker(
+            failure_rate=1.0, window_size=1, min_calls=1, open_seconds=retry_after_seconds,
+        )
+
+    async def _connect(self) -> None:
+        self._reader, self._writer = await asyncio.open_connection(self._host, self._port)
+        if self._password:
+            await self._send("AUTH", self._password)
+        if self._db:
+            await self._send("SELECT", self._db)
+
+    async def _send(self, *args: Any) -> Any:
+        self._writer.write(_encode_command(*args))
+        await self._writer.drain()
+        return await _read_reply(self._reader)
+
+    async def _command(self, *args: Any) -> Any:
+        if not self._breaker.allow():
+            raise CircuitOpenError("Redis indisponível (circuito aberto)")
+        async with self._lock:
+            # quem esperava no lock atrás da falha também sai sem tentar
+            if self._breaker.state == CircuitBreaker.OPEN:
+                raise CircuitOpenError("Redis indisponível (circuito aberto)")
+            try:
+                if self._writer is None:
+                    await asyncio.wait_for(self._connect(), self._timeout)
+                reply = await asyncio.wait_for(self._send(*args), self._timeout)
+            except Exception:
+                self._drop()
+                self._breaker.record_failure()
+                raise
+            self._breaker.record_success()
+            return reply
+
+    def _drop(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def get(self, key: str) -> Optional[CacheEntry]:
+        try:
+            raw = await self._command("GET", self._prefix + key)
+        except CircuitOpenError:
+            return None  # já logado na abertura do circuito
+        except Exception as e:
+            logger.warning("Cache compartilhado indisponível (GET): %s", e)
+            return None
+        if raw is None:
+            return None
+        try:
+            doc = json.loads(raw)
+            return float(doc["exp"]), doc["payload"]
+        except Exception:
+            return None
+
+    async def set(self, key: str, expires_at: float, payload: Dict[str, Any], keep_seconds: float) -> None:
+        value = json.dumps({"exp": expires_at, "payload": payload}, default=str)
+        try:
+            await self._command("SET", self._prefix + key, value, "PX", max(1, int(keep_seconds * 1000)))
+        except CircuitOpenError:
+            pass
+        except Exception as e:
+            logger.warning("Cache compartilhado indisponível (SET): %s", e)
+
+    async def aclose(self) -> None:
+        async with self._lock:
+            self._drop()
+
+
+def build_shared_cache(backend: Optional[str], redis_url: Optional[str]) -> Optional[TokenCacheBackend]:
+    """L2 a partir de settings (AUTH_CACHE_BACKEND/AUTH_CACHE_REDIS_URL); None = só L1."""
+    if (backend or "memory").lower() != "redis":
+        return None
+    if not redis_url:
+        logger.error("AUTH_CACHE_BACKEND=redis sem AUTH_CACHE_REDIS_URL; usando só o cache local")
+        return None
+    return RedisTokenCache(redis_url)
@@ -1,34 +1,125 @@
 # app/infrastructure/repositories/video_repo.py
+from concurrent.futures import ThreadPoolExecutor, wait as futures_wait
 from datetime import datetime
+from app.config import settings
+from app.domain.models.video_status import StatusConflict, StatusUpdateResult, allowed_previous
 from app.domain.repositories.video_repository_interface import IVideoRepository
 import app.aws as aws_mod   # <-- importe o módulo, não o símbolo
 
 from app.core.metrics import DDB_OPS
-from typing import List
+from app.core.timing import timed
+from app.infrastructure.repositories.write_behind import write_behind
+from typing import Iterable, List, Optional, Tuple
 from boto3.dynamodb.conditions import Attr, Key
+from botocore.exceptions import ClientError
 
 
 class VideoRepo(IVideoRepository):
     def put(self, item: dict) -> None:
+        buffer = write_behind()
+        written = buffer.put(item) if buffer is not None else None
+        if written is not None:
+            # só retorna gravado: quem publica o job depois do put acha a linha
+            written.result()
+            return
         try:
-            aws_mod.table_videos.put_item(Item=item)
+            with timed("ddb"):
+                aws_mod.table_videos.put_item(Item=item)
             DDB_OPS.labels(op="put", status="ok").inc()
         except Exception:
             DDB_OPS.labels(op="put", status="error").inc()
             raise
-        
+
+    def put_many(self, items: Iterable[dict]) -> None:
+        buffer = write_behind()
+        pending = []
+        if buffer is not None:
+            queued = [(item, buffer.put(item)) for item in items]
+            pending = [written for _, written in queued if written is not None]
+            items = [item for item, written in queued if written is None]  # sobra só o que não coube
+        if items:
+            # batch_writer agrupa em BatchWriteItem de 25 e reenvia os UnprocessedItems
+            try:
+                with timed("ddb"), aws_mod.table_videos.batch_writer() as batch:
+                    for item in items:
+                        batch.put_item(Item=item)
+                DDB_OPS.labels(op="batch_write", status="ok").inc()
+            except Exception:
+                DDB_OPS.labels(op="batch_write", status="error").inc()
+                raise
+        for written in pending:
+            written.result()  # mesma garantia do put: retorna com tudo gravado
+
 
     def get(self, id_video: str) -> dict | None:
-        resp = aws_mod.table_videos.get_item(Key={"id_video": id_video})
+        buffer = write_behind()
+        pending = buffer.pending(id_video) if buffer is not None else None
+        if pending is not None:
+            return dict(pending)  # ainda no buffer: ler da tabela daria 404
+        with timed("ddb"):
+            resp = aws_mod.table_videos.get_item(Key={"id_video": id_video})
         return resp.get("Item")
 
-    def update_status(self, id_video: str, status: str) -> None:
-        aws_mod.table_videos.update_item(
-            Key={"id_video": id_video},
-            UpdateExpression="SET #s = :s, data_upload = :u",
-            ExpressionAttributeNames={"#s": "status"},
-            ExpressionAttributeValues={":s": status, ":u": datetime.utcnow().isoformat()},
-        )
+    def update_status(self, id_video: str, status: str, *, expected_version: Optional[int] = None) -> dict:
+        """
+        Transição condicional: só aplica se o status atual for uma origem válida
+        (e, com `expected_version`, se ninguém alterou o item desde a leitura).
+        Incrementa `version` e devolve o item novo (ALL_NEW), sem outro get_item.
+        """
+        previous = allowed_previous(status)
+        buffer = write_behind()
+        written = buffer.written(id_video) if buffer is not None else None
+        if written is not None:
+            # espera só esta linha (o put em lote não pode sobrescrever o update
+            # depois); se foi descartada, o update abaixo vira StatusConflict
+            futures_wait([written])
+        condition = Attr("id_video").exists() & Attr("status").is_in(sorted(p.value for p in previous))
+        if expected_version is not None:
+            # itens anteriores ao campo version contam como versão 0
+            version = Attr("version").eq(expected_version)
+            condition &= (Attr("version").not_exists() | version) if expected_version == 0 else version
+        try:
+            with timed("ddb"):
+                resp = aws_mod.table_videos.update_item(
+                    Key={"id_video": id_video},
+                    UpdateExpression="SET #s = :s, data_atualizacao = :u, #v = if_not_exists(#v, :zero) + :one",
+                    ConditionExpression=condition,
+                    ExpressionAttributeNames={"#s": "status", "#v": "version"},
+                    ExpressionAttributeValues={
+                        ":s": status, ":u": datetime.utcnow().isoformat(), ":zero": 0, ":one": 1,
+                    },
+                    ReturnValues="ALL_NEW",
+                )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                DDB_OPS.labels(op="update", status="error").inc()
+                raise
+            DDB_OPS.labels(op="update", status="conflict").inc()
+            raise StatusConflict(id_video, status, self.get(id_video)) from None
+        except Exception:
+            DDB_OPS.labels(op="update", status="error").inc()
+            raise
+        DDB_OPS.labels(op="update", status="ok").inc()
+        return resp["Attributes"]
+
+    def update_status_many(self, changes: Iterable[Tuple[str, str]]) -> List[StatusUpdateResult]:
+        """
+        Para workers atualizando vários jobs: cada item segue condicional e
+        independente (TransactWriteItems falharia o lote inteiro por um só),
+        com até DDB_BATCH_UPDATE_CONCURRENCY updates em voo.
+        """
+        changes = list(changes)
+
+        def _one(change: Tuple[str, str]) -> StatusUpdateResult:
+            id_video, status = change
+            try:
+                return StatusUpdateResult(id_video, status, item=self.update_status(id_video, status))
+            except Exception as e:
+                return StatusUpdateResult(id_video, status, error=e)
+
+        workers = max(1, min(settings.ddb_batch_update_concurrency, len(changes)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ddb-status") as pool:
+            return list(pool.map(_one, changes))
 
     def list_by_user(self, user_id) -> List[dict]:
         """
@@ -38,9 +129,10 @@ class VideoRepo(IVideoRepository):
         user_id = str(user_id)
         
         try:
-            resp = aws_mod.table_videos.scan(
-                FilterExpression=Attr("id").eq(user_id)  # se preferir por email, use Attr("email").eq(email)
-            )
+            with timed("ddb"):
+                resp = aws_mod.table_videos.scan(
+                    FilterExpression=Attr("id").eq(user_id)  # se preferir por email, use Attr("email").eq(email)
+                )
             DDB_OPS.labels(op="scan", status="ok").inc()
             return resp.get("Items", [])
         except Exception:
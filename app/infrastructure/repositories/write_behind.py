@@ -0,0 +1,207 @@
+# app/infrastructure/repositories/write_behind.py
+"""
+Write-behind para a tabela de vídeos (DDB_WRITE_BEHIND=true).
+
+`VideoRepo.put` enfileira o item num buffer limitado; uma thread junta até
+25 itens (ou o que chegar em DDB_WRITE_BEHIND_FLUSH_MS) e grava com um único
+BatchWriteItem, reenviando os `UnprocessedItems` com backoff exponencial.
+
+Garantia de ordem: cada item ganha um Future resolvido depois do
+BatchWriteItem que o gravou (ou com WriteBehindDropped, se esgotar os
+retries). `VideoRepo.put` espera esse Future, então o job SQS publicado
+depois do put sempre encontra a linha na tabela, e item descartado vira
+erro no request (sem 202 nem job para um vídeo que não existe). O ganho é
+de group commit: requests concorrentes dividem o mesmo BatchWriteItem.
+O mesmo id duas vezes no lote grava só o último; os dois Futures resolvem
+com o item que foi de fato para a tabela.
+
+* Buffer cheio (ou parando): `put` devolve None e o repositório grava na hora.
+* Itens ainda no buffer continuam visíveis para `VideoRepo.get`, e
+  `written(id_video)` dá o Future do item para quem precisa esperar só ele.
+* O lifespan chama `stop_write_behind()` no shutdown, que drena o buffer;
+  o que sobrar na fila depois da thread parar falha com WriteBehindDropped.
+"""
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Set, Tuple
+
+import app.aws as aws_mod
+from app.core.metrics import DDB_OPS, DDB_WRITE_BEHIND_FAILED, DDB_WRITE_BUFFER_DEPTH, DDB_WRITE_FLUSH
+
+logger = logging.getLogger("ddb")
+
+BATCH_WRITE_MAX = 25  # limite do BatchWriteItem
+
+Entry = Tuple[dict, Future]
+
+
+class WriteBehindDropped(RuntimeError):
+    pass
+
+
+class WriteBehindBuffer:
+    def __init__(self, max_items: int = 1000, flush_interval: float = 0.05, max_retries: int = 5, backoff: float = 0.05):
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.failed = 0
+        self._queue: "queue.Queue[Entry]" = queue.Queue(maxsize=max_items)
+        self._pending: Dict[str, Entry] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "WriteBehindBuffer":
+        self._thread = threading.Thread(target=self._run, name="ddb-write-behind", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Para a thread depois de gravar tudo que já estava no buffer."""
+        with self._lock:  # depois daqui nenhum put entra na fila
+            self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        leftover = []
+        while True:
+            try:
+                leftover.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if leftover:
+            self._settle(leftover, {item["id_video"] for item, _ in leftover}, None)
+
+    def put(self, item: dict) -> Optional[Future]:
+        """Future resolvido quando o item estiver gravado; None = não coube (gravar direto)."""
+        entry: Entry = (item, Future())
+        # checar o stop e enfileirar sob o lock: a thread não sai entre os dois passos
+        with self._lock:
+            if self._stop.is_set():
+                return None
+            try:
+                self._queue.put_nowait(entry)
+            except queue.Full:
+                return None
+            self._pending[item["id_video"]] = entry
+        DDB_WRITE_BUFFER_DEPTH.set(self._queue.qsize())
+        return entry[1]
+
+    def pending(self, id_video: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._pending.get(id_video)
+        return entry[0] if entry is not None else None
+
+    def written(self, id_video: str) -> Optional[Future]:
+        """Future do item ainda no buffer (None = nada pendente para esse id)."""
+        with self._lock:
+            entry = self._pending.get(id_video)
+        return entry[1] if entry is not None else None
+
+    def flush(self) -> None:
+        """Bloqueia até tudo que foi enfileirado ter sido gravado (ou descartado)."""
+        self._queue.join()
+
+    def _next_batch(self) -> List[Entry]:
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        # segura até flush_interval para fechar um lote cheio (no shutdown, não espera)
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < BATCH_WRITE_MAX:
+            remaining = 0 if self._stop.is_set() else deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                if self._stop.is_set():
+                    return
+                continue
+            error: Optional[Exception] = None
+            try:
+                dropped = self._write([item for item, _ in batch])
+            except Exception as e:
+                logger.exception("Falha inesperada no write-behind (%d itens)", len(batch))
+                dropped, error = {item["id_video"] for item, _ in batch}, e
+            self._settle(batch, dropped, error)
+
+    def _settle(self, batch: List[Entry], dropped: Set[str], error: Optional[Exception]) -> None:
+        """Resolve os Futures do lote, tira os itens de `_pending` e libera o `join`."""
+        stored = {item["id_video"]: item for item, _ in batch}  # o último de cada id é o gravado
+        for item, written in batch:
+            id_video = item["id_video"]
+            if id_video in dropped:
+                written.set_exception(error or WriteBehindDropped(f"Item {id_video} não foi gravado no DynamoDB"))
+            else:
+                written.set_result(stored[id_video])
+        with self._lock:
+            for entry in batch:
+                if self._pending.get(entry[0]["id_video"]) is entry:
+                    del self._pending[entry[0]["id_video"]]
+        for _ in batch:
+            self._queue.task_done()
+        DDB_WRITE_BUFFER_DEPTH.set(self._queue.qsize())
+
+    def _write(self, batch: List[dict]) -> Set[str]:
+        """Grava o lote; devolve os id_video descartados depois dos retries."""
+        # o mesmo id duas vezes no lote é ValidationException: vale o último
+        latest = {item["id_video"]: item for item in batch}
+        requests = [{"PutRequest": {"Item": item}} for item in latest.values()]
+        table = aws_mod.table_videos.name
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            try:
+                resp = aws_mod.ddb.batch_write_item(RequestItems={table: requests})
+                DDB_OPS.labels(op="batch_write", status="ok").inc()
+                requests = resp.get("UnprocessedItems", {}).get(table, [])
+            except Exception as e:
+                DDB_OPS.labels(op="batch_write", status="error").inc()
+                logger.warning("BatchWriteItem falhou (%d itens, tentativa %d): %s", len(requests), attempt + 1, e)
+            if not requests:
+                break
+            if attempt >= self.max_retries:
+                dropped = {r["PutRequest"]["Item"]["id_video"] for r in requests}
+                self.failed += len(requests)
+                DDB_WRITE_BEHIND_FAILED.inc(len(requests))
+                logger.error(
+                    "Write-behind descartou %d itens após %d tentativas (id_video=%s)",
+                    len(requests), attempt + 1, ",".join(sorted(dropped)),
+                )
+                DDB_WRITE_FLUSH.observe(time.perf_counter() - start)
+                return dropped
+            attempt += 1
+            time.sleep(min(self.backoff * 2 ** attempt, 2.0))
+        DDB_WRITE_FLUSH.observe(time.perf_counter() - start)
+        return set()
+
+
+_buffer: Optional[WriteBehindBuffer] = None
+
+
+def start_write_behind(max_items: int, flush_ms: float, max_retries: int) -> WriteBehindBuffer:
+    global _buffer
+    stop_write_behind()
+    _buffer = WriteBehindBuffer(max_items, flush_ms / 1000.0, max_retries).start()
+    logger.info("Write-behind DynamoDB ligado (buffer=%d itens, flush=%.0fms)", max_items, flush_ms)
+    return _buffer
+
+
+def stop_write_behind() -> None:
+    global _buffer
+    buffer, _buffer = _buffer, None
+    if buffer is not None:
+        buffer.stop()
+
+
+def write_behind() -> Optional[WriteBehindBuffer]:
+    return _buffer
@@ -1,13 +1,20 @@
 # app/main.py
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Response
+from fastapi import Depends, FastAPI, HTTPException, Query, Response
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
 
+from app import aws
 from app.config import settings
 from app.core import auth as core_auth
+from app.core import profiling
+from app.core.loop_monitor import start_loop_monitor, stop_loop_monitor
+from app.core.tracing import setup_tracing, shutdown_tracing
 from app.infrastructure.clients.auth_client import AuthClient
+from app.infrastructure.repositories.write_behind import start_write_behind, stop_write_behind
 from app.routers import videos as videos_router
+from app.utils.spool import configure_spooling
 
 from fastapi import APIRouter
 
@@ -52,27 +59,69 @@ async def auth_status():
     return info
 
 
+@router_debug.get("/profile", response_class=PlainTextResponse, dependencies=[Depends(core_auth.require_admin)])
+async def debug_profile(
+    seconds: float = Query(10, gt=0),
+    mode: str = Query("cpu", pattern="^(cpu|memory)$"),
+    interval_ms: float = Query(5, ge=1, le=1000),
+):
+    """
+    Profile de CPU (amostragem) ou memória (tracemalloc) dos próximos N segundos,
+    em formato folded (flamegraph.pl / speedscope / Grafana Flame Graph).
+    """
+    seconds = min(seconds, settings.profile_max_seconds)
+    try:
+        if mode == "memory":
+            return await profiling.profile_memory(seconds)
+        return await profiling.profile_cpu(seconds, interval_ms / 1000.0)
+    except profiling.ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router_debug.get("/profile/slow", dependencies=[Depends(core_auth.require_admin)])
+async def debug_slow_requests():
+    monitor = profiling.slow_request_monitor()
+    return {
+        "threshold_ms": settings.profile_slow_request_ms,
+        "captures": list(monitor.captures) if monitor is not None else [],
+    }
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # startup
     setup_logging()
+    configure_spooling()
+    setup_tracing()  # antes de qualquer client boto3 ser criado (hooks por client)
+    profiling.start_slow_request_monitor(settings.profile_slow_request_ms, keep=settings.profile_slow_keep)
+    start_loop_monitor(settings.loop_lag_interval_ms, settings.loop_block_threshold_ms, debug=settings.loop_block_debug)
 
-    # inicializa e injeta no módulo core_auth
-    client = AuthClient(
+    # único AuthClient do processo, usado por todas as dependencies de auth
+    core_auth.set_auth_client(AuthClient(
         base_url=settings.auth_base_url,
         timeout_seconds=settings.auth_timeout_seconds,
         cache_ttl=settings.auth_cache_ttl_seconds,
-    )
-    core_auth.auth_client = client
-    app.state.auth_client = client   # só se quiser acessar via request.app.state
+    ))
+    app.state.auth_client = core_auth.get_auth_client()   # só se quiser acessar via request.app.state
+
+    # clients AWS são lazy; aquecer aqui tira o custo do primeiro request
+    if settings.aws_eager_init:
+        aws.init_clients()
+    if settings.ddb_write_behind:
+        start_write_behind(
+            settings.ddb_write_behind_max_items, settings.ddb_write_behind_flush_ms,
+            settings.ddb_write_behind_max_retries,
+        )
 
     try:
         yield
     finally:
-        if core_auth.auth_client:
-            await core_auth.auth_client.aclose()
-        core_auth.auth_client = None
+        await stop_loop_monitor()
+        await core_auth.close_auth_client()
+        stop_write_behind()  # drena o buffer antes de descartar os clients
+        aws.reset_clients()
+        shutdown_tracing()
+        profiling.stop_slow_request_monitor()
 
 
 # --- App ---
@@ -4,8 +4,19 @@ from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import Response
 
+from app.config import settings
 from app.core.logging import set_request_context
-from app.core.metrics import REQUESTS, LATENCY
+from app.core.profiling import slow_request_monitor
+from app.core.timing import start_request_timings
+from app.core.tracing import server_span
+from app.core.metrics import (
+    LATENCY,
+    LATENCY_READ,
+    LATENCY_UPLOAD,
+    REQUESTS,
+    UPLOAD_SECONDS_PER_MB,
+    UPLOAD_SIZE,
+)
 
 log = logging.getLogger("http")
 
@@ -16,36 +27,76 @@ def _path_template(request: Request) -> str:
     except Exception:
         return request.url.path
 
+def _route_class(method: str, path: str) -> str:
+    """upload | read | other: cada classe tem buckets de latência próprios."""
+    if method == "POST" and path.startswith("/videos/upload"):
+        return "upload"
+    if method in ("GET", "HEAD"):
+        return "read"
+    return "other"
+
+
+def _observe_latency(request: Request, path: str, method: str, status: int, seconds: float) -> None:
+    LATENCY.labels(path=path, method=method).observe(seconds)
+    route_class = _route_class(method, path)
+    if route_class == "read":
+        LATENCY_READ.labels(path=path, method=method).observe(seconds)
+    elif route_class == "upload":
+        LATENCY_UPLOAD.labels(path=path).observe(seconds)
+        size = getattr(request.state, "upload_bytes", None)  # só o upload unitário grava (o lote observa o tamanho por arquivo)
+        if size and status < 400:
+            UPLOAD_SIZE.observe(size)
+            UPLOAD_SECONDS_PER_MB.observe(seconds / (size / (1024 * 1024)))
+
+
 class ObservabilityMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
         rid = request.headers.get("X-Request-ID") or uuid.uuid4().hex
-        # (Opcional) quando Auth estiver plugado: extrair user_id do JWT
-        user_id = None
-
-        set_request_context(rid, user_id)
+        set_request_context(rid)
+        timings = start_request_timings()  # auth/S3/DDB/SQS registram aqui (ver app.core.timing)
         start = time.perf_counter()
         path_tmpl = _path_template(request)
+        monitor = slow_request_monitor()  # None = captura de requests lentos desligada
+        watch = monitor.begin(path_tmpl, rid) if monitor is not None else None
+
+        with server_span(request.method, path_tmpl, request.headers) as span:
+            try:
+                response: Response = await call_next(request)
+                status = response.status_code
+                if settings.server_timing_header:
+                    response.headers["Server-Timing"] = timings.server_timing((time.perf_counter() - start) * 1000.0)
+                return response
+            finally:
+                dur = (time.perf_counter() - start) * 1000.0
+                if watch is not None:
+                    monitor.end(watch)
+                method = request.method
+                status = locals().get("status", 500)
+                # depois do roteamento o scope já tem a rota: label pelo template, não pelo path cru
+                path_tmpl = _path_template(request)
+                if span is not None:
+                    span.update_name(f"{method} {path_tmpl}")
+                    span.set_attribute("http.route", path_tmpl)
+                    span.set_attribute("http.response.status_code", status)
+
+                # require_user roda em outra task (call_next) e grava o usuário no
+                # request.state compartilhado; propaga o user_id p/ o log de acesso
+                user = getattr(request.state, "user", None)
+                if user is not None:
+                    set_request_context(user_id=str(user.id))
+
+                # métricas
+                REQUESTS.labels(path=path_tmpl, method=method, status=str(status)).inc()
+                _observe_latency(request, path_tmpl, method, status, dur / 1000.0)
 
-        try:
-            response: Response = await call_next(request)
-            status = response.status_code
-            return response
-        finally:
-            dur = (time.perf_counter() - start) * 1000.0
-            method = request.method
-            status = locals().get("status", 500)
-
-            # métricas
-            REQUESTS.labels(path=path_tmpl, method=method, status=str(status)).inc()
-            LATENCY.labels(path=path_tmpl, method=method).observe(dur / 1000.0)
-
-            # log de acesso
-            log.info(
-                f"{method} {path_tmpl} -> {status} in {dur:.1f}ms",
-                extra={
-                    "path": path_tmpl,
-                    "method": method,
-                    "status": status,
-                    "duration_ms": round(dur, 1),
-                },
-            )
+                # log de acesso
+                log.info(
+                    f"{method} {path_tmpl} -> {status} in {dur:.1f}ms",
+                    extra={
+                        "path": path_tmpl,
+                        "method": method,
+                        "status": status,
+                        "duration_ms": round(dur, 1),
+                        "timings": timings.as_dict() or None,
+                    },
+                )
@@ -1,27 +1,40 @@
 # app/routers/videos.py
+import asyncio
+import os
 import uuid
 from datetime import datetime
 from urllib.parse import urlparse
 
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, Security
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, Request
+from starlette.concurrency import run_in_threadpool
 
 from ..config import settings
 from ..domain.models.video import VideoItem
-from ..domain.models.response import UploadResponse, StatusResponse
+from ..domain.models.video_status import VideoStatus
+from ..domain.models.response import BatchUploadItem, BatchUploadResponse, UploadResponse, StatusResponse
 from ..domain.repositories.video_repository_interface import IVideoRepository
 from ..infrastructure.repositories.video_repo import VideoRepo
-from ..utils.s3 import build_s3_key, put_object
+from ..utils.s3 import Body, build_s3_key, put_object
+from ..utils.spool import upload_body, upload_size
+from ..utils.media import SNIFF_BYTES, sniff_container
+from ..utils.media_meta import FileReader, MediaMeta, safe_extract_metadata
 from ..aws import sqs, s3
 
-from app.core.metrics import UPLOAD_BYTES, SQS_OPS
-from typing import Dict, Any
-from app.auth import require_user
+from app.core.metrics import UPLOAD_BATCH_FILES, UPLOAD_BYTES, UPLOAD_SIZE, S3_OPS, SQS_OPS, SQS_JOBS
+from app.core.timing import timed
+from app.core.tracing import inject_message_attributes, span
+from app.services.job_codec import encode_job, job_from_item
+from app.services.job_routing import route_job
+from typing import Any, BinaryIO, Dict, Optional, Tuple
+from app.core.auth import require_user
+from app.domain.models.user_model import UserContext
 
 import logging
 
 from typing import List
 
+# auth roda uma única vez por request: o FastAPI cacheia a dependency entre
+# router e endpoint, e require_user guarda o UserContext em request.state.user
 router = APIRouter(
     prefix="/videos",
     tags=["videos"],
@@ -29,7 +42,7 @@ router = APIRouter(
 )
 
 ALLOWED_MIME_PREFIX = "video/"
-bearer = HTTPBearer()  
+SQS_BATCH_MAX = 10  # limite do SendMessageBatch
 
 
 def get_video_repo() -> IVideoRepository:
@@ -37,62 +50,72 @@ def get_video_repo() -> IVideoRepository:
 
 logger = logging.getLogger("videos")
 
-@router.post("/upload", response_model=UploadResponse, status_code=202)
-async def upload_video(
-    titulo: str = Form(..., max_length=200),
-    autor: str = Form(..., max_length=100),
-    file: UploadFile = File(...),
-    repo: IVideoRepository = Depends(get_video_repo),
-    _sec: HTTPAuthorizationCredentials = Security(bearer),  # expõe o esquema no OpenAPI
-    _token: str = Depends(require_user),                     # valida de verdade o token
-) -> UploadResponse:
-    id_video = str(uuid.uuid4())
-
+def _check_upload(file: UploadFile) -> int:
+    """Valida MIME declarado e tamanho (sem ler o corpo); devolve o tamanho."""
     if not (file.content_type or "").startswith(ALLOWED_MIME_PREFIX):
         raise HTTPException(status_code=415, detail="Tipo de arquivo não suportado (esperado video/*)")
 
-    data = await file.read()
-    UPLOAD_BYTES.inc(len(data))
+    size = upload_size(file)
+    UPLOAD_BYTES.inc(size)
 
     max_bytes = settings.max_upload_mb * 1024 * 1024
-    if len(data) > max_bytes:
+    if size > max_bytes:
         raise HTTPException(status_code=413, detail=f"Arquivo excede limite de {settings.max_upload_mb}MB")
+    return size
+
 
+def _inspect_upload(fileobj: BinaryIO) -> MediaMeta:
+    # valida o conteúdo pelos primeiros KB (o content_type é só o que o cliente declarou)
+    head = fileobj.read(SNIFF_BYTES)
+    fileobj.seek(0)
+    media = sniff_container(head)
+    if media is None:
+        raise HTTPException(status_code=415, detail="Conteúdo não reconhecido como vídeo (MP4, MKV/WebM, AVI ou MPEG-TS)")
+    # duração/resolução/codecs lendo só os headers (moov/Segment Info) do arquivo local
+    return safe_extract_metadata(FileReader(fileobj), media)
+
+
+async def _read_upload(file: UploadFile, size: int) -> Tuple[Body, MediaMeta]:
+    # seeks/leituras (até MAX_MOOV_BYTES) no spool, que pode estar em disco: fora do event loop
+    with timed("media"):
+        meta = await run_in_threadpool(_inspect_upload, file.file)
+
+    # acima do threshold de spool o corpo segue como arquivo em disco (sem cópia no heap)
+    with timed("body"):
+        data = await upload_body(file, size)
+    return data, meta
+
+
+def _store_upload(file: UploadFile, data: Body) -> Tuple[str, Any]:
     _, key = build_s3_key(file.filename)
     try:
-        put_object(settings.s3_bucket, key, data, file.content_type or "application/octet-stream")
+        with timed("s3"):
+            stored = put_object(settings.s3_bucket, key, data, file.content_type or "application/octet-stream")
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Falha ao salvar no storage: {e}")
+    return key, stored
 
-    now = datetime.utcnow()
-
-    user_id = str(_token.id)
 
-    item = VideoItem(
-        id_video=id_video,
+def _video_item(titulo: str, autor: str, user: UserContext, key: str, size: int, stored: Any, meta: MediaMeta) -> VideoItem:
+    now = datetime.utcnow()
+    return VideoItem(
+        id_video=str(uuid.uuid4()),
         titulo=titulo.strip(),
         autor=autor.strip(),
-        status="UPLOADED",
+        status=VideoStatus.UPLOADED.value,
         file_path=f"s3://{settings.s3_bucket}/{key}",
         data_criacao=now,
         data_upload=now,
-        email=_token.email,
-        username=_token.username,
-        id=user_id,
+        email=user.email,
+        username=user.username,
+        id=str(user.id),
+        size_bytes=size,
+        checksum_sha256=getattr(stored, "sha256", None),
+        **meta.as_item_fields(),
     )
 
-    repo.put(item.model_dump(mode="json"))
-
-    logger.info(f"Enviando mensagem SQS para processamento: {item.model_dump_json()}")
-
-    try:
-        sqs.send_message(QueueUrl=settings.sqs_queue_url, MessageBody=item.model_dump_json())
-        logger.info(f"Message Body: {item.model_dump_json()}")
-        SQS_OPS.labels(op="send", status="ok").inc()
-    except Exception:
-        SQS_OPS.labels(op="send", status="error").inc()
-        raise
 
+def _upload_response(item: VideoItem, key: str) -> UploadResponse:
     return UploadResponse(
         id_video=item.id_video,
         titulo=item.titulo,
@@ -108,17 +131,225 @@ async def upload_video(
         id=item.id,
     )
 
+
+def _encode(record: Dict[str, Any], user: UserContext):
+    # fila por classe (tamanho / tier do usuário) para escalar workers separadamente
+    route = route_job(record["size_bytes"], getattr(user, "role", None))
+    # envelope compacto: o worker só precisa de ids, S3, tamanho, checksum e mídia
+    body, attributes = encode_job(
+        job_from_item(record), job_class=route.job_class,
+        gzip_threshold=settings.job_message_gzip_threshold_bytes,
+    )
+    return route, body, attributes
+
+
+def _publish_job(record: Dict[str, Any], user: UserContext) -> None:
+    route, body, attributes = _encode(record, user)
+    try:
+        # span PRODUCER + traceparent nos attributes: o worker continua o mesmo trace
+        with timed("sqs"), span("publish video job", kind="producer", **{
+            "messaging.system": "aws_sqs", "messaging.destination.name": route.queue_url,
+            "video.id": record["id_video"], "video.job_class": route.job_class,
+        }):
+            inject_message_attributes(attributes)
+            sqs.send_message(QueueUrl=route.queue_url, MessageBody=body, MessageAttributes=attributes)
+        logger.info(
+            "Job enviado para processamento (id_video=%s job_class=%s bytes=%d)",
+            record["id_video"], route.job_class, len(body),
+        )
+        SQS_OPS.labels(op="send", status="ok").inc()
+        SQS_JOBS.labels(job_class=route.job_class, status="ok").inc()
+    except Exception:
+        SQS_OPS.labels(op="send", status="error").inc()
+        SQS_JOBS.labels(job_class=route.job_class, status="error").inc()
+        raise
+
+
+@router.post("/upload", response_model=UploadResponse, status_code=202)
+async def upload_video(
+    request: Request,
+    titulo: str = Form(..., max_length=200),
+    autor: str = Form(..., max_length=100),
+    file: UploadFile = File(...),
+    repo: IVideoRepository = Depends(get_video_repo),
+    user: UserContext = Depends(require_user),
+) -> UploadResponse:
+    size = _check_upload(file)
+    request.state.upload_bytes = size  # histogramas de tamanho e s/MB no middleware
+    data, meta = await _read_upload(file, size)
+    # S3 (multipart com retries), DynamoDB e SQS são boto3 síncrono: fora do event loop
+    key, stored = await run_in_threadpool(_store_upload, file, data)
+
+    item = _video_item(titulo, autor, user, key, size, stored, meta)
+    record = item.model_dump(mode="json")
+    await run_in_threadpool(repo.put, record)
+    await run_in_threadpool(_publish_job, record, user)
+
+    return _upload_response(item, key)
+
+
+def _publish_jobs(records: List[Dict[str, Any]], user: UserContext) -> set:
+    """
+    Publica os jobs com SendMessageBatch (até 10 por chamada, por fila).
+    Devolve os id_video que não entraram na fila.
+    """
+    by_queue: Dict[str, list] = {}
+    for record in records:
+        route, body, attributes = _encode(record, user)
+        by_queue.setdefault(route.queue_url, []).append((record["id_video"], route.job_class, body, attributes))
+
+    failed = set()
+    for queue_url, jobs in by_queue.items():
+        for offset in range(0, len(jobs), SQS_BATCH_MAX):
+            chunk = jobs[offset:offset + SQS_BATCH_MAX]
+            try:
+                with timed("sqs"), span("publish video jobs", kind="producer", **{
+                    "messaging.system": "aws_sqs", "messaging.destination.name": queue_url,
+                    "messaging.batch.message_count": len(chunk),
+                }):
+                    resp = sqs.send_message_batch(QueueUrl=queue_url, Entries=[
+                        {"Id": str(i), "MessageBody": body, "MessageAttributes": inject_message_attributes(attributes)}
+                        for i, (_, _, body, attributes) in enumerate(chunk)
+                    ])
+                SQS_OPS.labels(op="send_batch", status="ok").inc()
+                rejected = {int(entry["Id"]) for entry in resp.get("Failed", [])}
+            except Exception as e:
+                SQS_OPS.labels(op="send_batch", status="error").inc()
+                logger.error("Falha ao publicar lote de %d jobs em %s: %s", len(chunk), queue_url, e)
+                rejected = set(range(len(chunk)))
+            for i, (id_video, job_class, _, _) in enumerate(chunk):
+                status = "error" if i in rejected else "ok"
+                SQS_JOBS.labels(job_class=job_class, status=status).inc()
+                if i in rejected:
+                    failed.add(id_video)
+            logger.info(
+                "Lote de jobs enviado para processamento (fila=%s enviados=%d falhas=%d)",
+                queue_url, len(chunk) - len(rejected), len(rejected),
+            )
+    return failed
+
+
+def _persist_batch(repo: IVideoRepository, records: List[Dict[str, Any]]) -> Dict[str, Exception]:
+    """Grava o lote; se o put_many falhar, regrava item a item para isolar quem falhou."""
+    try:
+        repo.put_many(records)
+        return {}
+    except Exception as e:
+        logger.warning("Gravação do lote falhou (%d itens); tentando item a item: %s", len(records), e)
+    failed: Dict[str, Exception] = {}
+    for record in records:
+        try:
+            repo.put(record)  # put_item é idempotente: regravar o que o lote já gravou não duplica
+        except Exception as e:
+            failed[record["id_video"]] = e
+    return failed
+
+
+def _discard_object(key: str) -> None:
+    """Remove do S3 o arquivo de um vídeo que não foi registrado (sem linha, ninguém o acharia)."""
+    try:
+        s3.delete_object(Bucket=settings.s3_bucket, Key=key)
+        S3_OPS.labels(op="delete", status="ok").inc()
+    except Exception:
+        S3_OPS.labels(op="delete", status="error").inc()
+        logger.exception("Objeto órfão no S3 após falha ao registrar o vídeo (key=%s)", key)
+
+
+@router.post("/upload:batch", response_model=BatchUploadResponse, status_code=202)
+async def upload_videos_batch(
+    autor: str = Form(..., max_length=100),
+    files: List[UploadFile] = File(...),
+    titulos: Optional[List[str]] = Form(None),
+    repo: IVideoRepository = Depends(get_video_repo),
+    user: UserContext = Depends(require_user),
+) -> BatchUploadResponse:
+    """
+    Vários vídeos num único multipart (mesmo autor; `titulos` opcional, um por
+    arquivo, na mesma ordem; sem título vale o nome do arquivo).
+
+    Cada arquivo passa pelas mesmas validações do upload unitário; até
+    UPLOAD_BATCH_CONCURRENCY vão ao S3 em paralelo. Os itens são gravados com
+    um único batch_writer e os jobs saem em SendMessageBatch. A resposta traz
+    o resultado de cada arquivo (status_code igual ao do upload unitário);
+    arquivo que não pôde ser registrado no DynamoDB sai do S3 e volta como 500.
+    """
+    if len(files) > settings.upload_batch_max_files:
+        raise HTTPException(status_code=413, detail=f"Lote excede limite de {settings.upload_batch_max_files} arquivos")
+    if titulos is not None and len(titulos) != len(files):
+        raise HTTPException(status_code=422, detail="Envie um título por arquivo (ou nenhum)")
+    if titulos is not None and any(len(t) > 200 for t in titulos):
+        raise HTTPException(status_code=422, detail="Título excede 200 caracteres")
+
+    slots = asyncio.Semaphore(max(1, settings.upload_batch_concurrency))
+
+    async def ingest(file: UploadFile, titulo: str) -> Tuple[VideoItem, str] | BatchUploadItem:
+        # o semáforo limita também os corpos em memória, não só as conexões S3
+        async with slots:
+            try:
+                size = _check_upload(file)
+                data, meta = await _read_upload(file, size)
+                key, stored = await run_in_threadpool(_store_upload, file, data)
+            except HTTPException as e:
+                UPLOAD_BATCH_FILES.labels(status="error").inc()
+                return BatchUploadItem(filename=file.filename, status_code=e.status_code, detail=e.detail)
+            except Exception as e:
+                # erro inesperado (spool, metadados...) derruba só este arquivo, não o lote
+                logger.exception("Falha ao processar %s no upload em lote", file.filename)
+                UPLOAD_BATCH_FILES.labels(status="error").inc()
+                return BatchUploadItem(filename=file.filename, status_code=500, detail=f"Falha ao processar arquivo: {e}")
+        return _video_item(titulo, autor, user, key, size, stored, meta), key
+
+    default_titles = [os.path.splitext(f.filename or "")[0][:200] or "video" for f in files]
+    outcomes = await asyncio.gather(*(ingest(f, t) for f, t in zip(files, titulos or default_titles)))
+
+    stored_items = [o for o in outcomes if isinstance(o, tuple)]
+    records = [item.model_dump(mode="json") for item, _ in stored_items]
+    unsaved = await run_in_threadpool(_persist_batch, repo, records) if records else {}
+    for item, key in stored_items:
+        if item.id_video in unsaved:
+            await run_in_threadpool(_discard_object, key)
+    records = [r for r in records if r["id_video"] not in unsaved]  # sem linha, sem job
+    unpublished = await run_in_threadpool(_publish_jobs, records, user) if records else set()
+
+    results: List[BatchUploadItem] = []
+    for file, outcome in zip(files, outcomes):
+        if isinstance(outcome, BatchUploadItem):
+            results.append(outcome)
+            continue
+        item, key = outcome
+        if item.id_video in unsaved:
+            UPLOAD_BATCH_FILES.labels(status="error").inc()
+            results.append(BatchUploadItem(
+                filename=file.filename, status_code=500,
+                detail=f"Falha ao registrar vídeo: {unsaved[item.id_video]}",
+            ))
+            continue
+        if item.id_video in unpublished:
+            UPLOAD_BATCH_FILES.labels(status="error").inc()
+            results.append(BatchUploadItem(
+                filename=file.filename, status_code=500, detail="Falha ao publicar job de processamento",
+                video=_upload_response(item, key),
+            ))
+            continue
+        UPLOAD_BATCH_FILES.labels(status="ok").inc()
+        UPLOAD_SIZE.observe(item.size_bytes)
+        results.append(BatchUploadItem(filename=file.filename, status_code=202, video=_upload_response(item, key)))
+
+    # sem request.state.upload_bytes: o middleware não mede o lote como um upload só
+    # (o tamanho vai por arquivo acima)
+    accepted = sum(1 for r in results if r.status_code == 202)
+    return BatchUploadResponse(accepted=accepted, failed=len(results) - accepted, results=results)
+
 @router.get("/user/videos", response_model=List[VideoItem])
 def list_my_videos(
     repo: IVideoRepository = Depends(get_video_repo),
-    _sec: HTTPAuthorizationCredentials = Security(bearer),  # expõe o esquema no OpenAPI
-    _token = Depends(require_user),                         # payload do /me (tem .id, .email, etc.)
+    user: UserContext = Depends(require_user),  # mesmo UserContext do router (cacheado)
 ) -> List[VideoItem]:
     """
     Lista todos os vídeos do usuário autenticado.
     Usa o `id` vindo do token JWT (não aceita id por parâmetro).
     """
-    items = repo.list_by_user(_token.id)  # novo método no repo
+    items = repo.list_by_user(user.id)  # novo método no repo
     # retorno vazio é 200 com []
     return [VideoItem(**it) for it in items]    
 
@@ -126,8 +357,6 @@ def list_my_videos(
 def get_status(
     id_video: str,
     repo: IVideoRepository = Depends(get_video_repo),
-    _sec: HTTPAuthorizationCredentials = Security(bearer),
-    _token: str = Depends(require_user),
 ) -> StatusResponse:
     item = repo.get(id_video)
     if not item:
@@ -138,8 +367,6 @@ def get_status(
 def get_download(
     video_id: str,
     repo: IVideoRepository = Depends(get_video_repo),
-    _sec: HTTPAuthorizationCredentials = Security(bearer),
-    _token: str = Depends(require_user),
 ):
     item = repo.get(video_id)
     if not item:
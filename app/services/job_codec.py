@@ -0,0 +1,141 @@
+# app/services/job_codec.py
+"""
+Envelope compacto e versionado dos jobs enviados ao SQS.
+
+O corpo leva só o que o worker precisa (ids, localização no S3, tamanho,
+checksum — SHA-256 hex, ou o composto "<hex>-<partes>" do S3 em uploads
+multipart — e os metadados de mídia) com chaves curtas; corpos grandes vão
+gzip+base64. Versão do schema, encoding e classe do job seguem como message
+attributes, para o consumidor rotear/filtrar sem abrir o corpo.
+
+Produtor (upload) e consumidores (workers) usam este mesmo módulo.
+"""
+import base64
+import gzip
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+SCHEMA_VERSION = 1
+ENCODING_JSON = "json"
+ENCODING_GZIP = "gzip+base64"
+GZIP_THRESHOLD_BYTES = 1024
+
+# nome no envelope -> chave curta no corpo
+_FIELDS = {
+    "id_video": "id",
+    "user_id": "u",
+    "bucket": "b",
+    "key": "k",
+    "size": "s",
+    "sha256": "h",
+}
+_MEDIA_FIELDS = {
+    "container": "c",
+    "duration_ms": "d",
+    "width": "w",
+    "height": "hh",
+    "video_codec": "vc",
+    "audio_codec": "ac",
+}
+
+
+class JobDecodeError(ValueError):
+    pass
+
+
+@dataclass
+class JobEnvelope:
+    id_video: str
+    bucket: str
+    key: str
+    size: Optional[int] = None
+    sha256: Optional[str] = None
+    user_id: Optional[str] = None
+    media: Dict[str, Any] = field(default_factory=dict)
+    version: int = SCHEMA_VERSION
+
+
+def job_from_item(item: Dict[str, Any]) -> JobEnvelope:
+    """Monta o envelope a partir do item do DynamoDB (VideoItem.model_dump)."""
+    path = item.get("file_path") or ""
+    bucket, _, key = path[5:].partition("/") if path.startswith("s3://") else ("", "", "")
+    return JobEnvelope(
+        id_video=item["id_video"],
+        bucket=bucket,
+        key=key,
+        size=item.get("size_bytes"),
+        sha256=item.get("checksum_sha256"),
+        user_id=item.get("id"),
+        media={k: item[k] for k in _MEDIA_FIELDS if item.get(k) is not None},
+    )
+
+
+def _attr(value: Any) -> Dict[str, str]:
+    if isinstance(value, int):
+        return {"DataType": "Number", "StringValue": str(value)}
+    return {"DataType": "String", "StringValue": str(value)}
+
+
+def encode_job(
+    job: JobEnvelope,
+    job_class: Optional[str] = None,
+    gzip_threshold: int = GZIP_THRESHOLD_BYTES,
+) -> Tuple[str, Dict[str, Dict[str, str]]]:
+    """(MessageBody, MessageAttributes) prontos para sqs.send_message."""
+    doc: Dict[str, Any] = {"v": job.version}
+    for name, short in _FIELDS.items():
+        value = getattr(job, name)
+        if value is not None:
+            doc[short] = value
+    media = {short: job.media[name] for name, short in _MEDIA_FIELDS.items() if job.media.get(name) is not None}
+    if media:
+        doc["m"] = media
+    body = json.dumps(doc, separators=(",", ":"))
+
+    encoding = ENCODING_JSON
+    if len(body) > gzip_threshold:
+        body = base64.b64encode(gzip.compress(body.encode(), mtime=0)).decode()
+        encoding = ENCODING_GZIP
+
+    attributes = {"schema_version": _attr(job.version), "encoding": _attr(encoding)}
+    if job_class:
+        attributes["job_class"] = _attr(job_class)
+    return body, attributes
+
+
+def _attr_value(attributes: Optional[Dict[str, Any]], name: str) -> Optional[str]:
+    attr = (attributes or {}).get(name)
+    if isinstance(attr, dict):
+        return attr.get("StringValue")
+    return attr
+
+
+def decode_job(body: str, attributes: Optional[Dict[str, Any]] = None) -> JobEnvelope:
+    """
+    Decodifica o corpo recebido do SQS (aceita `MessageAttributes` no formato
+    do receive_message). Mensagens no formato antigo (VideoItem completo em
+    JSON, sem "v") continuam sendo lidas durante a migração.
+    """
+    try:
+        if _attr_value(attributes, "encoding") == ENCODING_GZIP:
+            body = gzip.decompress(base64.b64decode(body)).decode()
+        doc = json.loads(body)
+    except Exception as e:
+        raise JobDecodeError(f"corpo de job inválido: {e}") from e
+
+    if "v" not in doc:
+        if "id_video" not in doc:
+            raise JobDecodeError("mensagem sem versão e sem id_video")
+        return job_from_item(doc)
+    if doc["v"] > SCHEMA_VERSION:
+        raise JobDecodeError(f"schema de job não suportado: v{doc['v']}")
+
+    if not all(doc.get(_FIELDS[name]) for name in ("id_video", "bucket", "key")):
+        raise JobDecodeError("envelope de job sem id/bucket/key")
+    try:
+        values = {name: doc.get(short) for name, short in _FIELDS.items()}
+        media = {name: doc["m"][short] for name, short in _MEDIA_FIELDS.items() if short in doc.get("m", {})}
+        return JobEnvelope(media=media, version=doc["v"], **values)
+    except (KeyError, TypeError) as e:
+        raise JobDecodeError(f"envelope de job inválido: {e}") from e
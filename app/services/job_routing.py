@@ -0,0 +1,45 @@
+# app/services/job_routing.py
+"""
+Roteamento dos jobs de processamento por classe (small / large / priority).
+
+Cada classe tem sua fila, e assim pools de workers separados: um lote de
+arquivos grandes não atrasa os clipes curtos, e o tier do usuário
+(UserContext.role) pode furar a fila. Classe sem fila configurada usa
+SQS_QUEUE_URL.
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+from app.config import settings
+
+SMALL = "small"
+LARGE = "large"
+PRIORITY = "priority"
+
+
+@dataclass(frozen=True)
+class JobRoute:
+    job_class: str
+    queue_url: str
+
+
+def _priority_roles() -> set[str]:
+    return {r.strip() for r in settings.job_priority_roles.split(",") if r.strip()}
+
+
+def classify_job(size_bytes: int, role: Optional[str] = None) -> str:
+    if role and role in _priority_roles():
+        return PRIORITY
+    if size_bytes > settings.job_large_threshold_mb * 1024 * 1024:
+        return LARGE
+    return SMALL
+
+
+def route_job(size_bytes: int, role: Optional[str] = None) -> JobRoute:
+    job_class = classify_job(size_bytes, role)
+    queue_url = {
+        SMALL: settings.sqs_queue_url_small,
+        LARGE: settings.sqs_queue_url_large,
+        PRIORITY: settings.sqs_queue_url_priority,
+    }[job_class]
+    return JobRoute(job_class, queue_url or settings.sqs_queue_url)
@@ -0,0 +1,238 @@
+# app/utils/media.py
+"""
+Sniffer de container: olha só os primeiros KB do upload para recusar arquivos
+que não são vídeo antes de qualquer byte ir para o S3.
+
+Reconhece MP4/ISO-BMFF (ftyp/QuickTime), Matroska/WebM (EBML), AVI (RIFF) e
+MPEG-TS/M2TS (sync byte 0x47). Quando o próprio header traz a duração
+(mvhd no início do MP4, Segment Info do Matroska, avih do AVI), ela é extraída.
+"""
+import struct
+from dataclasses import dataclass
+from typing import Iterator, Optional, Tuple
+
+SNIFF_BYTES = 64 * 1024
+
+_QUICKTIME_ATOMS = {b"moov", b"mdat", b"wide", b"free", b"skip", b"pnot"}
+
+# ftyp: só brands de vídeo passam (HEIF/AVIF e M4A também usam ISO BMFF)
+_VIDEO_BRANDS = {
+    b"isom", b"mp41", b"mp42", b"mp71", b"avc1", b"qt  ", b"dash", b"M4V ", b"M4VH", b"M4VP",
+    b"f4v ", b"mmp4", b"MSNV", b"NDAS", b"XAVC", b"cmfc", b"cmf2",
+}
+_VIDEO_BRAND_PREFIXES = (b"iso", b"3gp", b"3g2")  # iso2..iso9, 3gp4..3gp9, 3g2a...
+# major brand que decide sozinha: imagem/áudio listam isom/mp42 como compatíveis
+_NON_VIDEO_MAJOR_BRANDS = {
+    b"M4A ", b"M4B ", b"M4P ", b"F4A ", b"F4B ",
+    b"heic", b"heix", b"heim", b"heis", b"hevc", b"hevx", b"mif1", b"msf1", b"avif", b"avis",
+    b"jp2 ", b"jpx ", b"crx ",
+}
+_TS_PACKET = 188
+_M2TS_PACKET = 192
+
+# IDs EBML usados (Matroska)
+_EBML_HEADER = 0x1A45DFA3
+_EBML_DOCTYPE = 0x4282
+_MKV_SEGMENT = 0x18538067
+_MKV_INFO = 0x1549A966
+_MKV_TIMECODE_SCALE = 0x2AD7B1
+_MKV_DURATION = 0x4489
+
+
+@dataclass
+class ContainerInfo:
+    container: str                     # mp4 | mov | matroska | webm | avi | mpegts
+    duration_ms: Optional[int] = None  # só quando o header já traz (sem ler o arquivo todo)
+
+
+# ---------- ISO-BMFF ----------
+
+def iter_boxes(data: bytes, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[bytes, int, int]]:
+    """(tipo, início do payload, fim do box) dos boxes de um nível; para no primeiro box truncado."""
+    end = len(data) if end is None else end
+    pos = start
+    while pos + 8 <= end:
+        size, kind = struct.unpack_from(">I4s", data, pos)
+        header = 8
+        if size == 1:
+            if pos + 16 > end:
+                return
+            size = struct.unpack_from(">Q", data, pos + 8)[0]
+            header = 16
+        elif size == 0:
+            size = end - pos  # vai até o fim do arquivo
+        if size < header or pos + size > end:
+            return
+        yield kind, pos + header, pos + size
+        pos += size
+
+
+def mvhd_duration_ms(data: bytes, start: int, end: int) -> Optional[int]:
+    """Duração do payload de um mvhd (versões 0 e 1)."""
+    if end - start < 20:
+        return None
+    version = data[start]
+    if version == 1:
+        if end - start < 32:
+            return None
+        timescale, duration = struct.unpack_from(">IQ", data, start + 20)
+    else:
+        timescale, duration = struct.unpack_from(">II", data, start + 12)
+    if not timescale:
+        return None
+    return duration * 1000 // timescale
+
+
+def _mp4_duration(head: bytes) -> Optional[int]:
+    for kind, start, end in iter_boxes(head):
+        if kind == b"moov":
+            for sub, s_start, s_end in iter_boxes(head, start, end):
+                if sub == b"mvhd":
+                    return mvhd_duration_ms(head, s_start, s_end)
+    return None
+
+
+# ---------- EBML / Matroska ----------
+
+def read_vint(data: bytes, pos: int, keep_marker: bool = False) -> Tuple[Optional[int], int]:
+    """Lê um inteiro de tamanho variável EBML; retorna (valor, próxima posição)."""
+    if pos >= len(data):
+        return None, pos
+    first = data[pos]
+    length = 1
+    mask = 0x80
+    while length <= 8 and not first & mask:
+        mask >>= 1
+        length += 1
+    if length > 8 or pos + length > len(data):
+        return None, pos
+    value = first if keep_marker else first & (mask - 1)
+    for b in data[pos + 1:pos + length]:
+        value = (value << 8) | b
+    if not keep_marker and value == (1 << (7 * length)) - 1:
+        value = -1  # tamanho desconhecido (live/streaming)
+    return value, pos + length
+
+
+def iter_ebml(data: bytes, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, int, int]]:
+    """(id, início do payload, fim do elemento); elementos de tamanho desconhecido vão até `end`."""
+    end = len(data) if end is None else end
+    pos = start
+    while pos < end:
+        eid, p = read_vint(data, pos, keep_marker=True)
+        if eid is None:
+            return
+        size, p = read_vint(data, p)
+        if size is None:
+            return
+        stop = end if size < 0 else min(p + size, end)
+        yield eid, p, stop
+        if size < 0 or p + size > end:
+            return
+        pos = p + size
+
+
+def ebml_uint(data: bytes, start: int, end: int) -> int:
+    return int.from_bytes(data[start:end], "big") if end > start else 0
+
+
+def ebml_float(data: bytes, start: int, end: int) -> Optional[float]:
+    if end - start == 4:
+        return struct.unpack_from(">f", data, start)[0]
+    if end - start == 8:
+        return struct.unpack_from(">d", data, start)[0]
+    return None
+
+
+def mkv_info_duration_ms(data: bytes, start: int, end: int) -> Optional[int]:
+    """Duração a partir do payload do Segment Info (Duration em unidades de TimecodeScale)."""
+    scale = 1_000_000
+    duration = None
+    for eid, s, e in iter_ebml(data, start, end):
+        if eid == _MKV_TIMECODE_SCALE:
+            scale = ebml_uint(data, s, e) or scale
+        elif eid == _MKV_DURATION:
+            duration = ebml_float(data, s, e)
+    if duration is None:
+        return None
+    return int(duration * scale / 1_000_000)
+
+
+def _ebml_doctype(head: bytes) -> Optional[str]:
+    for eid, start, end in iter_ebml(head):
+        if eid == _EBML_HEADER:
+            for sub, s, e in iter_ebml(head, start, end):
+                if sub == _EBML_DOCTYPE:
+                    return head[s:e].rstrip(b"\x00").decode("ascii", "replace")
+        return None
+    return None
+
+
+def _mkv_duration(head: bytes) -> Optional[int]:
+    for eid, start, end in iter_ebml(head):
+        if eid == _MKV_SEGMENT:
+            for sub, s, e in iter_ebml(head, start, end):
+                if sub == _MKV_INFO:
+                    return mkv_info_duration_ms(head, s, e)
+    return None
+
+
+# ---------- AVI / MPEG-TS ----------
+
+def _avi_duration(head: bytes) -> Optional[int]:
+    # RIFF 'AVI ' > LIST 'hdrl' > 'avih' (MicroSecPerFrame ... TotalFrames)
+    idx = head.find(b"avih", 12, 512)
+    if idx < 0 or idx + 8 + 20 > len(head):
+        return None
+    usec_per_frame = struct.unpack_from("<I", head, idx + 8)[0]
+    total_frames = struct.unpack_from("<I", head, idx + 8 + 16)[0]
+    if not usec_per_frame or not total_frames:
+        return None
+    return usec_per_frame * total_frames // 1000
+
+
+def _is_ts(head: bytes, packet: int, offset: int) -> bool:
+    positions = [offset + i * packet for i in range(3)]
+    available = [p for p in positions if p < len(head)]
+    return len(available) >= 2 and all(head[p] == 0x47 for p in available)
+
+
+# ---------- API ----------
+
+def _is_video_brand(brand: bytes) -> bool:
+    return brand in _VIDEO_BRANDS or brand.startswith(_VIDEO_BRAND_PREFIXES)
+
+
+def _ftyp_is_video(head: bytes) -> bool:
+    """Major brand ou algum compatible brand de vídeo (major de imagem/áudio recusa)."""
+    major = head[8:12]
+    if major in _NON_VIDEO_MAJOR_BRANDS:
+        return False
+    if _is_video_brand(major):
+        return True
+    size = struct.unpack_from(">I", head)[0]
+    end = min(size, len(head))
+    # payload do ftyp: major (4) + minor version (4) + compatible brands (4 cada)
+    return any(_is_video_brand(head[p:p + 4]) for p in range(16, end - 3, 4))
+
+
+def sniff_container(head: bytes) -> Optional[ContainerInfo]:
+    """Identifica o container pelos primeiros bytes; None se não parecer vídeo."""
+    if len(head) >= 12 and head[4:8] == b"ftyp":
+        if not _ftyp_is_video(head):
+            return None
+        brand = head[8:12]
+        container = "mov" if brand == b"qt  " else "mp4"
+        return ContainerInfo(container, _mp4_duration(head))
+    if len(head) >= 8 and head[4:8] in _QUICKTIME_ATOMS and struct.unpack_from(">I", head)[0] >= 8:
+        return ContainerInfo("mov", _mp4_duration(head))
+    if head[:4] == b"\x1a\x45\xdf\xa3":
+        doctype = _ebml_doctype(head)
+        if doctype not in ("matroska", "webm"):
+            return None
+        return ContainerInfo(doctype, _mkv_duration(head))
+    if len(head) >= 12 and head[:4] == b"RIFF" and head[8:12] == b"AVI ":
+        return ContainerInfo("avi", _avi_duration(head))
+    if _is_ts(head, _TS_PACKET, 0) or _is_ts(head, _M2TS_PACKET, 4):
+        return ContainerInfo("mpegts")
+    return None
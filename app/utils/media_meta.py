@@ -0,0 +1,339 @@
+# app/utils/media_meta.py
+"""
+Extração de metadados (duração, resolução, codecs) lendo só os headers.
+
+MP4/MOV: percorre os boxes de topo pelos headers (pula o mdat sem ler) e lê
+apenas o moov -> mvhd/trak(tkhd, hdlr, stsd). Um moov até MAX_MOOV_BYTES vem
+numa leitura só; acima disso (filmes longos: tabelas de amostras enormes) os
+boxes são percorridos pelos headers e só as folhas usadas são lidas, então o
+heap fica limitado mesmo com moov de dezenas de MB. Matroska/WebM: lê o início
+do Segment e, se Info/Tracks não estiverem ali, segue o SeekHead.
+
+As leituras passam por um `RangeReader` (bytes em memória ou o arquivo do
+spool); moov no fim do arquivo custa só algumas leituras pequenas.
+"""
+import logging
+import os
+import struct
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple
+
+from .media import (
+    ContainerInfo,
+    ebml_uint,
+    iter_boxes,
+    iter_ebml,
+    mkv_info_duration_ms,
+    mvhd_duration_ms,
+    read_vint,
+    sniff_container,
+)
+
+logger = logging.getLogger("videos")
+
+MAX_MOOV_BYTES = 1024 * 1024  # acima disso o moov é lido box a box (ver _mp4_meta_sparse)
+_MAX_ELEMENT_BYTES = MAX_MOOV_BYTES  # Info/Tracks do Matroska são pequenos; maior que isso não lemos
+_LEAF_BYTES = 128  # mvhd/tkhd/hdlr/início do stsd cabem nisso
+_MKV_WINDOW = 256 * 1024
+
+_MKV_SEGMENT = 0x18538067
+_MKV_SEEKHEAD = 0x114D9B74
+_MKV_SEEK = 0x4DBB
+_MKV_SEEK_ID = 0x53AB
+_MKV_SEEK_POSITION = 0x53AC
+_MKV_INFO = 0x1549A966
+_MKV_TRACKS = 0x1654AE6B
+_MKV_TRACK_ENTRY = 0xAE
+_MKV_TRACK_TYPE = 0x83
+_MKV_CODEC_ID = 0x86
+_MKV_VIDEO = 0xE0
+_MKV_PIXEL_WIDTH = 0xB0
+_MKV_PIXEL_HEIGHT = 0xBA
+
+
+@dataclass
+class MediaMeta:
+    container: str
+    duration_ms: Optional[int] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    video_codec: Optional[str] = None
+    audio_codec: Optional[str] = None
+
+    def as_item_fields(self) -> Dict[str, object]:
+        return asdict(self)
+
+
+# ---------- leitores ----------
+
+class RangeReader(ABC):
+    """Leitura aleatória por offset; `size` é o tamanho total do objeto."""
+
+    size: int
+
+    @abstractmethod
+    def read(self, offset: int, length: int) -> bytes:
+        """Até `length` bytes a partir de `offset` (menos no fim do objeto)."""
+
+
+class BytesReader(RangeReader):
+    def __init__(self, data: bytes):
+        self._data = data
+        self.size = len(data)
+
+    def read(self, offset: int, length: int) -> bytes:
+        return bytes(self._data[offset:offset + length])
+
+
+class FileReader(RangeReader):
+    """File object (ex.: spool do upload); preserva a posição atual do arquivo."""
+
+    def __init__(self, fileobj: BinaryIO):
+        self._f = fileobj
+        pos = fileobj.tell()
+        fileobj.seek(0, os.SEEK_END)
+        self.size = fileobj.tell()
+        fileobj.seek(pos)
+
+    def read(self, offset: int, length: int) -> bytes:
+        pos = self._f.tell()
+        try:
+            self._f.seek(offset)
+            return self._f.read(length)
+        finally:
+            self._f.seek(pos)
+
+
+# ---------- MP4 / MOV ----------
+
+def _box_header(reader: RangeReader, pos: int, end: int) -> Optional[Tuple[bytes, int, int]]:
+    """(tipo, início do payload, fim do box) lendo só o header do box em `pos`."""
+    header = reader.read(pos, 16)
+    if len(header) < 8:
+        return None
+    size, kind = struct.unpack_from(">I4s", header)
+    skip = 8
+    if size == 1:
+        if len(header) < 16:
+            return None
+        size, skip = struct.unpack_from(">Q", header, 8)[0], 16
+    elif size == 0:
+        size = end - pos  # vai até o fim do arquivo
+    if size < skip or pos + size > end:
+        return None
+    return kind, pos + skip, pos + size
+
+
+def _reader_boxes(reader: RangeReader, start: int, end: int) -> Iterator[Tuple[bytes, int, int]]:
+    """Como media.iter_boxes, mas sobre o reader: só os headers são lidos."""
+    pos = start
+    while pos + 8 <= end:
+        box = _box_header(reader, pos, end)
+        if box is None:
+            return
+        yield box
+        pos = box[2]
+
+
+def _find_moov(reader: RangeReader) -> Optional[Tuple[int, int]]:
+    """(offset, tamanho) do moov, pulando os outros boxes de topo pelos headers."""
+    pos = 0
+    while pos + 8 <= reader.size:
+        box = _box_header(reader, pos, reader.size)
+        if box is None:
+            return None
+        if box[0] == b"moov":
+            return pos, box[2] - pos
+        pos = box[2]
+    return None
+
+
+def _child(data: bytes, start: int, end: int, *path: bytes) -> Optional[Tuple[int, int]]:
+    for kind, s, e in iter_boxes(data, start, end):
+        if kind == path[0]:
+            return (s, e) if len(path) == 1 else _child(data, s, e, *path[1:])
+    return None
+
+
+def _apply_trak(meta: MediaMeta, handler: bytes, stsd: Optional[bytes], tkhd: Optional[bytes]) -> None:
+    """Preenche codec/resolução a partir dos payloads de hdlr, stsd e tkhd."""
+    codec = None
+    if stsd is not None and len(stsd) >= 16:
+        codec = stsd[12:16].decode("ascii", "replace").strip()
+
+    if handler == b"vide":
+        meta.video_codec = meta.video_codec or codec
+        if tkhd and meta.width is None:
+            offset = 88 if tkhd[0] == 1 else 76  # largura/altura 16.16 no fim do tkhd
+            if offset + 8 <= len(tkhd):
+                width, height = struct.unpack_from(">II", tkhd, offset)
+                meta.width, meta.height = width >> 16, height >> 16
+    elif handler == b"soun":
+        meta.audio_codec = meta.audio_codec or codec
+
+
+def _parse_trak(data: bytes, start: int, end: int, meta: MediaMeta) -> None:
+    hdlr = _child(data, start, end, b"mdia", b"hdlr")
+    stsd = _child(data, start, end, b"mdia", b"minf", b"stbl", b"stsd")
+    tkhd = _child(data, start, end, b"tkhd")
+    _apply_trak(
+        meta,
+        data[hdlr[0] + 8:hdlr[0] + 12] if hdlr else b"",
+        data[stsd[0]:stsd[1]] if stsd else None,
+        data[tkhd[0]:tkhd[1]] if tkhd else None,
+    )
+
+
+def _reader_child(reader: RangeReader, start: int, end: int, *path: bytes) -> Optional[Tuple[int, int]]:
+    for kind, s, e in _reader_boxes(reader, start, end):
+        if kind == path[0]:
+            return (s, e) if len(path) == 1 else _reader_child(reader, s, e, *path[1:])
+    return None
+
+
+def _read_leaf(reader: RangeReader, box: Optional[Tuple[int, int]]) -> Optional[bytes]:
+    return reader.read(box[0], min(box[1] - box[0], _LEAF_BYTES)) if box else None
+
+
+def _mp4_meta_sparse(reader: RangeReader, start: int, end: int, meta: MediaMeta) -> None:
+    """moov grande: percorre pelos headers e lê só mvhd, tkhd, hdlr e o início do stsd."""
+    for kind, s, e in _reader_boxes(reader, start, end):
+        if kind == b"mvhd":
+            data = _read_leaf(reader, (s, e))
+            meta.duration_ms = mvhd_duration_ms(data, 0, len(data))
+        elif kind == b"trak":
+            hdlr = _read_leaf(reader, _reader_child(reader, s, e, b"mdia", b"hdlr")) or b""
+            stsd = _read_leaf(reader, _reader_child(reader, s, e, b"mdia", b"minf", b"stbl", b"stsd"))
+            tkhd = _read_leaf(reader, _reader_child(reader, s, e, b"tkhd"))
+            _apply_trak(meta, hdlr[8:12], stsd, tkhd)
+
+
+def _mp4_meta(reader: RangeReader, container: str) -> MediaMeta:
+    meta = MediaMeta(container)
+    found = _find_moov(reader)
+    if found is None:
+        return meta
+    if found[1] > MAX_MOOV_BYTES:
+        box = _box_header(reader, found[0], found[0] + found[1])
+        if box is not None:
+            _mp4_meta_sparse(reader, box[1], box[2], meta)
+        return meta
+    data = reader.read(*found)
+    moov = next(iter_boxes(data), None)
+    if moov is None:
+        return meta
+    _, start, end = moov
+    for kind, s, e in iter_boxes(data, start, end):
+        if kind == b"mvhd":
+            meta.duration_ms = mvhd_duration_ms(data, s, e)
+        elif kind == b"trak":
+            _parse_trak(data, s, e, meta)
+    return meta
+
+
+# ---------- Matroska / WebM ----------
+
+def _read_element(reader: RangeReader, offset: int) -> Optional[Tuple[int, bytes]]:
+    """Lê um elemento EBML inteiro a partir do offset absoluto (via SeekHead)."""
+    header = reader.read(offset, 12)
+    eid, p = read_vint(header, 0, keep_marker=True)
+    size, p = read_vint(header, p) if eid is not None else (None, 0)
+    if eid is None or size is None or size < 0 or size > _MAX_ELEMENT_BYTES:
+        return None
+    return eid, reader.read(offset + p, size)
+
+
+def _parse_tracks(data: bytes, start: int, end: int, meta: MediaMeta) -> None:
+    for eid, s, e in iter_ebml(data, start, end):
+        if eid != _MKV_TRACK_ENTRY:
+            continue
+        kind, codec, width, height = None, None, None, None
+        for sub, ss, se in iter_ebml(data, s, e):
+            if sub == _MKV_TRACK_TYPE:
+                kind = ebml_uint(data, ss, se)
+            elif sub == _MKV_CODEC_ID:
+                codec = data[ss:se].rstrip(b"\x00").decode("ascii", "replace")
+            elif sub == _MKV_VIDEO:
+                for v, vs, ve in iter_ebml(data, ss, se):
+                    if v == _MKV_PIXEL_WIDTH:
+                        width = ebml_uint(data, vs, ve)
+                    elif v == _MKV_PIXEL_HEIGHT:
+                        height = ebml_uint(data, vs, ve)
+        if kind == 1 and meta.video_codec is None:
+            meta.video_codec, meta.width, meta.height = codec, width, height
+        elif kind == 2 and meta.audio_codec is None:
+            meta.audio_codec = codec
+
+
+def _mkv_meta(reader: RangeReader, container: str) -> MediaMeta:
+    meta = MediaMeta(container)
+    head = reader.read(0, _MKV_WINDOW)
+    segment = next(((s, e) for eid, s, e in iter_ebml(head) if eid == _MKV_SEGMENT), None)
+    if segment is None:
+        return meta
+    seg_start, seg_end = segment
+    seen, seeks = set(), {}
+    for eid, s, e in iter_ebml(head, seg_start, seg_end):
+        complete = e < len(head) or len(head) == reader.size  # não foi cortado pela janela
+        if eid == _MKV_INFO and complete:
+            meta.duration_ms = mkv_info_duration_ms(head, s, e)
+            seen.add(eid)
+        elif eid == _MKV_TRACKS and complete:
+            _parse_tracks(head, s, e, meta)
+            seen.add(eid)
+        elif eid == _MKV_SEEKHEAD:
+            for seek, ss, se in iter_ebml(head, s, e):
+                if seek != _MKV_SEEK:
+                    continue
+                target, position = None, None
+                for sub, x, y in iter_ebml(head, ss, se):
+                    if sub == _MKV_SEEK_ID:
+                        target = ebml_uint(head, x, y)
+                    elif sub == _MKV_SEEK_POSITION:
+                        position = ebml_uint(head, x, y)
+                if target is not None and position is not None:
+                    seeks[target] = seg_start + position
+
+    # Info/Tracks fora da janela inicial: busca direto pelo SeekHead
+    for target in (_MKV_INFO, _MKV_TRACKS):
+        if target in seen or target not in seeks:
+            continue
+        element = _read_element(reader, seeks[target])
+        if element is None or element[0] != target:
+            continue
+        data = element[1]
+        if target == _MKV_INFO:
+            meta.duration_ms = mkv_info_duration_ms(data, 0, len(data))
+        else:
+            _parse_tracks(data, 0, len(data), meta)
+    return meta
+
+
+# ---------- API ----------
+
+def extract_metadata(reader: RangeReader, info: Optional[ContainerInfo] = None) -> Optional[MediaMeta]:
+    """Metadados do vídeo; None se o container não for reconhecido."""
+    if info is None:
+        info = sniff_container(reader.read(0, 64 * 1024))
+        if info is None:
+            return None
+    if info.container in ("mp4", "mov"):
+        meta = _mp4_meta(reader, info.container)
+    elif info.container in ("matroska", "webm"):
+        meta = _mkv_meta(reader, info.container)
+    else:
+        meta = MediaMeta(info.container)
+    if meta.duration_ms is None:
+        meta.duration_ms = info.duration_ms
+    return meta
+
+
+def safe_extract_metadata(reader: RangeReader, info: ContainerInfo) -> MediaMeta:
+    """Como extract_metadata, mas header quebrado vira só o que o sniffer já sabia."""
+    try:
+        return extract_metadata(reader, info) or MediaMeta(info.container, info.duration_ms)
+    except Exception as e:
+        logger.warning("Falha ao extrair metadados do vídeo (%s): %s", info.container, e)
+        return MediaMeta(info.container, info.duration_ms)
+
@@ -1,19 +1,205 @@
-from typing import Tuple
+import base64
+import hashlib
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator, List, Tuple, Union
 from ..config import settings
 from ..aws import s3
 from .id_gen import new_id
-from app.core.metrics import S3_OPS
+from app.core.metrics import S3_OPS, S3_UPLOAD_THROUGHPUT
+
+logger = logging.getLogger("s3")
+
+_MB = 1024 * 1024
+
+# corpo do upload: bytes (uploads pequenos) ou file object (spool em disco)
+Body = Union[bytes, BinaryIO]
+
+
+@dataclass
+class UploadResult:
+    size: int
+    parts: int
+    seconds: float
+    # hex do objeto inteiro (persistido no VideoItem); no multipart é o checksum
+    # composto do S3: "<hex do SHA-256 dos SHA-256 das partes>-<n partes>"
+    sha256: str | None = None
+
+    @property
+    def mb_per_second(self) -> float:
+        return (self.size / _MB) / self.seconds if self.seconds > 0 else 0.0
+
 
 def build_s3_key(original_filename: str, vid: str | None = None) -> Tuple[str, str]:
      vid = vid or new_id()
      key = f"videos/{vid}/{original_filename}"
      return vid, key
 
-def put_object(bucket: str, key: str, file_bytes: bytes, content_type: str) -> None:
-    """Envia o objeto ao S3 e incrementa métricas de sucesso/erro."""
+def _body_size(body: Body) -> int:
+    if isinstance(body, (bytes, bytearray, memoryview)):
+        return len(body)
+    pos = body.tell()
+    body.seek(0, os.SEEK_END)
+    size = body.tell() - pos
+    body.seek(pos)
+    return size
+
+
+def _b64(digest: bytes) -> str:
+    # formato dos headers x-amz-checksum-*
+    return base64.b64encode(digest).decode()
+
+
+def put_object(bucket: str, key: str, file_bytes: Body, content_type: str) -> UploadResult:
+    """
+    Envia o objeto ao S3 e incrementa métricas de sucesso/erro.
+
+    No PUT único o botocore calcula o SHA-256 ao montar o request
+    (ChecksumAlgorithm) e o S3 valida no recebimento; o hex vem do
+    ChecksumSHA256 da resposta, sem uma passada extra sobre o corpo.
+    File objects (spool em disco) sempre seguem pelo multipart, que calcula o
+    hash enquanto lê as partes, sem uma segunda leitura do arquivo.
+    """
+    if not isinstance(file_bytes, (bytes, bytearray, memoryview)):
+        return upload_multipart(bucket, key, file_bytes, content_type)
+    size = len(file_bytes)
+    if size > settings.s3_multipart_threshold_mb * _MB:
+        return upload_multipart(bucket, key, file_bytes, content_type)
     try:
-        s3.put_object(Bucket=bucket, Key=key, Body=file_bytes, ContentType=content_type)
+        start = time.perf_counter()
+        resp = s3.put_object(
+            Bucket=bucket, Key=key, Body=file_bytes, ContentType=content_type,
+            ChecksumAlgorithm="SHA256",
+        )
         S3_OPS.labels(op="put", status="ok").inc()
     except Exception:
         S3_OPS.labels(op="put", status="error").inc()
-        raise
\ No newline at end of file
+        raise
+    checksum = (resp or {}).get("ChecksumSHA256")
+    # storage compatível que não devolve o checksum: calcula aqui
+    digest = base64.b64decode(checksum) if checksum else hashlib.sha256(file_bytes).digest()
+    result = UploadResult(size, 1, time.perf_counter() - start, digest.hex())
+    _report(result, "single", key)
+    return result
+
+
+def composite_sha256(part_checksums: List[str]) -> str:
+    """Checksum composto (formato do S3) a partir dos ChecksumSHA256 base64 das partes, em ordem."""
+    combined = hashlib.sha256(b"".join(base64.b64decode(c) for c in part_checksums))
+    return f"{combined.hexdigest()}-{len(part_checksums)}"
+
+
+def _report(result: UploadResult, mode: str, key: str) -> None:
+    S3_UPLOAD_THROUGHPUT.labels(mode=mode).observe(result.mb_per_second)
+    logger.info(
+        "Upload S3 %s concluído (key=%s size=%d parts=%d %.2fs %.1f MB/s)",
+        mode, key, result.size, result.parts, result.seconds, result.mb_per_second,
+    )
+
+
+def _iter_parts(body: Body, part_size: int) -> Iterator[Union[bytes, memoryview]]:
+    if isinstance(body, (bytes, bytearray, memoryview)):
+        # memoryview: fatia sem copiar o corpo
+        view = memoryview(body)
+        for offset in range(0, len(view), part_size):
+            yield view[offset:offset + part_size]
+        return
+    # file object: lê uma parte por vez (só as partes em voo ficam no heap)
+    while True:
+        chunk = body.read(part_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _upload_part(bucket: str, key: str, upload_id: str, number: int, chunk, max_retries: int) -> dict:
+    """Envia uma parte; falhas reenviam só esta parte (backoff exponencial curto)."""
+    body = bytes(chunk)
+    checksum = _b64(hashlib.sha256(body).digest())  # S3 confere cada parte ao receber
+    attempt = 0
+    while True:
+        try:
+            resp = s3.upload_part(
+                Bucket=bucket, Key=key, UploadId=upload_id, PartNumber=number, Body=body,
+                ChecksumSHA256=checksum,
+            )
+            S3_OPS.labels(op="upload_part", status="ok").inc()
+            return {"PartNumber": number, "ETag": resp["ETag"], "ChecksumSHA256": checksum}
+        except Exception as e:
+            S3_OPS.labels(op="upload_part", status="error").inc()
+            if attempt >= max_retries:
+                raise
+            attempt += 1
+            logger.warning("Parte %d de %s falhou (tentativa %d/%d): %s", number, key, attempt, max_retries, e)
+            time.sleep(min(0.1 * 2 ** attempt, 2.0))
+
+
+def upload_multipart(
+    bucket: str,
+    key: str,
+    file_bytes: Body,
+    content_type: str,
+    *,
+    part_size: int | None = None,
+    concurrency: int | None = None,
+    max_retries: int | None = None,
+) -> UploadResult:
+    """
+    Upload multipart com partes enviadas em paralelo por um pool limitado.
+
+    No máximo `concurrency` partes ficam em voo; qualquer parte que esgote as
+    tentativas aborta o upload (sem deixar partes órfãs cobradas no bucket).
+    Cada parte é lida e hasheada uma vez só (o digest vai como ChecksumSHA256
+    da parte); o checksum do objeto é o composto do S3, derivado desses digests
+    sem outra passada sobre os bytes.
+    """
+    part_size = part_size or settings.s3_part_size_mb * _MB
+    concurrency = max(1, concurrency or settings.s3_upload_concurrency)
+    max_retries = settings.s3_part_max_retries if max_retries is None else max_retries
+
+    start = time.perf_counter()
+    size = _body_size(file_bytes)
+    upload_id = s3.create_multipart_upload(
+        Bucket=bucket, Key=key, ContentType=content_type, ChecksumAlgorithm="SHA256",
+    )["UploadId"]
+    try:
+        slots = threading.BoundedSemaphore(concurrency)
+        failed = threading.Event()
+
+        def _done(future):
+            slots.release()
+            if future.exception() is not None:
+                failed.set()
+
+        futures = []
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="s3-part") as pool:
+            for number, chunk in enumerate(_iter_parts(file_bytes, part_size), start=1):
+                slots.acquire()
+                if failed.is_set():
+                    slots.release()
+                    break  # não enfileira mais nada; o erro sobe no result() abaixo
+                future = pool.submit(_upload_part, bucket, key, upload_id, number, chunk, max_retries)
+                future.add_done_callback(_done)
+                futures.append(future)
+        parts = [f.result() for f in futures]
+
+        s3.complete_multipart_upload(
+            Bucket=bucket, Key=key, UploadId=upload_id, MultipartUpload={"Parts": parts},
+        )
+    except Exception:
+        S3_OPS.labels(op="multipart", status="error").inc()
+        try:
+            s3.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload_id)
+        except Exception as e:
+            logger.error("Falha ao abortar multipart %s (key=%s): %s", upload_id, key, e)
+        raise
+
+    S3_OPS.labels(op="multipart", status="ok").inc()
+    checksum = composite_sha256([p["ChecksumSHA256"] for p in parts])
+    result = UploadResult(size, len(parts), time.perf_counter() - start, checksum)
+    _report(result, "multipart", key)
+    return result
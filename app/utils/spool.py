@@ -0,0 +1,61 @@
+# app/utils/spool.py
+import logging
+import os
+import tempfile
+from typing import BinaryIO
+
+from fastapi import UploadFile
+from starlette.formparsers import MultiPartParser
+
+from ..config import settings
+
+logger = logging.getLogger("videos")
+
+_MB = 1024 * 1024
+
+
+def spool_threshold_bytes() -> int:
+    return settings.upload_spool_max_memory_mb * _MB
+
+
+def configure_spooling() -> None:
+    """
+    Política de spooling dos uploads (chamada no lifespan).
+
+    O parser multipart do Starlette grava cada arquivo num SpooledTemporaryFile:
+    até o threshold fica em memória, acima disso vai para um arquivo temporário.
+    O diretório segue `tempfile.gettempdir()`, por isso UPLOAD_SPOOL_DIR ajusta
+    o tempdir do processo (ex.: um volume dedicado em vez do /tmp do container).
+    """
+    MultiPartParser.max_file_size = spool_threshold_bytes()
+    spool_dir = settings.upload_spool_dir
+    if spool_dir:
+        os.makedirs(spool_dir, exist_ok=True)
+        tempfile.tempdir = spool_dir
+    logger.info(
+        "Spool de upload: %d MB em memória, excedente em %s",
+        settings.upload_spool_max_memory_mb, tempfile.gettempdir(),
+    )
+
+
+def upload_size(file: UploadFile) -> int:
+    """Tamanho do upload sem ler o conteúdo (o parser já contou os bytes)."""
+    if file.size is not None:
+        return file.size
+    f = file.file
+    pos = f.tell()
+    f.seek(0, os.SEEK_END)
+    size = f.tell()
+    f.seek(pos)
+    return size
+
+
+async def upload_body(file: UploadFile, size: int) -> bytes | BinaryIO:
+    """
+    Uploads pequenos viram bytes; os grandes seguem como file object (já em
+    disco) para o S3 ler em partes, sem copiar o corpo inteiro para o heap.
+    """
+    if size <= spool_threshold_bytes():
+        return await file.read()
+    await file.seek(0)
+    return file.file
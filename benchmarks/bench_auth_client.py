@@ -0,0 +1,174 @@
+"""
+Benchmark do pool httpx do AuthClient contra um Auth Service fake local (uvicorn).
+
+Cada rodada dispara `--concurrency` chamadas simultâneas a `AuthClient.me` (cache
+desligado, tokens distintos), em várias ondas, comparando:
+
+* limites default do httpx vs limites ajustados (AUTH_MAX_CONNECTIONS etc.);
+* hook de resposta com log DEBUG ligado (lê o corpo) vs desligado;
+* HTTP/1.1 vs HTTP/2 (AUTH_HTTP2), os dois sobre TLS contra o mesmo hypercorn.
+
+O httpx só negocia HTTP/2 via ALPN, então a comparação usa um certificado
+autoassinado gerado com `openssl` (confiado pelo client via SSL_CERT_FILE).
+Requer `hypercorn` e `h2`; sem eles a comparação HTTP/2 é pulada com aviso.
+
+Uso:
+    python -m benchmarks.bench_auth_client [--waves 20] [--concurrency 200]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from app.infrastructure.clients.auth_client import AuthClient
+
+_ME = json.dumps({
+    "id": 1, "username": "bench", "email": "bench@example.com",
+    "role": "user", "is_active": True, "full_name": "x" * 512,
+}).encode()
+
+
+async def _fake_auth(scope, receive, send):
+    if scope["type"] != "http":
+        return
+    await asyncio.sleep(0.002)
+    await send({"type": "http.response.start", "status": 200,
+                "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": _ME})
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_server(port: int) -> subprocess.Popen:
+    # processo separado: o servidor não disputa o GIL com o client medido
+    return _wait_listening(subprocess.Popen([
+        sys.executable, "-m", "uvicorn", "benchmarks.bench_auth_client:_fake_auth",
+        "--host", "127.0.0.1", "--port", str(port), "--log-level", "error", "--backlog", "4096",
+    ]), port)
+
+
+def _self_signed_cert(directory: str) -> tuple[str, str]:
+    cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run([
+        "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+        "-keyout", key, "-out", cert, "-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1",
+    ], check=True, capture_output=True)
+    return cert, key
+
+
+def _start_tls_server(port: int, cert: str, key: str) -> subprocess.Popen:
+    # hypercorn anuncia h2 e http/1.1 via ALPN: o mesmo servidor atende os dois braços
+    return _wait_listening(subprocess.Popen([
+        sys.executable, "-m", "hypercorn", "benchmarks.bench_auth_client:_fake_auth",
+        "--bind", f"127.0.0.1:{port}", "--certfile", cert, "--keyfile", key,
+        "--log-level", "error", "--backlog", "4096",
+    ]), port)
+
+
+def _wait_listening(proc: subprocess.Popen, port: int) -> subprocess.Popen:
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return proc
+        except OSError:
+            time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError("fake auth server não subiu")
+
+
+async def _run_arm(base_url: str, waves: int, concurrency: int, **client_kwargs) -> float:
+    client = AuthClient(base_url, cache_ttl=0, **client_kwargs)
+    try:
+        await client.me("warmup")
+        if client_kwargs.get("http2"):
+            # garante que a rodada mede HTTP/2 de fato (ALPN pode cair para 1.1)
+            resp = await (await client._get_client()).get("/")
+            assert resp.http_version == "HTTP/2", resp.http_version
+        start = time.perf_counter()
+        for w in range(waves):
+            await asyncio.gather(*(client.me(f"tok-{w}-{i}") for i in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    finally:
+        await client.aclose()
+    return waves * concurrency / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--waves", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args()
+
+    port = _free_port()
+    server = _start_server(port)
+    base_url = f"http://127.0.0.1:{port}"
+    auth_logger = logging.getLogger("auth")
+    auth_logger.addHandler(logging.NullHandler())
+    auth_logger.propagate = False
+
+    defaults = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=5)
+    arms = [
+        ("httpx defaults", logging.INFO, dict(
+            max_connections=defaults.max_connections,
+            max_keepalive_connections=defaults.max_keepalive_connections,
+            keepalive_expiry=defaults.keepalive_expiry)),
+        ("httpx defaults + DEBUG", logging.DEBUG, dict(
+            max_connections=defaults.max_connections,
+            max_keepalive_connections=defaults.max_keepalive_connections,
+            keepalive_expiry=defaults.keepalive_expiry)),
+        ("tuned limits", logging.INFO, dict(
+            max_connections=args.concurrency,
+            max_keepalive_connections=args.concurrency,
+            keepalive_expiry=30)),
+    ]
+    try:
+        for name, level, kwargs in arms:
+            auth_logger.setLevel(level)
+            rps = asyncio.run(_run_arm(base_url, args.waves, args.concurrency, http2=False, **kwargs))
+            print(f"{name:>26}: {rps:9.1f} /me calls/s")
+    finally:
+        server.terminate()
+        server.wait()
+
+    _run_http2_comparison(args, auth_logger)
+
+
+def _run_http2_comparison(args, auth_logger: logging.Logger) -> None:
+    try:
+        import h2  # noqa: F401
+        import hypercorn  # noqa: F401
+    except ImportError:
+        print(f"{'TLS http/1.1 vs http/2':>26}: (pulado: instale hypercorn e h2)")
+        return
+    auth_logger.setLevel(logging.INFO)
+    limits = dict(max_connections=args.concurrency, max_keepalive_connections=args.concurrency, keepalive_expiry=30)
+    with tempfile.TemporaryDirectory() as tmp:
+        cert, key = _self_signed_cert(tmp)
+        os.environ["SSL_CERT_FILE"] = cert  # o httpx (trust_env) confia no certificado do bench
+        port = _free_port()
+        server = _start_tls_server(port, cert, key)
+        try:
+            for name, http2 in (("tuned limits TLS http/1.1", False), ("tuned limits TLS http/2", True)):
+                rps = asyncio.run(_run_arm(f"https://127.0.0.1:{port}", args.waves, args.concurrency,
+                                           http2=http2, **limits))
+                print(f"{name:>26}: {rps:9.1f} /me calls/s")
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
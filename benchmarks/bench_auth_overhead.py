@@ -0,0 +1,138 @@
+"""
+Benchmark do overhead de autenticação por request.
+
+Roda GET /videos/{id} (repo fake, sem AWS) com o AuthClient compartilhado
+respondendo do cache, e compara com a mesma rota sem auth (require_user
+sobrescrito). Também conta quantas vezes o /me e o UserContext são resolvidos
+por request: com o subsistema único + memoização deve ser exatamente 1.
+
+Antes/depois: uma rota com auth no router e no endpoint (o formato de
+GET /videos/user/videos) roda com a dependency atual e com a de antes da
+unificação, em que cada módulo de auth tinha a sua e cada uma chamava o /me.
+
+Uso:
+    python -m benchmarks.bench_auth_overhead [--requests 2000] [--me-ms 1.0]
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from fastapi import APIRouter, Depends, FastAPI, Security
+from fastapi.testclient import TestClient
+
+import app.core.auth as core_auth
+from app.domain.models.user_model import UserContext
+from app.main import app
+from app.routers import videos as videos_router
+
+_PAYLOAD = {"id": 1, "username": "bench", "email": "b@example.com", "role": "user", "is_active": True}
+
+
+class _Repo:
+    def get(self, id_video):
+        return {"id_video": id_video, "status": "UPLOADED"}
+
+
+class _CachedAuthClient:
+    """Simula um AuthClient com hit de cache (o custo de rede não entra na conta)."""
+
+    def __init__(self, latency: float = 0.0):
+        self.calls = 0
+        self.latency = latency
+
+    async def me(self, token):
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)  # /me fora do cache (rede até o Auth Service)
+        return _PAYLOAD
+
+    async def aclose(self):
+        pass
+
+
+def _measure(client: TestClient, n: int, path: str = "/videos/abc") -> float:
+    for _ in range(50):
+        client.get(path)
+    start = time.perf_counter()
+    for _ in range(n):
+        client.get(path)
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def _legacy_dependency():
+    """Como antes da unificação: dependency própria por módulo, /me a cada resolução."""
+    async def require_user(credentials=Security(core_auth.bearer_scheme)):
+        return UserContext(**await core_auth._fetch_me(credentials.credentials))
+    return require_user
+
+
+def _router_and_endpoint_app(router_dep, endpoint_dep) -> FastAPI:
+    router = APIRouter(dependencies=[Depends(router_dep)])
+
+    @router.get("/user/videos")
+    async def list_my_videos(user: UserContext = Depends(endpoint_dep)):
+        return {"id": user.id}
+
+    bench = FastAPI()
+    bench.include_router(router)
+    return bench
+
+
+def _before_after(n: int, headers: dict, me_latency: float) -> None:
+    arms = [
+        ("antes (dependency por módulo)", _legacy_dependency(), _legacy_dependency()),
+        ("depois (require_user único)", core_auth.require_user, core_auth.require_user),
+    ]
+    for name, router_dep, endpoint_dep in arms:
+        fake = _CachedAuthClient(me_latency)
+        core_auth.set_auth_client(fake)
+        with TestClient(_router_and_endpoint_app(router_dep, endpoint_dep), headers=headers) as client:
+            us = _measure(client, n, "/user/videos")
+        print(f"{name:>30}: {us:8.1f} us/request, /me {fake.calls / (n + 50):.2f} por request")
+    core_auth.set_auth_client(None)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--me-ms", type=float, default=1.0, help="latência do /me no antes/depois")
+    args = parser.parse_args()
+
+    app.dependency_overrides[videos_router.get_video_repo] = lambda: _Repo()
+    headers = {"Authorization": "Bearer bench-token"}
+
+    built = {"n": 0}
+    original_init = UserContext.__init__
+
+    def counting_init(self, **data):
+        built["n"] += 1
+        original_init(self, **data)
+
+    with TestClient(app, headers=headers) as client:
+        logging.getLogger().setLevel(logging.WARNING)  # log de acesso fora da medição
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+        fake = _CachedAuthClient()
+        core_auth.set_auth_client(fake)
+        UserContext.__init__ = counting_init
+        try:
+            with_auth = _measure(client, args.requests)
+        finally:
+            UserContext.__init__ = original_init
+        total = args.requests + 50
+
+        app.dependency_overrides[core_auth.require_user] = lambda: UserContext(**_PAYLOAD)
+        without_auth = _measure(client, args.requests)
+
+    app.dependency_overrides.clear()
+    print(f"      com auth: {with_auth:8.1f} us/request")
+    print(f"      sem auth: {without_auth:8.1f} us/request")
+    print(f"overhead auth: {with_auth - without_auth:8.1f} us/request")
+    print(f"   /me calls : {fake.calls / total:.2f} por request")
+    print(f"UserContext  : {built['n'] / total:.2f} por request")
+    print()
+    _before_after(args.requests, headers, args.me_ms / 1000)
+
+
+if __name__ == "__main__":
+    main()
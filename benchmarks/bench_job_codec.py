@@ -0,0 +1,75 @@
+"""
+Benchmark do corpo das mensagens SQS: JSON completo do VideoItem (formato
+anterior) vs envelope compacto de app.services.job_codec.
+
+Mede o tamanho codificado e o tempo de encode/decode por mensagem.
+
+Uso:
+    python -m benchmarks.bench_job_codec [--iterations 20000]
+"""
+import argparse
+import time
+from datetime import datetime
+
+from app.domain.models.video import VideoItem
+from app.services.job_codec import decode_job, encode_job, job_from_item
+
+
+def _item() -> VideoItem:
+    now = datetime.utcnow()
+    return VideoItem(
+        id_video="5b0c7d8e-6f1a-4a53-9a0e-1f2d3c4b5a69",
+        titulo="Aula 12 - Arquitetura de microsserviços orientada a eventos",
+        autor="Fulano de Tal",
+        status="UPLOADED",
+        file_path="s3://video-service-bucket/videos/7f3e9c1b2a4d/aula-12-arquitetura.mp4",
+        data_criacao=now,
+        data_upload=now,
+        email="fulano.de.tal@example.com",
+        username="fulano",
+        id="123",
+        size_bytes=187_654_321,
+        checksum_sha256="9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08",
+        container="mp4",
+        duration_ms=3_725_000,
+        width=1920,
+        height=1080,
+        video_codec="avc1",
+        audio_codec="mp4a",
+    )
+
+
+def _time(fn, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+    n = args.iterations
+
+    item = _item()
+    legacy = item.model_dump_json()
+    record = item.model_dump(mode="json")
+    body, attrs = encode_job(job_from_item(record), job_class="large")
+    gz_body, gz_attrs = encode_job(job_from_item(record), gzip_threshold=0)
+
+    rows = [
+        ("VideoItem JSON (antes)", len(legacy),
+         _time(item.model_dump_json, n), _time(lambda: VideoItem.model_validate_json(legacy), n)),
+        ("envelope v1", len(body),
+         _time(lambda: encode_job(job_from_item(record), job_class="large"), n), _time(lambda: decode_job(body, attrs), n)),
+        ("envelope v1 gzip+b64", len(gz_body),
+         _time(lambda: encode_job(job_from_item(record), gzip_threshold=0), n), _time(lambda: decode_job(gz_body, gz_attrs), n)),
+    ]
+    print(f"{'formato':<24}{'bytes':>8}{'encode us':>12}{'decode us':>12}")
+    for name, size, enc, dec in rows:
+        print(f"{name:<24}{size:>8}{enc:>12.2f}{dec:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
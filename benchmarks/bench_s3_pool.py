@@ -0,0 +1,98 @@
+"""
+Benchmark de throughput do pool boto3: 50 uploads concorrentes contra um S3 fake local.
+
+O servidor fake (ThreadingHTTPServer com keep-alive) responde PutObject após uma
+latência fixa. Comparamos o Config default do botocore (10 conexões, sem
+keep-alive TCP) com o `client_config()` de app.aws, dirigido por Settings.
+
+Uso:
+    python -m benchmarks.bench_s3_pool [--uploads 500] [--concurrency 50] [--latency-ms 20]
+"""
+import argparse
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import boto3
+from botocore.config import Config
+
+from app.aws import client_config
+
+_LATENCY = 0.02
+_CONNECTIONS = set()
+_LOCK = threading.Lock()
+
+
+class _FakeS3Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # mantém a conexão aberta entre requests
+
+    def do_PUT(self):
+        with _LOCK:
+            _CONNECTIONS.add(self.client_address)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+        time.sleep(_LATENCY)
+        self.send_response(200)
+        self.send_header("ETag", f'"{hashlib.md5(body).hexdigest()}"')
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def _run(endpoint: str, config: Config, uploads: int, concurrency: int, payload: bytes) -> tuple[float, int]:
+    client = boto3.session.Session(
+        aws_access_key_id="test", aws_secret_access_key="test", region_name="us-east-1"
+    ).client("s3", endpoint_url=endpoint, config=config.merge(Config(s3={"addressing_style": "path"})))
+    _CONNECTIONS.clear()
+
+    def _put(i: int) -> None:
+        client.put_object(Bucket="bench", Key=f"videos/{i}.mp4", Body=payload)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(_put, range(uploads)))
+    return time.perf_counter() - start, len(_CONNECTIONS)
+
+
+def main() -> None:
+    global _LATENCY
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--uploads", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--payload-kb", type=int, default=64)
+    args = parser.parse_args()
+    _LATENCY = args.latency_ms / 1000.0
+
+    # "Connection pool is full, discarding connection" é esperado no default
+    logging.getLogger("urllib3.connectionpool").setLevel(logging.ERROR)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeS3Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}"
+    payload = b"\0" * (args.payload_kb * 1024)
+
+    arms = {
+        "botocore default": Config(),
+        "app.aws.client_config": client_config(),
+    }
+    try:
+        for name, cfg in arms.items():
+            elapsed, conns = _run(endpoint, cfg, args.uploads, args.concurrency, payload)
+            print(
+                f"{name:>22}: pool={cfg.max_pool_connections or 10:>3} "
+                f"{args.uploads / elapsed:8.1f} uploads/s  "
+                f"tcp_conns_opened={conns:>4}  total={elapsed:6.2f}s"
+            )
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
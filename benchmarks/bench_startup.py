@@ -0,0 +1,63 @@
+"""
+Benchmark de startup: tempo de `import app.main` e tempo até o primeiro request.
+
+Cada medição roda em um subprocesso novo (sem cache de módulos), então reflete o
+custo real de um worker subindo.
+
+Uso:
+    python -m benchmarks.bench_startup [--runs 5]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+_PROBE = r"""
+import json, time
+t0 = time.perf_counter()
+import app.main
+t_import = time.perf_counter() - t0
+
+from fastapi.testclient import TestClient
+t1 = time.perf_counter()
+with TestClient(app.main.app) as client:
+    client.get("/health")
+    t_first = time.perf_counter() - t1
+
+    # custo que antes era pago no import: construir os clients AWS
+    from app import aws
+    t2 = time.perf_counter()
+    aws.init_clients()
+    t_clients = time.perf_counter() - t2
+
+print(json.dumps({"import": t_import, "first_request": t_first, "aws_clients": t_clients}))
+"""
+
+
+def _run_once() -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    samples = [_run_once() for _ in range(args.runs)]
+    for name in ("import", "first_request", "aws_clients"):
+        values = [s[name] * 1000 for s in samples]
+        print(
+            f"{name:>14}: median={statistics.median(values):8.1f}ms "
+            f"min={min(values):8.1f}ms max={max(values):8.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
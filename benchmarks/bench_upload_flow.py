@@ -0,0 +1,68 @@
+"""
+Benchmark do caminho completo de upload sem rede: POST /videos/upload passando
+por sniff/metadados -> S3 -> DynamoDB -> SQS, com AWS_BACKEND=memory
+(tests/memory_aws.py). Mede o custo do próprio serviço, sem a
+variância de LocalStack/AWS, e confere que cada upload gerou objeto, item e job.
+
+Uso:
+    python -m benchmarks.bench_upload_flow [--requests 500] [--size-kb 256]
+"""
+import os
+
+os.environ["AWS_BACKEND"] = "memory"  # antes de importar app.config
+
+import argparse
+import logging
+import statistics
+import time
+
+from fastapi.testclient import TestClient
+
+import app.aws as aws
+import app.core.auth as core_auth
+from app.config import settings
+from app.domain.models.user_model import UserContext
+from app.main import app
+
+_USER = UserContext(id=1, username="bench", email="b@example.com", role="user", is_active=True)
+_MP4_HEAD = b"\x00\x00\x00\x18ftypisom\x00\x00\x02\x00isomiso2"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--size-kb", type=int, default=256)
+    args = parser.parse_args()
+
+    body = _MP4_HEAD + b"\x00" * (args.size_kb * 1024 - len(_MP4_HEAD))
+    app.dependency_overrides[core_auth.require_user] = lambda: _USER
+    settings.sqs_queue_url = aws.sqs.create_queue(QueueName="bench-jobs")["QueueUrl"]
+
+    timings = []
+    with TestClient(app) as client:
+        logging.getLogger().setLevel(logging.WARNING)  # log de acesso fora da medição
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+        files = {"file": ("bench.mp4", body, "video/mp4")}
+        for i in range(args.requests + 20):
+            start = time.perf_counter()
+            resp = client.post("/videos/upload", files=files, data={"titulo": f"v{i}", "autor": "bench"})
+            elapsed = time.perf_counter() - start
+            assert resp.status_code == 202, resp.text
+            if i >= 20:
+                timings.append(elapsed * 1e3)
+
+        backend = aws.get_memory_backend()
+        objects = sum(len(b) for b in backend.s3.buckets.values())
+        items = len(aws.get_table_videos().items)
+        jobs = len(backend.sqs.queues[settings.sqs_queue_url])
+
+    app.dependency_overrides.clear()
+    timings.sort()
+    print(f"uploads      : {args.requests} x {args.size_kb} KB")
+    print(f"p50          : {statistics.median(timings):7.2f} ms")
+    print(f"p95          : {timings[int(len(timings) * 0.95) - 1]:7.2f} ms")
+    print(f"S3/DDB/SQS   : {objects} objetos, {items} itens, {jobs} jobs")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,9 +7,19 @@ from botocore.exceptions import ClientError
 AWS_ENDPOINT = os.getenv("AWS_ENDPOINT_URL", "http://localhost:4566")
 AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
 
+# Por padrão a suíte roda hermética (S3/SQS/DynamoDB em memória, ver
+# tests/memory_aws.py). USE_LOCALSTACK=1 volta a usar o LocalStack (job localstack do CI).
+USE_LOCALSTACK = os.getenv("USE_LOCALSTACK") == "1"
+if not USE_LOCALSTACK:
+    os.environ.setdefault("AWS_BACKEND", "memory")
+
 
 @pytest.fixture(scope="session")
 def dynamodb_resource():
+    if not USE_LOCALSTACK:
+        import app.aws as aws_mod
+        return aws_mod.get_ddb()
+
     # Credenciais “dummy” para LocalStack
     os.environ.setdefault("AWS_ACCESS_KEY_ID", "test")
     os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "test")
@@ -30,7 +40,7 @@ def videos_table(dynamodb_resource):
             KeySchema=[{"AttributeName": "id_video", "KeyType": "HASH"}],
             BillingMode="PAY_PER_REQUEST",
         )
-        # Espera ficar ativa (LocalStack é rápido, mas garantimos)
+        # Espera ficar ativa (LocalStack é rápido, mas garantimos; no-op em memória)
         table.wait_until_exists()
     except ClientError as e:
         if e.response["Error"]["Code"] != "ResourceInUseException":
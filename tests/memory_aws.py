@@ -0,0 +1,1000 @@
+# tests/memory_aws.py
+"""
+Stand-in em memória de S3, SQS e DynamoDB para testes e benchmarks herméticos.
+Fica com os testes, fora do pacote `app` (a imagem de produção não o leva).
+
+Implementa só a superfície que o app usa, com as mesmas assinaturas/respostas
+do boto3 (inclusive `ClientError` com os mesmos códigos), sem rede:
+
+* S3: put/get/head/delete_object (Range), multipart (create/upload_part/
+  complete/abort), generate_presigned_url e verificação de ChecksumSHA256.
+* SQS: send_message, send_message_batch, receive_message, delete_message,
+  create_queue/get_queue_url.
+* DynamoDB (API de resource): Table.put/get/update/delete_item, query, scan,
+  batch_writer, batch_get_item/batch_write_item; ConditionExpression e
+  KeyCondition/FilterExpression aceitam objetos de boto3.dynamodb.conditions
+  ou strings com ExpressionAttributeNames/Values.
+
+Selecionado por AWS_BACKEND=memory em app.aws (só com o repositório no
+path: suíte de testes e benchmarks rodando da raiz). Buckets, filas e a
+tabela de vídeos são criados no primeiro uso.
+"""
+from __future__ import annotations
+
+import base64
+import copy
+import hashlib
+import io
+import re
+import threading
+import time
+import uuid
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from boto3.dynamodb.conditions import AttributeBase, ConditionBase, Size
+from botocore.exceptions import ClientError
+
+
+def _error(code: str, message: str, operation: str, status: int = 400) -> ClientError:
+    return ClientError(
+        {"Error": {"Code": code, "Message": message}, "ResponseMetadata": {"HTTPStatusCode": status}},
+        operation,
+    )
+
+
+class _Exceptions:
+    """Espelha `client.exceptions.*` para o código que captura por classe."""
+
+    def __init__(self, *codes: str):
+        for code in codes:
+            setattr(self, code, type(code, (ClientError,), {}))
+
+    def raise_(self, code: str, message: str, operation: str, status: int = 400):
+        cls = getattr(self, code, ClientError)
+        raise cls(
+            {"Error": {"Code": code, "Message": message}, "ResponseMetadata": {"HTTPStatusCode": status}},
+            operation,
+        )
+
+
+class _Body:
+    """Imitação mínima do StreamingBody do botocore."""
+
+    def __init__(self, data: bytes):
+        self._stream = io.BytesIO(data)
+
+    def read(self, amt: Optional[int] = None) -> bytes:
+        return self._stream.read() if amt is None else self._stream.read(amt)
+
+    def iter_chunks(self, chunk_size: int = 1024):
+        while True:
+            chunk = self._stream.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    def close(self) -> None:
+        self._stream.close()
+
+
+def _read_body(body: Any) -> bytes:
+    if body is None:
+        return b""
+    if isinstance(body, str):
+        return body.encode()
+    if isinstance(body, (bytes, bytearray, memoryview)):
+        return bytes(body)
+    return body.read()
+
+
+def _etag(data: bytes) -> str:
+    return f'"{hashlib.md5(data).hexdigest()}"'
+
+
+def _sha256_b64(data: bytes) -> str:
+    return base64.b64encode(hashlib.sha256(data).digest()).decode()
+
+
+# ======================= S3 =======================
+
+class MemoryS3:
+    def __init__(self, endpoint_url: Optional[str] = None):
+        self._lock = threading.RLock()
+        self._endpoint = (endpoint_url or "https://s3.memory").rstrip("/")
+        self.buckets: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.uploads: Dict[str, Dict[str, Any]] = {}
+        self.exceptions = _Exceptions("NoSuchKey", "NoSuchBucket", "NoSuchUpload", "InvalidPart", "BadDigest")
+
+    def _bucket(self, name: str) -> Dict[str, Dict[str, Any]]:
+        return self.buckets.setdefault(name, {})
+
+    def _object(self, bucket: str, key: str, op: str) -> Dict[str, Any]:
+        obj = self.buckets.get(bucket, {}).get(key)
+        if obj is None:
+            self.exceptions.raise_("NoSuchKey", "The specified key does not exist.", op, 404)
+        return obj
+
+    @staticmethod
+    def _verify(data: bytes, checksum: Optional[str], op: str) -> None:
+        if checksum is not None and checksum != _sha256_b64(data):
+            raise _error("BadDigest", "The SHA256 you specified did not match the calculated checksum.", op)
+
+    def create_bucket(self, Bucket: str, **kwargs) -> dict:
+        with self._lock:
+            self._bucket(Bucket)
+        return {"Location": f"/{Bucket}"}
+
+    def put_object(self, Bucket: str, Key: str, Body: Any = b"", ContentType: str = "binary/octet-stream",
+                   ChecksumSHA256: Optional[str] = None, Metadata: Optional[dict] = None, **kwargs) -> dict:
+        data = _read_body(Body)
+        if ChecksumSHA256 is None and kwargs.get("ChecksumAlgorithm") == "SHA256":
+            ChecksumSHA256 = _sha256_b64(data)  # o botocore calcula no request
+        self._verify(data, ChecksumSHA256, "PutObject")
+        with self._lock:
+            self._bucket(Bucket)[Key] = {
+                "Body": data, "ContentType": ContentType, "ETag": _etag(data),
+                "Metadata": dict(Metadata or {}), "ChecksumSHA256": ChecksumSHA256,
+                "LastModified": time.time(),
+            }
+        resp = {"ETag": _etag(data)}
+        if ChecksumSHA256:
+            resp["ChecksumSHA256"] = ChecksumSHA256
+        return resp
+
+    def get_object(self, Bucket: str, Key: str, Range: Optional[str] = None, **kwargs) -> dict:
+        with self._lock:
+            obj = self._object(Bucket, Key, "GetObject")
+        data = obj["Body"]
+        resp = {"ContentType": obj["ContentType"], "ETag": obj["ETag"], "Metadata": obj["Metadata"]}
+        if Range:
+            match = re.fullmatch(r"bytes=(\d*)-(\d*)", Range.strip())
+            if not match:
+                raise _error("InvalidRange", "The requested range is not satisfiable", "GetObject", 416)
+            first, last = match.groups()
+            if first == "":
+                start, end = max(0, len(data) - int(last)), len(data) - 1
+            else:
+                start = int(first)
+                end = min(int(last), len(data) - 1) if last else len(data) - 1
+            if start >= len(data):
+                raise _error("InvalidRange", "The requested range is not satisfiable", "GetObject", 416)
+            data = data[start:end + 1]
+            resp["ContentRange"] = f"bytes {start}-{end}/{len(obj['Body'])}"
+        resp.update({"Body": _Body(data), "ContentLength": len(data)})
+        return resp
+
+    def head_object(self, Bucket: str, Key: str, **kwargs) -> dict:
+        with self._lock:
+            obj = self.buckets.get(Bucket, {}).get(Key)
+        if obj is None:
+            raise _error("404", "Not Found", "HeadObject", 404)
+        return {
+            "ContentLength": len(obj["Body"]), "ContentType": obj["ContentType"],
+            "ETag": obj["ETag"], "Metadata": obj["Metadata"],
+        }
+
+    def delete_object(self, Bucket: str, Key: str, **kwargs) -> dict:
+        with self._lock:
+            self.buckets.get(Bucket, {}).pop(Key, None)
+        return {}
+
+    def list_objects_v2(self, Bucket: str, Prefix: str = "", **kwargs) -> dict:
+        with self._lock:
+            keys = sorted(k for k in self.buckets.get(Bucket, {}) if k.startswith(Prefix))
+            contents = [{"Key": k, "Size": len(self.buckets[Bucket][k]["Body"])} for k in keys]
+        return {"Contents": contents, "KeyCount": len(contents), "IsTruncated": False}
+
+    # ---- multipart ----
+
+    def create_multipart_upload(self, Bucket: str, Key: str, ContentType: str = "binary/octet-stream",
+                                ChecksumAlgorithm: Optional[str] = None, **kwargs) -> dict:
+        upload_id = uuid.uuid4().hex
+        with self._lock:
+            self.uploads[upload_id] = {
+                "Bucket": Bucket, "Key": Key, "ContentType": ContentType,
+                "ChecksumAlgorithm": ChecksumAlgorithm, "Parts": {},
+            }
+        return {"Bucket": Bucket, "Key": Key, "UploadId": upload_id}
+
+    def _upload(self, upload_id: str, op: str) -> Dict[str, Any]:
+        upload = self.uploads.get(upload_id)
+        if upload is None:
+            self.exceptions.raise_("NoSuchUpload", "The specified upload does not exist.", op, 404)
+        return upload
+
+    def upload_part(self, Bucket: str, Key: str, UploadId: str, PartNumber: int, Body: Any,
+                    ChecksumSHA256: Optional[str] = None, **kwargs) -> dict:
+        data = _read_body(Body)
+        self._verify(data, ChecksumSHA256, "UploadPart")
+        with self._lock:
+            upload = self._upload(UploadId, "UploadPart")
+            upload["Parts"][PartNumber] = {"Body": data, "ETag": _etag(data), "ChecksumSHA256": ChecksumSHA256}
+        resp = {"ETag": _etag(data)}
+        if ChecksumSHA256:
+            resp["ChecksumSHA256"] = ChecksumSHA256
+        return resp
+
+    def complete_multipart_upload(self, Bucket: str, Key: str, UploadId: str, MultipartUpload: dict, **kwargs) -> dict:
+        with self._lock:
+            upload = self._upload(UploadId, "CompleteMultipartUpload")
+            chunks = []
+            numbers = [p["PartNumber"] for p in MultipartUpload.get("Parts", [])]
+            if not numbers or numbers != sorted(numbers):
+                raise _error("InvalidPartOrder", "The list of parts was not in ascending order.", "CompleteMultipartUpload")
+            for part in MultipartUpload["Parts"]:
+                stored = upload["Parts"].get(part["PartNumber"])
+                if stored is None or stored["ETag"] != part.get("ETag"):
+                    raise _error("InvalidPart", f"Part {part['PartNumber']} not found or ETag mismatch", "CompleteMultipartUpload")
+                if part.get("ChecksumSHA256") not in (None, stored["ChecksumSHA256"]):
+                    raise _error("InvalidPart", f"Part {part['PartNumber']} checksum mismatch", "CompleteMultipartUpload")
+                chunks.append(stored["Body"])
+            data = b"".join(chunks)
+            etag = f'"{hashlib.md5(b"".join(bytes.fromhex(upload["Parts"][n]["ETag"].strip(chr(34))) for n in numbers)).hexdigest()}-{len(numbers)}"'
+            self._bucket(upload["Bucket"])[upload["Key"]] = {
+                "Body": data, "ContentType": upload["ContentType"], "ETag": etag,
+                "Metadata": {}, "ChecksumSHA256": None, "LastModified": time.time(),
+            }
+            del self.uploads[UploadId]
+        return {"Bucket": Bucket, "Key": Key, "ETag": etag, "Location": f"{self._endpoint}/{Bucket}/{Key}"}
+
+    def abort_multipart_upload(self, Bucket: str, Key: str, UploadId: str, **kwargs) -> dict:
+        with self._lock:
+            self._upload(UploadId, "AbortMultipartUpload")
+            del self.uploads[UploadId]
+        return {}
+
+    def list_multipart_uploads(self, Bucket: str, **kwargs) -> dict:
+        with self._lock:
+            uploads = [{"Key": u["Key"], "UploadId": uid} for uid, u in self.uploads.items() if u["Bucket"] == Bucket]
+        return {"Uploads": uploads}
+
+    def generate_presigned_url(self, ClientMethod: str, Params: Optional[dict] = None, ExpiresIn: int = 3600, **kwargs) -> str:
+        params = Params or {}
+        return (
+            f"{self._endpoint}/{params.get('Bucket', '')}/{params.get('Key', '')}"
+            f"?X-Amz-Method={ClientMethod}&X-Amz-Expires={ExpiresIn}&X-Amz-Signature=memory"
+        )
+
+    def close(self) -> None:
+        pass
+
+
+# ======================= SQS =======================
+
+class MemorySQS:
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._lock = threading.RLock()
+        self._clock = clock
+        self.queues: Dict[str, List[Dict[str, Any]]] = {}
+        self.exceptions = _Exceptions("QueueDoesNotExist", "ReceiptHandleIsInvalid", "TooManyEntriesInBatchRequest")
+
+    @staticmethod
+    def queue_url(name: str) -> str:
+        return f"https://sqs.memory/000000000000/{name}"
+
+    def _queue(self, url: str) -> List[Dict[str, Any]]:
+        return self.queues.setdefault(url, [])
+
+    def create_queue(self, QueueName: str, **kwargs) -> dict:
+        url = self.queue_url(QueueName)
+        with self._lock:
+            self._queue(url)
+        return {"QueueUrl": url}
+
+    def get_queue_url(self, QueueName: str, **kwargs) -> dict:
+        url = self.queue_url(QueueName)
+        with self._lock:
+            if url not in self.queues:
+                self.exceptions.raise_("QueueDoesNotExist", "The specified queue does not exist.", "GetQueueUrl")
+        return {"QueueUrl": url}
+
+    def _enqueue(self, url: str, body: str, attributes: Optional[dict], delay: int) -> Dict[str, str]:
+        message_id = str(uuid.uuid4())
+        self._queue(url).append({
+            "MessageId": message_id, "Body": body, "MessageAttributes": copy.deepcopy(attributes or {}),
+            "MD5OfBody": hashlib.md5(body.encode()).hexdigest(), "visible_at": self._clock() + delay,
+            "receipt": None, "receive_count": 0,
+        })
+        return {"MessageId": message_id, "MD5OfMessageBody": hashlib.md5(body.encode()).hexdigest()}
+
+    def send_message(self, QueueUrl: str, MessageBody: str, MessageAttributes: Optional[dict] = None,
+                     DelaySeconds: int = 0, **kwargs) -> dict:
+        with self._lock:
+            return self._enqueue(QueueUrl, MessageBody, MessageAttributes, DelaySeconds)
+
+    def send_message_batch(self, QueueUrl: str, Entries: List[dict], **kwargs) -> dict:
+        if len(Entries) > 10:
+            self.exceptions.raise_(
+                "TooManyEntriesInBatchRequest", "Maximum number of entries per request are 10.", "SendMessageBatch",
+            )
+        successful = []
+        with self._lock:
+            for entry in Entries:
+                sent = self._enqueue(QueueUrl, entry["MessageBody"], entry.get("MessageAttributes"), entry.get("DelaySeconds", 0))
+                successful.append({"Id": entry["Id"], **sent})
+        return {"Successful": successful, "Failed": []}
+
+    def receive_message(self, QueueUrl: str, MaxNumberOfMessages: int = 1, VisibilityTimeout: int = 30,
+                        MessageAttributeNames: Optional[List[str]] = None, **kwargs) -> dict:
+        now = self._clock()
+        out = []
+        with self._lock:
+            for msg in self._queue(QueueUrl):
+                if len(out) >= MaxNumberOfMessages:
+                    break
+                if msg["visible_at"] > now:
+                    continue
+                msg["receipt"] = uuid.uuid4().hex
+                msg["visible_at"] = now + VisibilityTimeout
+                msg["receive_count"] += 1
+                received = {"MessageId": msg["MessageId"], "ReceiptHandle": msg["receipt"],
+                            "Body": msg["Body"], "MD5OfBody": msg["MD5OfBody"]}
+                if MessageAttributeNames and msg["MessageAttributes"]:
+                    wanted = set(MessageAttributeNames)
+                    received["MessageAttributes"] = {
+                        k: v for k, v in msg["MessageAttributes"].items()
+                        if "All" in wanted or ".*" in wanted or k in wanted
+                    }
+                out.append(received)
+        return {"Messages": out} if out else {}
+
+    def delete_message(self, QueueUrl: str, ReceiptHandle: str, **kwargs) -> dict:
+        with self._lock:
+            queue = self._queue(QueueUrl)
+            for i, msg in enumerate(queue):
+                if msg["receipt"] == ReceiptHandle:
+                    del queue[i]
+                    return {}
+        self.exceptions.raise_("ReceiptHandleIsInvalid", "The input receipt handle is invalid.", "DeleteMessage")
+
+    def purge_queue(self, QueueUrl: str, **kwargs) -> dict:
+        with self._lock:
+            self.queues[QueueUrl] = []
+        return {}
+
+    def close(self) -> None:
+        pass
+
+
+# ======================= DynamoDB: expressões =======================
+
+def _to_ddb(value: Any) -> Any:
+    """Normaliza como o serializer do boto3: int -> Decimal, float é recusado."""
+    if isinstance(value, bool) or value is None or isinstance(value, (str, bytes, Decimal)):
+        return value
+    if isinstance(value, int):
+        return Decimal(value)
+    if isinstance(value, float):
+        raise TypeError("Float types are not supported. Use Decimal types instead.")
+    if isinstance(value, dict):
+        return {k: _to_ddb(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_ddb(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return {_to_ddb(v) for v in value}
+    raise TypeError(f"Unsupported type {type(value)} for value {value!r}")
+
+
+_MISSING = object()
+
+
+def _get_path(item: Dict[str, Any], path: str) -> Any:
+    current: Any = item
+    for part in re.findall(r"[^.\[\]]+|\[\d+\]", path):
+        if part.startswith("["):
+            idx = int(part[1:-1])
+            if not isinstance(current, list) or idx >= len(current):
+                return _MISSING
+            current = current[idx]
+        else:
+            if not isinstance(current, dict) or part not in current:
+                return _MISSING
+            current = current[part]
+    return current
+
+
+def _set_path(item: Dict[str, Any], path: str, value: Any) -> None:
+    parts = path.split(".")
+    target = item
+    for part in parts[:-1]:
+        target = target.setdefault(part, {})
+    target[parts[-1]] = value
+
+
+def _remove_path(item: Dict[str, Any], path: str) -> None:
+    parts = path.split(".")
+    target = item
+    for part in parts[:-1]:
+        target = target.get(part)
+        if not isinstance(target, dict):
+            return
+    target.pop(parts[-1], None)
+
+
+def _compare(op: str, left: Any, right: Any) -> bool:
+    if left is _MISSING or right is _MISSING:
+        return op == "<>" and (left is _MISSING) != (right is _MISSING)
+    try:
+        if op == "=":
+            return left == right
+        if op == "<>":
+            return left != right
+        if op == "<":
+            return left < right
+        if op == "<=":
+            return left <= right
+        if op == ">":
+            return left > right
+        if op == ">=":
+            return left >= right
+    except TypeError:
+        return False
+    raise ValueError(f"operador não suportado: {op}")
+
+
+def _ddb_type(value: Any) -> str:
+    if isinstance(value, bool):
+        return "BOOL"
+    if value is None:
+        return "NULL"
+    if isinstance(value, str):
+        return "S"
+    if isinstance(value, (int, Decimal)):
+        return "N"
+    if isinstance(value, bytes):
+        return "B"
+    if isinstance(value, dict):
+        return "M"
+    if isinstance(value, list):
+        return "L"
+    if isinstance(value, (set, frozenset)):
+        first = next(iter(value), "")
+        return {"S": "SS", "N": "NS", "B": "BS"}.get(_ddb_type(first), "SS")
+    return "?"
+
+
+def _eval_condition(cond: ConditionBase, item: Dict[str, Any]) -> bool:
+    """Avalia objetos de boto3.dynamodb.conditions (Attr(...).eq(...) & ...)."""
+    op = cond.expression_operator
+    values = cond.get_expression()["values"]
+
+    def operand(v):
+        if isinstance(v, Size):
+            target = _get_path(item, v.get_expression()["values"][0].name)
+            return _MISSING if target is _MISSING else Decimal(len(target))
+        if isinstance(v, AttributeBase):
+            return _get_path(item, v.name)
+        return _to_ddb(v)
+
+    if op == "AND":
+        return _eval_condition(values[0], item) and _eval_condition(values[1], item)
+    if op == "OR":
+        return _eval_condition(values[0], item) or _eval_condition(values[1], item)
+    if op == "NOT":
+        return not _eval_condition(values[0], item)
+    if op == "attribute_exists":
+        return _get_path(item, values[0].name) is not _MISSING
+    if op == "attribute_not_exists":
+        return _get_path(item, values[0].name) is _MISSING
+    if op == "attribute_type":
+        target = _get_path(item, values[0].name)
+        return target is not _MISSING and _ddb_type(target) == values[1]
+    if op == "begins_with":
+        target = operand(values[0])
+        return isinstance(target, (str, bytes)) and target.startswith(operand(values[1]))
+    if op == "contains":
+        target, needle = operand(values[0]), operand(values[1])
+        return target is not _MISSING and isinstance(target, (str, list, set, bytes)) and needle in target
+    if op == "BETWEEN":
+        target = operand(values[0])
+        return _compare(">=", target, operand(values[1])) and _compare("<=", target, operand(values[2]))
+    if op == "IN":
+        target = operand(values[0])
+        return any(_compare("=", target, _to_ddb(v)) for v in values[1])
+    return _compare(op, operand(values[0]), operand(values[1]))
+
+
+_TOKEN = re.compile(
+    r"\s*(?:(?P<op><>|<=|>=|=|<|>)|(?P<punct>[(),+-])|(?P<value>:[A-Za-z0-9_]+)"
+    r"|(?P<name>#?[A-Za-z_][A-Za-z0-9_]*(?:\.#?[A-Za-z_][A-Za-z0-9_]*|\[\d+\])*))"
+)
+
+
+def _tokenize(expr: str) -> List[Tuple[str, str]]:
+    tokens, pos = [], 0
+    expr = expr.strip()
+    while pos < len(expr):
+        match = _TOKEN.match(expr, pos)
+        if not match or match.end() == pos:
+            raise _error("ValidationException", f"Invalid expression near: {expr[pos:]!r}", "Expression")
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+        pos = match.end()
+    return tokens
+
+
+class _Expr:
+    """Parser recursivo para ConditionExpression / UpdateExpression em string."""
+
+    _KEYWORDS = {"AND", "OR", "NOT", "IN", "BETWEEN", "SET", "REMOVE", "ADD", "DELETE"}
+
+    def __init__(self, expr: str, names: Optional[dict], values: Optional[dict]):
+        self.tokens = _tokenize(expr)
+        self.pos = 0
+        self.names = names or {}
+        self.values = {k: _to_ddb(v) for k, v in (values or {}).items()}
+
+    def peek(self, offset: int = 0) -> Tuple[Optional[str], Optional[str]]:
+        idx = self.pos + offset
+        return self.tokens[idx] if idx < len(self.tokens) else (None, None)
+
+    def take(self, expected: Optional[str] = None) -> str:
+        kind, text = self.peek()
+        if text is None or (expected is not None and text.upper() != expected):
+            raise _error("ValidationException", f"Invalid expression: expected {expected}, got {text}", "Expression")
+        self.pos += 1
+        return text
+
+    def keyword(self, word: str) -> bool:
+        kind, text = self.peek()
+        return kind == "name" and text is not None and text.upper() == word
+
+    def path(self, text: str) -> str:
+        parts = []
+        for part in text.split("."):
+            suffix = ""
+            if "[" in part:
+                part, suffix = part[:part.index("[")], part[part.index("["):]
+            if part.startswith("#"):
+                if part not in self.names:
+                    raise _error("ValidationException", f"Name {part} not defined", "Expression")
+                part = self.names[part]
+            parts.append(part + suffix)
+        return ".".join(parts)
+
+    def value(self, text: str) -> Any:
+        if text not in self.values:
+            raise _error("ValidationException", f"Value {text} not defined", "Expression")
+        return self.values[text]
+
+    # ---- condições ----
+
+    def condition(self) -> Callable[[dict], bool]:
+        left = self.conjunction()
+        while self.keyword("OR"):
+            self.take()
+            right = self.conjunction()
+            left = (lambda a, b: lambda item: a(item) or b(item))(left, right)
+        return left
+
+    def conjunction(self) -> Callable[[dict], bool]:
+        left = self.negation()
+        while self.keyword("AND"):
+            self.take()
+            right = self.negation()
+            left = (lambda a, b: lambda item: a(item) and b(item))(left, right)
+        return left
+
+    def negation(self) -> Callable[[dict], bool]:
+        if self.keyword("NOT"):
+            self.take()
+            inner = self.negation()
+            return lambda item: not inner(item)
+        return self.predicate()
+
+    def operand(self) -> Callable[[dict], Any]:
+        kind, text = self.peek()
+        if kind == "value":
+            self.take()
+            value = self.value(text)
+            return lambda item: value
+        if kind == "name" and text.lower() == "size" and self.peek(1)[1] == "(":
+            self.take()
+            self.take("(")
+            path = self.path(self.take())
+            self.take(")")
+
+            def size(item):
+                target = _get_path(item, path)
+                return _MISSING if target is _MISSING else Decimal(len(target))
+            return size
+        if kind == "name":
+            self.take()
+            path = self.path(text)
+            return lambda item: _get_path(item, path)
+        raise _error("ValidationException", f"Invalid operand: {text}", "Expression")
+
+    def predicate(self) -> Callable[[dict], bool]:
+        kind, text = self.peek()
+        if text == "(":
+            self.take()
+            inner = self.condition()
+            self.take(")")
+            return inner
+        if kind == "name" and self.peek(1)[1] == "(" and text.lower() != "size":
+            func = self.take().lower()
+            self.take("(")
+            path = self.path(self.take())
+            arg = None
+            if self.peek()[1] == ",":
+                self.take()
+                arg = self.value(self.take())
+            self.take(")")
+            if func == "attribute_exists":
+                return lambda item: _get_path(item, path) is not _MISSING
+            if func == "attribute_not_exists":
+                return lambda item: _get_path(item, path) is _MISSING
+            if func == "begins_with":
+                return lambda item: isinstance(_get_path(item, path), (str, bytes)) and _get_path(item, path).startswith(arg)
+            if func == "contains":
+                return lambda item: (lambda t: t is not _MISSING and isinstance(t, (str, list, set, bytes)) and arg in t)(_get_path(item, path))
+            if func == "attribute_type":
+                return lambda item: (lambda t: t is not _MISSING and _ddb_type(t) == arg)(_get_path(item, path))
+            raise _error("ValidationException", f"Unsupported function {func}", "Expression")
+
+        left = self.operand()
+        if self.keyword("BETWEEN"):
+            self.take()
+            low = self.operand()
+            self.take("AND")
+            high = self.operand()
+            return lambda item: _compare(">=", left(item), low(item)) and _compare("<=", left(item), high(item))
+        if self.keyword("IN"):
+            self.take()
+            self.take("(")
+            options = [self.operand()]
+            while self.peek()[1] == ",":
+                self.take()
+                options.append(self.operand())
+            self.take(")")
+            return lambda item: any(_compare("=", left(item), o(item)) for o in options)
+        op = self.take()
+        right = self.operand()
+        return lambda item: _compare(op, left(item), right(item))
+
+    # ---- update ----
+
+    def update_term(self) -> Callable[[dict], Any]:
+        kind, text = self.peek()
+        if kind == "name" and text.lower() in ("if_not_exists", "list_append") and self.peek(1)[1] == "(":
+            func = self.take().lower()
+            self.take("(")
+            first = self.update_term()
+            self.take(",")
+            second = self.update_term()
+            self.take(")")
+            if func == "if_not_exists":
+                return lambda item: (lambda v: second(item) if v is _MISSING else v)(first(item))
+            return lambda item: list(first(item)) + list(second(item))
+        return self.operand()
+
+    def update_value(self) -> Callable[[dict], Any]:
+        left = self.update_term()
+        if self.peek()[1] in ("+", "-"):
+            sign = self.take()
+            right = self.update_term()
+            if sign == "+":
+                return lambda item: left(item) + right(item)
+            return lambda item: left(item) - right(item)
+        return left
+
+    def update(self) -> List[Tuple[str, str, Optional[Callable[[dict], Any]]]]:
+        actions = []
+        while self.peek()[1] is not None:
+            section = self.take().upper()
+            while True:
+                if section == "SET":
+                    path = self.path(self.take())
+                    self.take("=")
+                    actions.append(("SET", path, self.update_value()))
+                elif section == "REMOVE":
+                    actions.append(("REMOVE", self.path(self.take()), None))
+                elif section in ("ADD", "DELETE"):
+                    path = self.path(self.take())
+                    actions.append((section, path, self.operand()))
+                else:
+                    raise _error("ValidationException", f"Invalid UpdateExpression section {section}", "UpdateItem")
+                if self.peek()[1] == ",":
+                    self.take()
+                    continue
+                break
+        return actions
+
+
+def _condition(expr: Any, names: Optional[dict], values: Optional[dict]) -> Callable[[dict], bool]:
+    if expr is None:
+        return lambda item: True
+    if isinstance(expr, ConditionBase):
+        return lambda item: _eval_condition(expr, item)
+    parser = _Expr(expr, names, values)
+    fn = parser.condition()
+    if parser.peek()[1] is not None:
+        raise _error("ValidationException", f"Invalid ConditionExpression: {expr}", "Expression")
+    return fn
+
+
+def _project(item: Dict[str, Any], projection: Optional[str], names: Optional[dict]) -> Dict[str, Any]:
+    if not projection:
+        return copy.deepcopy(item)
+    names = names or {}
+    out = {}
+    for attr in (a.strip() for a in projection.split(",")):
+        attr = names.get(attr, attr)
+        if attr in item:
+            out[attr] = copy.deepcopy(item[attr])
+    return out
+
+
+# ======================= DynamoDB: tabelas =======================
+
+class MemoryTable:
+    def __init__(self, backend: "MemoryDynamoDB", name: str, hash_key: str, range_key: Optional[str] = None):
+        self._backend = backend
+        self.name = self.table_name = name
+        self.hash_key = hash_key
+        self.range_key = range_key
+        self.items: Dict[Tuple[Any, Any], Dict[str, Any]] = {}
+        self.key_schema = [{"AttributeName": hash_key, "KeyType": "HASH"}] + (
+            [{"AttributeName": range_key, "KeyType": "RANGE"}] if range_key else []
+        )
+        self.meta = SimpleNamespace(client=backend.client)
+
+    @property
+    def _lock(self):
+        return self._backend.lock
+
+    def _key(self, key: Dict[str, Any], op: str) -> Tuple[Any, Any]:
+        key = _to_ddb(key)
+        expected = {self.hash_key} | ({self.range_key} if self.range_key else set())
+        if set(key) != expected:
+            raise _error("ValidationException", "The provided key element does not match the schema", op)
+        return key[self.hash_key], key.get(self.range_key) if self.range_key else None
+
+    def _item_key(self, item: Dict[str, Any], op: str) -> Tuple[Any, Any]:
+        return self._key({k: item[k] for k in [self.hash_key, self.range_key] if k and k in item}, op)
+
+    def _check(self, current: Optional[dict], condition: Any, names, values, op: str) -> None:
+        if condition is None:
+            return
+        if not _condition(condition, names, values)(current or {}):
+            self._backend.client.exceptions.raise_(
+                "ConditionalCheckFailedException", "The conditional request failed", op,
+            )
+
+    def wait_until_exists(self) -> None:
+        pass
+
+    def load(self) -> None:
+        pass
+
+    def put_item(self, Item: Dict[str, Any], ConditionExpression: Any = None, ExpressionAttributeNames=None,
+                 ExpressionAttributeValues=None, ReturnValues: str = "NONE", **kwargs) -> dict:
+        item = _to_ddb(Item)
+        key = self._item_key(item, "PutItem")
+        with self._lock:
+            current = self.items.get(key)
+            self._check(current, ConditionExpression, ExpressionAttributeNames, ExpressionAttributeValues, "PutItem")
+            self.items[key] = item
+        resp: Dict[str, Any] = {}
+        if ReturnValues == "ALL_OLD" and current is not None:
+            resp["Attributes"] = copy.deepcopy(current)
+        return resp
+
+    def get_item(self, Key: Dict[str, Any], ProjectionExpression: Optional[str] = None,
+                 ExpressionAttributeNames=None, **kwargs) -> dict:
+        with self._lock:
+            item = self.items.get(self._key(Key, "GetItem"))
+            return {"Item": _project(item, ProjectionExpression, ExpressionAttributeNames)} if item is not None else {}
+
+    def delete_item(self, Key: Dict[str, Any], ConditionExpression: Any = None, ExpressionAttributeNames=None,
+                    ExpressionAttributeValues=None, ReturnValues: str = "NONE", **kwargs) -> dict:
+        key = self._key(Key, "DeleteItem")
+        with self._lock:
+            current = self.items.get(key)
+            self._check(current, ConditionExpression, ExpressionAttributeNames, ExpressionAttributeValues, "DeleteItem")
+            self.items.pop(key, None)
+        return {"Attributes": copy.deepcopy(current)} if ReturnValues == "ALL_OLD" and current else {}
+
+    def update_item(self, Key: Dict[str, Any], UpdateExpression: Optional[str] = None, ConditionExpression: Any = None,
+                    ExpressionAttributeNames=None, ExpressionAttributeValues=None, ReturnValues: str = "NONE",
+                    **kwargs) -> dict:
+        key = self._key(Key, "UpdateItem")
+        with self._lock:
+            current = self.items.get(key)
+            self._check(current, ConditionExpression, ExpressionAttributeNames, ExpressionAttributeValues, "UpdateItem")
+            old = copy.deepcopy(current) if current is not None else None
+            item = copy.deepcopy(current) if current is not None else _to_ddb(dict(Key))
+            changed = set()
+            if UpdateExpression:
+                actions = _Expr(UpdateExpression, ExpressionAttributeNames, ExpressionAttributeValues).update()
+                snapshot = copy.deepcopy(item)  # lados direitos enxergam o item antes do update
+                for action, path, value_fn in actions:
+                    changed.add(path)
+                    if action == "SET":
+                        _set_path(item, path, value_fn(snapshot))
+                    elif action == "REMOVE":
+                        _remove_path(item, path)
+                    elif action == "ADD":
+                        delta, existing = value_fn(snapshot), _get_path(item, path)
+                        if isinstance(delta, set):
+                            _set_path(item, path, (existing if existing is not _MISSING else set()) | delta)
+                        else:
+                            _set_path(item, path, (existing if existing is not _MISSING else Decimal(0)) + delta)
+                    elif action == "DELETE":
+                        existing = _get_path(item, path)
+                        if existing is not _MISSING:
+                            _set_path(item, path, existing - value_fn(snapshot))
+            self.items[key] = item
+
+        resp: Dict[str, Any] = {}
+        if ReturnValues == "ALL_NEW":
+            resp["Attributes"] = copy.deepcopy(item)
+        elif ReturnValues == "ALL_OLD" and old is not None:
+            resp["Attributes"] = old
+        elif ReturnValues == "UPDATED_NEW":
+            resp["Attributes"] = {p: copy.deepcopy(item[p]) for p in changed if p in item}
+        elif ReturnValues == "UPDATED_OLD" and old is not None:
+            resp["Attributes"] = {p: old[p] for p in changed if p in old}
+        return resp
+
+    def _select(self, key_condition: Any, filter_expression: Any, names, values, index: Optional[str] = None,
+                forward: bool = True, limit: Optional[int] = None, projection: Optional[str] = None) -> dict:
+        matches_key = _condition(key_condition, names, values) if key_condition is not None else (lambda item: True)
+        matches_filter = _condition(filter_expression, names, values)
+        with self._lock:
+            candidates = [i for i in self.items.values() if matches_key(i)]
+            sort_key = self._backend.index_range_key(self.name, index) if index else self.range_key
+            if sort_key:
+                candidates.sort(key=lambda i: (sort_key not in i, i.get(sort_key, 0)), reverse=not forward)
+            if limit:
+                candidates = candidates[:limit]
+            scanned = len(candidates)
+            items = [_project(i, projection, names) for i in candidates if matches_filter(i)]
+        return {"Items": items, "Count": len(items), "ScannedCount": scanned}
+
+    def query(self, KeyConditionExpression: Any, FilterExpression: Any = None, IndexName: Optional[str] = None,
+              ExpressionAttributeNames=None, ExpressionAttributeValues=None, ScanIndexForward: bool = True,
+              Limit: Optional[int] = None, ProjectionExpression: Optional[str] = None, **kwargs) -> dict:
+        return self._select(
+            KeyConditionExpression, FilterExpression, ExpressionAttributeNames, ExpressionAttributeValues,
+            IndexName, ScanIndexForward, Limit, ProjectionExpression,
+        )
+
+    def scan(self, FilterExpression: Any = None, ExpressionAttributeNames=None, ExpressionAttributeValues=None,
+             Limit: Optional[int] = None, ProjectionExpression: Optional[str] = None, **kwargs) -> dict:
+        return self._select(
+            None, FilterExpression, ExpressionAttributeNames, ExpressionAttributeValues,
+            limit=Limit, projection=ProjectionExpression,
+        )
+
+    def batch_writer(self, overwrite_by_pkeys: Optional[List[str]] = None) -> "_BatchWriter":
+        return _BatchWriter(self)
+
+
+class _BatchWriter:
+    def __init__(self, table: MemoryTable):
+        self._table = table
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def put_item(self, Item: Dict[str, Any]) -> None:
+        self._table.put_item(Item=Item)
+
+    def delete_item(self, Key: Dict[str, Any]) -> None:
+        self._table.delete_item(Key=Key)
+
+
+class _MemoryDynamoDBClient:
+    """Só o necessário de `resource.meta.client` (exceções por classe + batch)."""
+
+    def __init__(self, backend: "MemoryDynamoDB"):
+        self._backend = backend
+        self.exceptions = _Exceptions("ConditionalCheckFailedException", "ResourceNotFoundException", "ResourceInUseException")
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryDynamoDB:
+    """Equivalente ao `boto3.resource("dynamodb")` (tipos Python, não AttributeValue)."""
+
+    MAX_BATCH_WRITE = 25
+    MAX_BATCH_GET = 100
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.tables: Dict[str, MemoryTable] = {}
+        self._indexes: Dict[Tuple[str, str], Optional[str]] = {}
+        self.client = _MemoryDynamoDBClient(self)
+        self.meta = SimpleNamespace(client=self.client)
+
+    def create_table(self, TableName: str, KeySchema: List[dict], GlobalSecondaryIndexes: Optional[List[dict]] = None,
+                     LocalSecondaryIndexes: Optional[List[dict]] = None, **kwargs) -> MemoryTable:
+        with self.lock:
+            if TableName in self.tables:
+                self.client.exceptions.raise_("ResourceInUseException", f"Table already exists: {TableName}", "CreateTable")
+            keys = {k["KeyType"]: k["AttributeName"] for k in KeySchema}
+            table = MemoryTable(self, TableName, keys["HASH"], keys.get("RANGE"))
+            self.tables[TableName] = table
+            for index in (GlobalSecondaryIndexes or []) + (LocalSecondaryIndexes or []):
+                ikeys = {k["KeyType"]: k["AttributeName"] for k in index["KeySchema"]}
+                self._indexes[(TableName, index["IndexName"])] = ikeys.get("RANGE")
+            return table
+
+    def ensure_table(self, name: str, hash_key: str, range_key: Optional[str] = None) -> MemoryTable:
+        with self.lock:
+            if name not in self.tables:
+                self.tables[name] = MemoryTable(self, name, hash_key, range_key)
+            return self.tables[name]
+
+    def index_range_key(self, table: str, index: str) -> Optional[str]:
+        return self._indexes.get((table, index))
+
+    def Table(self, name: str) -> MemoryTable:
+        with self.lock:
+            table = self.tables.get(name)
+        if table is None:
+            self.client.exceptions.raise_("ResourceNotFoundException", f"Requested resource not found: {name}", "DescribeTable")
+        return table
+
+    def batch_write_item(self, RequestItems: Dict[str, List[dict]], **kwargs) -> dict:
+        total = sum(len(v) for v in RequestItems.values())
+        if total > self.MAX_BATCH_WRITE:
+            raise _error("ValidationException", "Too many items requested for the BatchWriteItem call", "BatchWriteItem")
+        for name, requests in RequestItems.items():
+            table = self.Table(name)
+            for request in requests:
+                if "PutRequest" in request:
+                    table.put_item(Item=request["PutRequest"]["Item"])
+                elif "DeleteRequest" in request:
+                    table.delete_item(Key=request["DeleteRequest"]["Key"])
+        return {"UnprocessedItems": {}}
+
+    def batch_get_item(self, RequestItems: Dict[str, dict], **kwargs) -> dict:
+        total = sum(len(v["Keys"]) for v in RequestItems.values())
+        if total > self.MAX_BATCH_GET:
+            raise _error("ValidationException", "Too many items requested for the BatchGetItem call", "BatchGetItem")
+        responses: Dict[str, List[dict]] = {}
+        for name, spec in RequestItems.items():
+            table = self.Table(name)
+            found = []
+            for key in spec["Keys"]:
+                item = table.get_item(
+                    Key=key, ProjectionExpression=spec.get("ProjectionExpression"),
+                    ExpressionAttributeNames=spec.get("ExpressionAttributeNames"),
+                ).get("Item")
+                if item is not None:
+                    found.append(item)
+            responses[name] = found
+        return {"Responses": responses, "UnprocessedKeys": {}}
+
+
+# ======================= backend =======================
+
+class MemoryAWS:
+    """Um estado por processo (ou por teste): clients compartilham os mesmos dados."""
+
+    def __init__(self, s3_endpoint_url: Optional[str] = None):
+        self.s3 = MemoryS3(s3_endpoint_url)
+        self.sqs = MemorySQS()
+        self.dynamodb = MemoryDynamoDB()
+
+    def client(self, service: str):
+        if service == "s3":
+            return self.s3
+        if service == "sqs":
+            return self.sqs
+        if service == "dynamodb":
+            return self.dynamodb.client
+        raise ValueError(f"serviço não suportado no backend em memória: {service}")
+
+    def resource(self, service: str):
+        if service != "dynamodb":
+            raise ValueError(f"resource não suportado no backend em memória: {service}")
+        return self.dynamodb
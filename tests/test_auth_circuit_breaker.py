@@ -0,0 +1,167 @@
+import httpx
+import pytest
+from prometheus_client import REGISTRY
+
+from app.infrastructure.clients.auth_client import AuthClient
+from app.infrastructure.clients.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+class FakeClock:
+    def __init__(self, t=0.0):
+        self.t = t
+
+    def __call__(self):
+        return self.t
+
+
+def _breaker(clock, **kw):
+    params = dict(failure_rate=0.5, window_size=4, min_calls=4, open_seconds=10, clock=clock)
+    params.update(kw)
+    return CircuitBreaker(**params)
+
+
+# ========= CircuitBreaker =========
+
+def test_opens_when_failure_rate_reached_and_fast_fails():
+    clock = FakeClock()
+    b = _breaker(clock)
+
+    b.record_success()
+    b.record_failure()
+    b.record_success()
+    assert b.state == CircuitBreaker.CLOSED  # ainda abaixo de min_calls
+    b.record_failure()                       # 2/4 = 50%
+    assert b.state == CircuitBreaker.OPEN
+    assert b.allow() is False
+
+
+def test_half_open_allows_single_trial_then_closes_on_success():
+    clock = FakeClock()
+    b = _breaker(clock, min_calls=1, failure_rate=1.0)
+    b.record_failure()
+    assert b.state == CircuitBreaker.OPEN
+
+    clock.t = 10
+    assert b.state == CircuitBreaker.HALF_OPEN
+    assert b.allow() is True
+    assert b.allow() is False  # só uma chamada de teste
+    b.record_success()
+    assert b.state == CircuitBreaker.CLOSED
+    assert b.allow() is True
+
+
+def test_half_open_failure_reopens():
+    clock = FakeClock()
+    b = _breaker(clock, min_calls=1, failure_rate=1.0)
+    b.record_failure()
+    clock.t = 10
+    assert b.allow() is True
+    b.record_failure()
+    assert b.state == CircuitBreaker.OPEN
+    assert b.allow() is False
+
+
+def test_lost_half_open_trial_is_retried_after_open_seconds():
+    clock = FakeClock()
+    b = _breaker(clock, min_calls=1, failure_rate=1.0)
+    b.record_failure()
+    clock.t = 10
+    assert b.allow() is True   # trial que nunca reporta
+    assert b.allow() is False
+    clock.t = 20
+    assert b.allow() is True
+
+
+# ========= AuthClient + breaker + grace =========
+
+class FlakyHTTP:
+    def __init__(self):
+        self.mode = "ok"
+        self.gets = 0
+
+    async def get(self, path, headers=None):
+        self.gets += 1
+        req = httpx.Request("GET", f"http://fake{path}")
+        if self.mode == "down":
+            raise httpx.ConnectError("refused", request=req)
+        if self.mode == "500":
+            return httpx.Response(500, request=req, content=b"")
+        return httpx.Response(200, request=req, json={"id": 1})
+
+
+@pytest.fixture
+def auth(monkeypatch):
+    clock = FakeClock()
+    states = []
+    http = FlakyHTTP()
+    breaker = CircuitBreaker(failure_rate=0.5, window_size=2, min_calls=2, open_seconds=30,
+                             clock=clock, on_state_change=lambda s: (states.append(s), AuthClient._on_breaker_change(s)))
+    c = AuthClient("http://auth:8000", cache_ttl=10, breaker=breaker, stale_grace_seconds=60)
+
+    async def fake_get_client():
+        return http
+    monkeypatch.setattr(c, "_get_client", fake_get_client, raising=False)
+
+    now = {"t": 1000.0}
+    monkeypatch.setattr("app.infrastructure.clients.auth_client.time.time", lambda: now["t"], raising=True)
+    return c, http, clock, now, states
+
+
+@pytest.mark.asyncio
+async def test_fast_fail_when_open_without_touching_network(auth):
+    c, http, clock, now, states = auth
+    http.mode = "down"
+
+    for _ in range(2):
+        with pytest.raises(httpx.ConnectError):
+            await c.me("tok")
+    assert states == [CircuitBreaker.OPEN]
+    assert REGISTRY.get_sample_value("auth_circuit_state") == 2
+
+    gets_before = http.gets
+    with pytest.raises(CircuitOpenError):
+        await c.me("tok")
+    assert http.gets == gets_before  # falha rápida, sem rede
+
+    # CircuitOpenError é um httpx.RequestError -> _fetch_me mapeia para 503
+    assert issubclass(CircuitOpenError, httpx.RequestError)
+
+
+@pytest.mark.asyncio
+async def test_stale_payload_served_within_grace_when_auth_down(auth):
+    c, http, clock, now, states = auth
+    assert await c.me("tok") == {"id": 1}   # cacheado até 1010
+
+    http.mode = "500"
+    now["t"] = 1020.0                        # expirado, mas dentro da graça (até 1070)
+    before = REGISTRY.get_sample_value("auth_stale_cache_served_total") or 0
+    assert await c.me("tok") == {"id": 1}
+    assert REGISTRY.get_sample_value("auth_stale_cache_served_total") == before + 1
+
+    # 1 sucesso + 1 falha na janela de 2 = 50% -> circuito abriu
+    assert c._breaker.state == CircuitBreaker.OPEN
+    now["t"] = 1080.0                        # fora da graça: sem payload para servir
+    with pytest.raises(CircuitOpenError):
+        await c.me("tok")
+
+
+@pytest.mark.asyncio
+async def test_4xx_counts_as_healthy_response(auth):
+    c, http, clock, now, states = auth
+
+    class Rejecting(FlakyHTTP):
+        async def get(self, path, headers=None):
+            req = httpx.Request("GET", f"http://fake{path}")
+            return httpx.Response(401, request=req, content=b"")
+
+    rejecting = Rejecting()
+
+    async def fake_get_client():
+        return rejecting
+    c._get_client = fake_get_client
+
+    for _ in range(3):
+        with pytest.raises(httpx.HTTPStatusError):
+            await c.me("bad")
+    assert c._breaker.state == CircuitBreaker.CLOSED
+    assert states == []
@@ -59,16 +59,21 @@ async def test_get_client_builds_asyncclient_with_hooks_and_singleton(monkeypatc
     captured_init = {}
 
     class CapturingAsyncClient:
-        def __init__(self, *, base_url, timeout, event_hooks):
+        def __init__(self, *, base_url, timeout, event_hooks, limits, http2):
             captured_init["base_url"] = str(base_url)
             captured_init["timeout"] = timeout
             captured_init["event_hooks"] = event_hooks
+            captured_init["limits"] = limits
+            captured_init["http2"] = http2
 
     # monkeypatch a classe usada na implementação
     import app.infrastructure.clients.auth_client as mod
     monkeypatch.setattr(mod.httpx, "AsyncClient", CapturingAsyncClient, raising=True)
 
-    client = AuthClient("http://auth:8000", timeout_seconds=7, cache_ttl=30)
+    client = AuthClient(
+        "http://auth:8000", timeout_seconds=7, cache_ttl=30,
+        max_connections=64, max_keepalive_connections=32, keepalive_expiry=15, http2=False,
+    )
 
     # primeira chamada cria
     ac1 = await client._get_client()
@@ -82,6 +87,62 @@ async def test_get_client_builds_asyncclient_with_hooks_and_singleton(monkeypatc
     assert "request" in captured_init["event_hooks"] and "response" in captured_init["event_hooks"]
     assert callable(captured_init["event_hooks"]["request"][0])
     assert callable(captured_init["event_hooks"]["response"][0])
+    # limites do pool configuráveis
+    assert captured_init["limits"] == httpx.Limits(
+        max_connections=64, max_keepalive_connections=32, keepalive_expiry=15
+    )
+    assert captured_init["http2"] is False
+
+
+def test_pool_limits_and_http2_default_from_settings(monkeypatch):
+    import app.config as cfg
+    import app.infrastructure.clients.auth_client as mod
+    from types import SimpleNamespace
+
+    monkeypatch.setattr(
+        cfg, "settings",
+        SimpleNamespace(
+            auth_max_connections=10,
+            auth_max_keepalive_connections=5,
+            auth_keepalive_expiry_seconds=60,
+            auth_http2=True,
+        ),
+        raising=False,
+    )
+    monkeypatch.setattr(mod, "_http2_available", lambda: True, raising=True)
+
+    c = AuthClient("http://auth:8000")
+    assert c._limits == httpx.Limits(max_connections=10, max_keepalive_connections=5, keepalive_expiry=60)
+    assert c._http2 is True
+
+
+def test_pool_limits_keep_explicit_zero_and_fall_back_to_settings_defaults(monkeypatch):
+    import app.config as cfg
+    from types import SimpleNamespace
+
+    # settings sem os campos do pool: o fallback é o default declarado em Settings
+    monkeypatch.setattr(cfg, "settings", SimpleNamespace(), raising=False)
+
+    c = AuthClient("http://auth:8000", max_keepalive_connections=0, keepalive_expiry=0, negative_max_entries=0)
+    assert c._limits == httpx.Limits(
+        max_connections=cfg.Settings.model_fields["auth_max_connections"].default,
+        max_keepalive_connections=0,  # 0 = sem keep-alive, não "usar o default"
+        keepalive_expiry=0,
+    )
+    assert c._neg_max == 0
+
+    c = AuthClient("http://auth:8000")
+    assert c._limits.keepalive_expiry == cfg.Settings.model_fields["auth_keepalive_expiry_seconds"].default
+
+
+def test_http2_falls_back_when_h2_missing(monkeypatch, caplog):
+    import app.infrastructure.clients.auth_client as mod
+    monkeypatch.setattr(mod, "_http2_available", lambda: False, raising=True)
+
+    with caplog.at_level("WARNING", logger="auth"):
+        c = AuthClient("http://auth:8000", http2=True)
+    assert c._http2 is False
+    assert any("h2" in r.getMessage() for r in caplog.records)
 
 
 # ========= login =========
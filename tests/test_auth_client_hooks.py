@@ -19,11 +19,12 @@ async def test_event_hooks_log_request_and_response(caplog, monkeypatch):
 
     # Wrapper que injeta o MockTransport, preservando event_hooks
     class AsyncClientWithMock:
-        def __init__(self, *, base_url, timeout, event_hooks):
+        def __init__(self, *, base_url, timeout, event_hooks, **kwargs):
             self._inner = orig_async_client(
                 base_url=base_url,
                 timeout=timeout,
                 event_hooks=event_hooks,
+                **kwargs,
                 transport=httpx.MockTransport(handler),
             )
 
@@ -59,3 +60,36 @@ async def test_event_hooks_log_request_and_response(caplog, monkeypatch):
 
     # Trecho do corpo presente no log
     assert any("access_token" in m for m in resp_msgs)
+
+
+@pytest.mark.asyncio
+async def test_response_hook_skips_body_when_debug_disabled(caplog, monkeypatch):
+    captured = {}
+
+    class CapturingAsyncClient:
+        def __init__(self, *, event_hooks, **kwargs):
+            captured["hooks"] = event_hooks
+
+    import app.infrastructure.clients.auth_client as mod
+    monkeypatch.setattr(mod.httpx, "AsyncClient", CapturingAsyncClient, raising=True)
+
+    class BodyMustNotBeRead:
+        status_code = 200
+        request = httpx.Request("GET", "http://auth:8000/api/v1/auth/me")
+
+        async def aread(self):
+            raise AssertionError("corpo não deveria ser lido fora de DEBUG")
+
+        @property
+        def text(self):
+            raise AssertionError("corpo não deveria ser lido fora de DEBUG")
+
+    c = AuthClient("http://auth:8000")
+    await c._get_client()
+
+    with caplog.at_level(logging.INFO, logger="auth"):
+        await captured["hooks"]["request"][0](BodyMustNotBeRead.request)
+        await captured["hooks"]["response"][0](BodyMustNotBeRead())
+
+    assert not any("HTTPX" in r.getMessage() for r in caplog.records)
+    assert "start" not in BodyMustNotBeRead.request.extensions
@@ -12,19 +12,12 @@ import app.core.auth as auth_mod
 
 @pytest.fixture(autouse=True)
 def reset_auth_globals(monkeypatch):
-    # Garante estado limpo entre testes
-    monkeypatch.setattr(auth_mod, "auth_client", None, raising=False)
-    # _auth_client não existe mais, mas manter compatibilidade não faz mal:
-    if not hasattr(auth_mod, "_auth_client"):
-        monkeypatch.setattr(auth_mod, "_auth_client", None, raising=False)
-    else:
-        auth_mod._auth_client = None
+    # Garante estado limpo entre testes (client único do subsistema de auth)
+    monkeypatch.setattr(auth_mod, "_auth_client", None, raising=False)
     # Garante que except httpx.* funcione mesmo que o módulo não tivesse importado
     monkeypatch.setattr(auth_mod, "httpx", httpx, raising=False)
     yield
-    auth_mod.auth_client = None
-    if hasattr(auth_mod, "_auth_client"):
-        auth_mod._auth_client = None
+    auth_mod._auth_client = None
 
 
 # ====== _safe_token_id ======
@@ -168,14 +161,14 @@ async def test_fetch_me_timeout_to_503(monkeypatch):
 # ====== get_auth_client ======
 
 def test_get_auth_client_asserts_when_none(monkeypatch):
-    monkeypatch.setattr(auth_mod, "auth_client", None, raising=False)
+    monkeypatch.setattr(auth_mod, "_auth_client", None, raising=False)
     with pytest.raises(AssertionError):
         auth_mod.get_auth_client()
 
 
 def test_get_auth_client_returns_instance(monkeypatch):
     class FakeClient: ...
-    monkeypatch.setattr(auth_mod, "auth_client", FakeClient(), raising=False)
+    monkeypatch.setattr(auth_mod, "_auth_client", FakeClient(), raising=False)
     c = auth_mod.get_auth_client()
     assert isinstance(c, FakeClient)
 
@@ -213,3 +206,111 @@ async def test_get_current_user_invalid_token_401():
         await auth_mod.get_current_user(credentials=creds, client=FakeClient())
     assert ex.value.status_code == 401
     assert "invalid token" in ex.value.detail.lower()
+
+
+# ====== módulo único ======
+
+def test_app_auth_reexports_the_core_dependencies():
+    import importlib
+
+    import app.auth
+    assert importlib.reload(app.auth) is app.auth
+    for name in ("require_user", "require_admin", "require_scopes", "get_current_user", "set_auth_client"):
+        assert getattr(app.auth, name) is getattr(auth_mod, name)  # mesma dependency para o FastAPI
+
+
+@pytest.mark.asyncio
+async def test_set_and_close_auth_client():
+    class FakeClient:
+        closed = False
+
+        async def aclose(self):
+            self.closed = True
+
+    fake = FakeClient()
+    auth_mod.set_auth_client(fake)
+    assert auth_mod._ensure_client() is fake
+    assert auth_mod.get_auth_client() is fake
+
+    await auth_mod.close_auth_client()
+    assert fake.closed is True
+    assert auth_mod._auth_client is None
+
+
+# ====== require_user memoizado por request ======
+
+@pytest.mark.asyncio
+async def test_require_user_memoized_on_request_state(monkeypatch):
+    from types import SimpleNamespace
+    calls = []
+
+    class FakeClient:
+        async def me(self, token):
+            calls.append(token)
+            return {"id": 1, "username": "u", "email": "u@x", "role": "user", "is_active": True}
+
+    monkeypatch.setattr(auth_mod, "_ensure_client", lambda: FakeClient())
+    request = SimpleNamespace(state=SimpleNamespace())
+    creds = HTTPAuthorizationCredentials(scheme="Bearer", credentials="abc")
+
+    u1 = await auth_mod.require_user(creds, request)
+    u2 = await auth_mod.require_user(creds, request)
+    assert u1 is u2
+    assert request.state.user is u1
+    assert calls == ["abc"]
+
+
+def test_auth_runs_once_per_request_and_feeds_access_log(monkeypatch):
+    import logging
+    from fastapi import APIRouter, Depends, FastAPI, Request
+    from fastapi.testclient import TestClient
+    from app.core import logging as core_logging
+    from app.middleware.observability import ObservabilityMiddleware
+
+    calls = []
+
+    class FakeClient:
+        async def me(self, token):
+            calls.append(token)
+            return {"id": 42, "username": "u", "email": "u@x", "role": "user", "is_active": True}
+
+    monkeypatch.setattr(auth_mod, "_ensure_client", lambda: FakeClient())
+    built = []
+    original_init = auth_mod.UserContext.__init__
+
+    def counting_init(self, **data):
+        built.append(data)
+        original_init(self, **data)
+
+    monkeypatch.setattr(auth_mod.UserContext, "__init__", counting_init)
+
+    router = APIRouter(dependencies=[Depends(auth_mod.require_user)])
+
+    @router.get("/me")
+    async def me(request: Request, user=Depends(auth_mod.require_user)):
+        assert auth_mod.current_user(request) is user
+        return {"id": user.id}
+
+    app = FastAPI()
+    app.add_middleware(ObservabilityMiddleware)
+    app.include_router(router)
+
+    seen = []
+
+    class Capture(logging.Handler):
+        def emit(self, record):
+            seen.append(core_logging._user_id.get())
+
+    handler = Capture()
+    http_log = logging.getLogger("http")
+    http_log.addHandler(handler)
+    monkeypatch.setattr(http_log, "level", logging.INFO)
+    try:
+        r = TestClient(app).get("/me", headers={"Authorization": "Bearer abc"})
+    finally:
+        http_log.removeHandler(handler)
+
+    assert r.status_code == 200 and r.json() == {"id": 42}
+    assert calls == ["abc"]
+    assert len(built) == 1
+    assert seen == ["42"]
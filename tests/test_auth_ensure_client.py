@@ -8,9 +8,9 @@ import app.core.auth as auth_mod
 @pytest.fixture(autouse=True)
 def reset_global(monkeypatch):
     # garante estado limpo entre os testes
-    monkeypatch.setattr(auth_mod, "auth_client", None, raising=False)
+    monkeypatch.setattr(auth_mod, "_auth_client", None, raising=False)
     yield
-    auth_mod.auth_client = None
+    auth_mod._auth_client = None
 
 
 def test_returns_cached_instance_when_already_set(monkeypatch):
@@ -18,8 +18,8 @@ def test_returns_cached_instance_when_already_set(monkeypatch):
         pass
 
     cached = CachedClient()
-    # agora o cache é em auth_client
-    monkeypatch.setattr(auth_mod, "auth_client", cached, raising=False)
+    # client único do subsistema de auth
+    monkeypatch.setattr(auth_mod, "_auth_client", cached, raising=False)
 
     got = auth_mod._ensure_client()
     assert got is cached  # deve retornar o cache e NÃO tentar ler settings
@@ -0,0 +1,86 @@
+import httpx
+import pytest
+from prometheus_client import REGISTRY
+
+from app.infrastructure.clients.auth_client import AuthClient
+
+
+class RejectingHTTP:
+    def __init__(self, status=401):
+        self.status = status
+        self.gets = 0
+
+    async def get(self, path, headers=None):
+        self.gets += 1
+        req = httpx.Request("GET", f"http://fake{path}")
+        return httpx.Response(self.status, request=req, content=b"")
+
+
+def _client(monkeypatch, http, **kw):
+    c = AuthClient("http://auth:8000", **kw)
+
+    async def fake_get_client():
+        return http
+    monkeypatch.setattr(c, "_get_client", fake_get_client, raising=False)
+    return c
+
+
+def _hits():
+    return REGISTRY.get_sample_value("auth_negative_cache_hits_total") or 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status", [401, 403])
+async def test_rejected_token_is_answered_from_negative_cache(monkeypatch, status):
+    http = RejectingHTTP(status)
+    c = _client(monkeypatch, http, negative_ttl=5)
+    now = {"t": 1000.0}
+    monkeypatch.setattr("app.infrastructure.clients.auth_client.time.time", lambda: now["t"], raising=True)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await c.me("stale-token")
+    base = _hits()
+
+    with pytest.raises(httpx.HTTPStatusError) as ex:
+        await c.me("stale-token")
+    assert ex.value.response.status_code == status  # _fetch_me continua mapeando p/ 401
+    assert http.gets == 1
+    assert _hits() == base + 1
+
+    # expira após o TTL curto
+    now["t"] = 1005.0
+    with pytest.raises(httpx.HTTPStatusError):
+        await c.me("stale-token")
+    assert http.gets == 2
+
+
+@pytest.mark.asyncio
+async def test_negative_cache_keyed_by_hash_and_bounded(monkeypatch):
+    http = RejectingHTTP(401)
+    c = _client(monkeypatch, http, negative_ttl=60, negative_max_entries=2)
+    monkeypatch.setattr("app.infrastructure.clients.auth_client.time.time", lambda: 1000.0, raising=True)
+
+    for tok in ("t1", "t2", "t3"):
+        with pytest.raises(httpx.HTTPStatusError):
+            await c.me(tok)
+
+    assert len(c._neg_cache) == 2
+    assert not any(tok in key for key in c._neg_cache for tok in ("t1", "t2", "t3"))
+
+    # t1 foi o mais antigo -> despejado, vai à rede de novo
+    with pytest.raises(httpx.HTTPStatusError):
+        await c.me("t1")
+    assert http.gets == 4
+
+
+@pytest.mark.asyncio
+async def test_server_errors_are_not_negatively_cached(monkeypatch):
+    http = RejectingHTTP(500)
+    c = _client(monkeypatch, http, negative_ttl=60)
+    monkeypatch.setattr("app.infrastructure.clients.auth_client.time.time", lambda: 1000.0, raising=True)
+
+    for _ in range(2):
+        with pytest.raises(httpx.HTTPStatusError):
+            await c.me("tok")
+    assert http.gets == 2
+    assert not c._neg_cache
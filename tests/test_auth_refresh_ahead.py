@@ -0,0 +1,93 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.infrastructure.clients.auth_client import AuthClient
+
+
+class SlowHTTP:
+    def __init__(self):
+        self.gets = 0
+        self.release = asyncio.Event()
+        self.fail = False
+
+    async def get(self, path, headers=None):
+        self.gets += 1
+        req = httpx.Request("GET", f"http://fake{path}")
+        if self.gets > 1:
+            await self.release.wait()  # renovação fica "lenta"
+        if self.fail:
+            raise httpx.ConnectError("down", request=req)
+        return httpx.Response(200, request=req, json={"id": 1, "v": self.gets})
+
+
+@pytest.fixture
+def setup(monkeypatch):
+    http = SlowHTTP()
+    c = AuthClient("http://auth:8000", cache_ttl=30, refresh_ahead_seconds=5)
+
+    async def fake_get_client():
+        return http
+    monkeypatch.setattr(c, "_get_client", fake_get_client, raising=False)
+    now = {"t": 1000.0}
+    monkeypatch.setattr("app.infrastructure.clients.auth_client.time.time", lambda: now["t"], raising=True)
+    return c, http, now
+
+
+@pytest.mark.asyncio
+async def test_entry_near_expiry_is_served_and_refreshed_in_background(setup):
+    c, http, now = setup
+    assert await c.me("tok") == {"id": 1, "v": 1}   # expira em 1030
+
+    now["t"] = 1026.0                               # dentro da janela de 5 s
+    # não bloqueia na renovação lenta: devolve o valor cacheado
+    assert await asyncio.wait_for(c.me("tok"), 0.5) == {"id": 1, "v": 1}
+    assert await asyncio.wait_for(c.me("tok"), 0.5) == {"id": 1, "v": 1}
+    assert len(c._refreshing) == 1                  # coalescida por token
+    assert http.gets == 2
+
+    http.release.set()
+    await asyncio.gather(*c._refreshing.values())
+    assert not c._refreshing
+
+    now["t"] = 1040.0                               # antigo teria expirado em 1030
+    assert await c.me("tok") == {"id": 1, "v": 2}   # renovado (até 1056)
+    assert http.gets == 2
+
+
+@pytest.mark.asyncio
+async def test_no_refresh_outside_window(setup):
+    c, http, now = setup
+    await c.me("tok")
+    now["t"] = 1010.0
+    await c.me("tok")
+    assert not c._refreshing
+    assert http.gets == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_cached_value(setup):
+    c, http, now = setup
+    await c.me("tok")
+    http.fail = True
+    http.release.set()
+
+    now["t"] = 1027.0
+    assert await c.me("tok") == {"id": 1, "v": 1}
+    await asyncio.gather(*c._refreshing.values())
+    assert await c.me("tok") == {"id": 1, "v": 1}
+
+
+@pytest.mark.asyncio
+async def test_aclose_cancels_pending_refreshes(setup):
+    c, http, now = setup
+    await c.me("tok")
+    now["t"] = 1028.0
+    await c.me("tok")
+    task = next(iter(c._refreshing.values()))
+
+    await c.aclose()
+    await asyncio.sleep(0)
+    assert task.cancelled() or task.done()
+    assert not c._refreshing
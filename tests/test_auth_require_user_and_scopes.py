@@ -4,13 +4,8 @@ import pytest
 import httpx
 from fastapi.security import HTTPAuthorizationCredentials
 
-# --- escolha o módulo certo: preferimos app.auth; se não existir/faltar a função, caímos para app.core.auth
-try:
-    auth_mod = importlib.import_module("app.auth")
-    if not hasattr(auth_mod, "require_user"):
-        raise AttributeError("require_user ausente em app.auth")
-except Exception:
-    auth_mod = importlib.import_module("app.core.auth")
+# internals (_ensure_client, _auth_client) vivem em app.core.auth; app.auth só reexporta
+auth_mod = importlib.import_module("app.core.auth")
 
 # ---------- helpers ----------
 
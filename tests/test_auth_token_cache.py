@@ -0,0 +1,170 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.infrastructure.clients.auth_client import AuthClient
+from app.infrastructure.clients.token_cache import (
+    InMemoryTokenCache,
+    RedisTokenCache,
+    _encode_command,
+    build_shared_cache,
+)
+
+
+# ========= Fake servidor RESP (faz o papel do Redis) =========
+
+class FakeRedisServer:
+    def __init__(self):
+        self.data = {}
+        self.commands = []
+        self.server = None
+
+    async def _reply(self, writer, value):
+        if value is None:
+            writer.write(b"$-1\r\n")
+        elif isinstance(value, bytes):
+            writer.write(b"$%d\r\n%s\r\n" % (len(value), value))
+        else:
+            writer.write(b"+%s\r\n" % value.encode())
+        await writer.drain()
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                header = await reader.readline()
+                if not header:
+                    break
+                n = int(header[1:-2])
+                args = []
+                for _ in range(n):
+                    size = int((await reader.readline())[1:-2])
+                    args.append((await reader.readexactly(size + 2))[:-2])
+                cmd = args[0].decode().upper()
+                self.commands.append(cmd)
+                if cmd == "GET":
+                    await self._reply(writer, self.data.get(args[1]))
+                elif cmd == "SET":
+                    self.data[args[1]] = args[2]
+                    await self._reply(writer, "OK")
+                else:
+                    await self._reply(writer, "OK")
+        finally:
+            writer.close()
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return f"redis://127.0.0.1:{self.server.sockets[0].getsockname()[1]}/0"
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+
+class CountingHTTP:
+    def __init__(self):
+        self.gets = 0
+
+    async def get(self, path, headers=None):
+        self.gets += 1
+        req = httpx.Request("GET", f"http://fake{path}")
+        return httpx.Response(200, request=req, json={"id": 7, "username": "u"})
+
+
+def _worker(monkeypatch, http, shared):
+    c = AuthClient("http://auth:8000", cache_ttl=30, shared_cache=shared)
+
+    async def fake_get_client():
+        return http
+    monkeypatch.setattr(c, "_get_client", fake_get_client, raising=False)
+    return c
+
+
+# ========= Testes =========
+
+def test_encode_command_is_resp_array():
+    assert _encode_command("GET", "k") == b"*2\r\n$3\r\nGET\r\n$1\r\nk\r\n"
+
+
+@pytest.mark.asyncio
+async def test_in_memory_cache_is_bounded_lru():
+    cache = InMemoryTokenCache(max_entries=2)
+    await cache.set("a", 1.0, {"id": 1})
+    await cache.set("b", 1.0, {"id": 2})
+    await cache.get("a")                  # "a" vira o mais recente
+    await cache.set("c", 1.0, {"id": 3})  # despeja "b"
+    assert len(cache) == 2
+    assert await cache.get("b") is None
+    assert await cache.get("a") == (1.0, {"id": 1})
+
+
+@pytest.mark.asyncio
+async def test_second_worker_hits_shared_cache_without_calling_me(monkeypatch):
+    monkeypatch.setattr("app.infrastructure.clients.auth_client.time.time", lambda: 1000.0, raising=True)
+    server = FakeRedisServer()
+    url = await server.start()
+    try:
+        http = CountingHTTP()
+        worker_a = _worker(monkeypatch, http, RedisTokenCache(url))
+        worker_b = _worker(monkeypatch, http, RedisTokenCache(url))
+
+        assert await worker_a.me("tok") == {"id": 7, "username": "u"}
+        assert await worker_b.me("tok") == {"id": 7, "username": "u"}
+        assert http.gets == 1  # B achou no L2
+
+        # depois do L2, a próxima leitura do B fica no L1 (sem ir ao "Redis")
+        gets_before = server.commands.count("GET")
+        assert await worker_b.me("tok") == {"id": 7, "username": "u"}
+        assert server.commands.count("GET") == gets_before
+
+        # chave é o hash do token, nunca o token cru
+        assert all(b"tok" != k.split(b":")[-1] for k in server.data)
+
+        await worker_a.aclose()
+        await worker_b.aclose()
+    finally:
+        await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_failure_degrades_to_network(monkeypatch):
+    monkeypatch.setattr("app.infrastructure.clients.auth_client.time.time", lambda: 1000.0, raising=True)
+    http = CountingHTTP()
+    # porta sem ninguém escutando
+    c = _worker(monkeypatch, http, RedisTokenCache("redis://127.0.0.1:1/0", timeout_seconds=0.2))
+
+    assert await c.me("tok") == {"id": 7, "username": "u"}
+    assert await c.me("tok") == {"id": 7, "username": "u"}  # L1
+    assert http.gets == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_down_fails_fast_until_retry_window(monkeypatch):
+    cache = RedisTokenCache("redis://cache:6379/0", timeout_seconds=0.2, retry_after_seconds=0.3)
+    attempts = []
+
+    async def hanging_connect():
+        attempts.append(1)
+        await asyncio.sleep(10)  # Redis fora: o connect só termina no timeout
+
+    monkeypatch.setattr(cache, "_connect", hanging_connect)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    results = await asyncio.gather(*(cache.get(f"k{i}") for i in range(10)))
+    elapsed = loop.time() - start
+
+    assert results == [None] * 10
+    assert len(attempts) == 1  # os outros misses não esperam o timeout na fila do lock
+    assert elapsed < 0.2 * 2
+
+    await asyncio.sleep(0.35)  # janela passou: um comando testa o Redis de novo
+    assert await cache.get("k") is None and len(attempts) == 2
+
+
+def test_build_shared_cache_from_settings(caplog):
+    assert build_shared_cache("memory", None) is None
+    assert isinstance(build_shared_cache("redis", "redis://cache:6379/1"), RedisTokenCache)
+    with caplog.at_level("ERROR", logger="auth"):
+        assert build_shared_cache("redis", None) is None
+    assert any("AUTH_CACHE_REDIS_URL" in r.getMessage() for r in caplog.records)
@@ -0,0 +1,163 @@
+import sys
+import importlib
+from types import SimpleNamespace
+
+import boto3
+import pytest
+from prometheus_client import REGISTRY
+
+
+@pytest.fixture
+def fresh_aws(monkeypatch):
+    """Reimporta app.aws com boto3.Session instrumentada (conta sessões/clients criados)."""
+    created = {"sessions": 0, "clients": [], "resources": []}
+
+    class FakeTable:
+        def __init__(self, name):
+            self.name = name
+
+    class FakeResource:
+        meta = SimpleNamespace(client=object())
+
+        def Table(self, name):
+            return FakeTable(name)
+
+    class FakeClient:
+        def __init__(self, service):
+            self.service = service
+            self.closed = False
+
+        def generate_presigned_url(self, *a, **k):
+            return f"https://{self.service}/signed"
+
+        def close(self):
+            self.closed = True
+
+    class FakeSession:
+        def __init__(self, *a, **k):
+            created["sessions"] += 1
+
+        def client(self, service, **kwargs):
+            created["clients"].append(service)
+            return FakeClient(service)
+
+        def resource(self, service, **kwargs):
+            created["resources"].append(service)
+            return FakeResource()
+
+    monkeypatch.setattr(boto3.session, "Session", FakeSession, raising=True)
+    from app.config import settings
+    monkeypatch.setattr(settings, "aws_backend", "boto3")
+    sys.modules.pop("app.aws", None)
+    mod = importlib.import_module("app.aws")
+    yield mod, created
+    sys.modules.pop("app.aws", None)
+    importlib.import_module("app.aws")
+
+
+def test_import_does_not_build_clients(fresh_aws):
+    _, created = fresh_aws
+    assert created == {"sessions": 0, "clients": [], "resources": []}
+
+
+def test_lazy_proxy_builds_once_and_shares_session(fresh_aws):
+    mod, created = fresh_aws
+
+    assert mod.s3.generate_presigned_url("get_object") == "https://s3/signed"
+    assert mod.s3.generate_presigned_url("get_object") == "https://s3/signed"
+    assert mod.table_videos.name == mod.settings.ddb_table
+    mod.get_sqs()
+
+    assert created["sessions"] == 1
+    assert created["clients"] == ["s3", "sqs"]
+    assert created["resources"] == ["dynamodb"]
+    assert mod.get_s3() is mod.get_s3()
+
+
+def test_reset_clients_closes_and_rebuilds(fresh_aws):
+    mod, created = fresh_aws
+
+    first = mod.get_s3()
+    mod.reset_clients()
+    assert first.closed is True
+
+    second = mod.get_s3()
+    assert second is not first
+    assert created["sessions"] == 2
+
+
+def test_init_clients_warms_everything(fresh_aws):
+    mod, created = fresh_aws
+    mod.init_clients()
+    assert sorted(created["clients"]) == ["s3", "sqs"]
+    assert created["resources"] == ["dynamodb"]
+
+
+# ---------- config compartilhado + gauge do pool ----------
+
+def test_client_config_comes_from_settings(monkeypatch):
+    import app.aws as aws_mod
+
+    monkeypatch.setattr(aws_mod.settings, "aws_max_pool_connections", 64, raising=False)
+    monkeypatch.setattr(aws_mod.settings, "aws_tcp_keepalive", True, raising=False)
+    monkeypatch.setattr(aws_mod.settings, "aws_connect_timeout_seconds", 2, raising=False)
+    monkeypatch.setattr(aws_mod.settings, "aws_read_timeout_seconds", 30, raising=False)
+    monkeypatch.setattr(aws_mod.settings, "aws_retry_mode", "adaptive", raising=False)
+    monkeypatch.setattr(aws_mod.settings, "aws_max_attempts", 4, raising=False)
+
+    cfg = aws_mod.client_config(s3={"addressing_style": "path"})
+    assert cfg.max_pool_connections == 64
+    assert cfg.tcp_keepalive is True
+    assert cfg.connect_timeout == 2
+    assert cfg.read_timeout == 30
+    assert cfg.retries == {"max_attempts": 4, "mode": "adaptive"}
+    assert cfg.s3 == {"addressing_style": "path"}
+
+
+def test_instrument_pool_tracks_in_flight_requests():
+    import app.aws as aws_mod
+
+    class FakeEvents:
+        def __init__(self):
+            self.handlers = {}
+
+        def register(self, name, handler):
+            self.handlers[name] = handler
+
+    events = FakeEvents()
+    client = SimpleNamespace(meta=SimpleNamespace(events=events, config=SimpleNamespace(max_pool_connections=12)))
+    aws_mod.instrument_pool(client, "bench-svc")
+
+    def in_use():
+        return REGISTRY.get_sample_value("aws_http_connections_in_use", {"service": "bench-svc"})
+
+    assert REGISTRY.get_sample_value("aws_http_pool_max_connections", {"service": "bench-svc"}) == 12
+    assert events.handlers["before-send"](request=None) is None  # não curto-circuita o envio
+    events.handlers["before-send"](request=None)
+    assert in_use() == 2
+    assert events.handlers["needs-retry"](response=None, caught_exception=None) is None  # não pede retry
+    assert in_use() == 1
+
+
+def test_instrument_pool_releases_on_network_errors():
+    import app.aws as aws_mod
+    from botocore.config import Config
+    from botocore.exceptions import EndpointConnectionError
+
+    # porta fechada: o send levanta antes de existir resposta (sem response-received)
+    client = boto3.client(
+        "sqs", region_name="us-east-1", endpoint_url="http://127.0.0.1:1",
+        aws_access_key_id="test", aws_secret_access_key="test",
+        config=Config(retries={"max_attempts": 3, "mode": "standard"}, connect_timeout=0.2),
+    )
+    aws_mod.instrument_pool(client, "refused-svc")
+    with pytest.raises(EndpointConnectionError):
+        client.list_queues()
+    assert REGISTRY.get_sample_value("aws_http_connections_in_use", {"service": "refused-svc"}) == 0
+
+
+def test_instrument_pool_ignores_clients_without_event_system():
+    import app.aws as aws_mod
+
+    dummy = object()
+    assert aws_mod.instrument_pool(dummy, "s3") is dummy
@@ -29,13 +29,13 @@ def _load_target_module():
 
 
 def _import_with_env_and_injected_s3(monkeypatch, dummy_s3, **env):
-    """Configura env, injeta client fake no boto3.Session.client e carrega módulo alvo."""
-    # ENV antes do import
-    monkeypatch.setenv("AWS_ENDPOINT_URL", env.get("AWS_ENDPOINT_URL", "http://localhost:4566"))
-    monkeypatch.setenv("AWS_DEFAULT_REGION", env.get("AWS_DEFAULT_REGION", "us-east-1"))
-    monkeypatch.setenv("AWS_ACCESS_KEY_ID", env.get("AWS_ACCESS_KEY_ID", "test"))
-    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", env.get("AWS_SECRET_ACCESS_KEY", "test"))
-    monkeypatch.setenv("S3_BUCKET", env.get("S3_BUCKET", "test-bucket"))
+    """Configura settings, injeta client fake no boto3.Session.client e carrega módulo alvo."""
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "aws_backend", "boto3")
+    monkeypatch.setattr(settings, "aws_endpoint_url", env.get("AWS_ENDPOINT_URL", "http://localhost:4566"))
+    monkeypatch.setattr(settings, "aws_region", env.get("AWS_DEFAULT_REGION", "us-east-1"))
+    monkeypatch.setattr(settings, "s3_bucket", env.get("S3_BUCKET", "test-bucket"))
 
     # injeta client fake do S3
     original_client = boto3.session.Session.client
@@ -117,3 +117,48 @@ def test_upload_bytes_raises_runtimeerror_on_boto_errors(monkeypatch, dummy_cls)
         awsmod.upload_bytes("x/y/z", b"data")
 
     assert "Falha ao salvar no storage:" in str(exc.value)
+
+
+def test_storage_client_comes_from_app_aws_factory(monkeypatch):
+    import app.aws as aws_mod
+    import app.services.storage as storage
+    from botocore.stub import Stubber
+    from prometheus_client import REGISTRY
+
+    monkeypatch.setattr(aws_mod.settings, "aws_backend", "boto3")
+    monkeypatch.setattr(aws_mod.settings, "aws_endpoint_url", "http://localstack:4566")
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "test")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "test")
+    aws_mod.reset_clients()
+    try:
+        client = storage.get_s3_path_style()
+        assert client is aws_mod.get_s3_path_style()  # cacheado (e resetado) pelo app.aws
+        assert client.meta.config.s3 == {"addressing_style": "path"}
+        assert client.meta.config.max_pool_connections == aws_mod.settings.aws_max_pool_connections
+        assert REGISTRY.get_sample_value("aws_http_pool_max_connections", {"service": "s3_path"}) == (
+            aws_mod.settings.aws_max_pool_connections
+        )
+        with Stubber(client) as stub:
+            stub.add_response("put_object", {}, {
+                "Bucket": aws_mod.settings.s3_bucket, "Key": "k", "Body": b"x", "ContentType": "text/plain",
+            })
+            url = storage.upload_bytes("k", b"x", "text/plain")
+        assert url == f"http://localstack:4566/{aws_mod.settings.s3_bucket}/k"
+    finally:
+        aws_mod.reset_clients()
+    assert aws_mod._clients == {}
+
+
+def test_storage_uses_memory_backend(monkeypatch):
+    import app.aws as aws_mod
+    import app.services.storage as storage
+
+    monkeypatch.setattr(aws_mod.settings, "aws_backend", "memory")
+    aws_mod.reset_clients()
+    try:
+        aws_mod.get_s3().create_bucket(Bucket=aws_mod.settings.s3_bucket)
+        storage.upload_bytes("k", b"abc")
+        body = aws_mod.get_s3().get_object(Bucket=aws_mod.settings.s3_bucket, Key="k")["Body"].read()
+    finally:
+        aws_mod.reset_clients()
+    assert body == b"abc"
@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from app.services import job_codec as codec
+
+ITEM = {
+    "id_video": "5b0c7d8e-0000-4000-8000-000000000001",
+    "titulo": "Meu vídeo",
+    "autor": "Iana",
+    "status": "UPLOADED",
+    "file_path": "s3://video-service-bucket/videos/abc/clip.mp4",
+    "data_criacao": "2025-09-07T00:00:00",
+    "data_upload": "2025-09-07T00:00:00",
+    "email": "user@example.com",
+    "username": "tester",
+    "id": "123",
+    "size_bytes": 1048576,
+    "checksum_sha256": "ab" * 32,
+    "container": "mp4",
+    "duration_ms": 95000,
+    "width": 1920,
+    "height": 1080,
+    "video_codec": "avc1",
+    "audio_codec": None,
+}
+
+
+def test_roundtrip_keeps_only_job_fields():
+    job = codec.job_from_item(ITEM)
+    body, attrs = codec.encode_job(job, job_class="small")
+
+    doc = json.loads(body)
+    assert doc["v"] == codec.SCHEMA_VERSION
+    assert "titulo" not in body and "user@example.com" not in body
+    assert attrs["schema_version"] == {"DataType": "Number", "StringValue": "1"}
+    assert attrs["encoding"]["StringValue"] == "json"
+    assert attrs["job_class"]["StringValue"] == "small"
+
+    decoded = codec.decode_job(body, attrs)
+    assert decoded == job
+    assert (decoded.bucket, decoded.key) == ("video-service-bucket", "videos/abc/clip.mp4")
+    assert decoded.media == {"container": "mp4", "duration_ms": 95000, "width": 1920, "height": 1080, "video_codec": "avc1"}
+    assert len(body) < len(json.dumps(ITEM)) / 2
+
+
+def test_large_bodies_are_gzipped():
+    job = codec.job_from_item(ITEM)
+    body, attrs = codec.encode_job(job, gzip_threshold=10)
+    assert attrs["encoding"]["StringValue"] == "gzip+base64"
+    assert codec.decode_job(body, attrs) == job
+
+
+def test_decodes_legacy_full_item_messages():
+    job = codec.decode_job(json.dumps(ITEM))
+    assert job.id_video == ITEM["id_video"]
+    assert job.sha256 == ITEM["checksum_sha256"]
+
+
+@pytest.mark.parametrize("body", ["not json", json.dumps({"v": 99, "id": "x", "b": "b", "k": "k"}), json.dumps({"v": 1, "id": "x"}), json.dumps({"foo": 1})])
+def test_invalid_messages_raise(body):
+    with pytest.raises(codec.JobDecodeError):
+        codec.decode_job(body)
@@ -0,0 +1,75 @@
+import pytest
+from prometheus_client import REGISTRY
+
+import app.services.job_routing as routing
+
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def queues(monkeypatch):
+    s = routing.settings
+    monkeypatch.setattr(s, "sqs_queue_url", "q-default", raising=False)
+    monkeypatch.setattr(s, "sqs_queue_url_small", "q-small", raising=False)
+    monkeypatch.setattr(s, "sqs_queue_url_large", "q-large", raising=False)
+    monkeypatch.setattr(s, "sqs_queue_url_priority", "q-priority", raising=False)
+    monkeypatch.setattr(s, "job_large_threshold_mb", 50, raising=False)
+    monkeypatch.setattr(s, "job_priority_roles", "admin, premium", raising=False)
+    return s
+
+
+def test_routes_by_size(queues):
+    assert routing.route_job(10 * MB, "user") == routing.JobRoute("small", "q-small")
+    assert routing.route_job(50 * MB, "user").job_class == "small"
+    assert routing.route_job(50 * MB + 1, "user") == routing.JobRoute("large", "q-large")
+
+
+def test_priority_roles_win_over_size(queues):
+    assert routing.route_job(200 * MB, "admin") == routing.JobRoute("priority", "q-priority")
+    assert routing.route_job(1, "premium").job_class == "priority"
+    assert routing.route_job(1, None).job_class == "small"
+
+
+def test_unconfigured_class_falls_back_to_default_queue(queues, monkeypatch):
+    monkeypatch.setattr(queues, "sqs_queue_url_large", None, raising=False)
+    assert routing.route_job(100 * MB) == routing.JobRoute("large", "q-default")
+
+
+def test_upload_sends_to_class_queue_and_counts(queues, monkeypatch):
+    from fastapi.testclient import TestClient
+    from types import SimpleNamespace
+    from app.auth import require_user
+    from app.main import app
+    from app.routers import videos as videos_router
+
+    class Repo:
+        def put(self, item): pass
+
+    sent = {}
+
+    class SQS:
+        def send_message(self, **kwargs):
+            sent.update(kwargs)
+
+    monkeypatch.setattr(videos_router, "put_object", lambda *a, **k: None, raising=True)
+    monkeypatch.setattr(videos_router, "sqs", SQS(), raising=True)
+    app.dependency_overrides[videos_router.get_video_repo] = lambda: Repo()
+    app.dependency_overrides[require_user] = lambda: SimpleNamespace(id=7, email="a@b", username="a", role="admin")
+
+    def routed():
+        return REGISTRY.get_sample_value("sqs_jobs_total", {"job_class": "priority", "status": "ok"}) or 0
+
+    before = routed()
+    try:
+        mp4 = b"\x00\x00\x00\x18ftypisom\x00\x00\x02\x00isomiso2"
+        resp = TestClient(app).post(
+            "/videos/upload",
+            files={"file": ("v.mp4", mp4, "video/mp4")},
+            data={"titulo": "t", "autor": "a"},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert resp.status_code == 202, resp.text
+    assert sent["QueueUrl"] == "q-priority"
+    assert routed() == before + 1
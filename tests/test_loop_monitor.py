@@ -0,0 +1,55 @@
+import asyncio
+import logging
+import time
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.core import loop_monitor
+
+
+def _blocking_call(seconds: float) -> None:
+    time.sleep(seconds)  # simula boto3 síncrono dentro de um endpoint async
+
+
+def _lag_count() -> float:
+    return REGISTRY.get_sample_value("event_loop_lag_seconds_count") or 0.0
+
+
+@pytest.mark.asyncio
+async def test_lag_is_measured_and_blocking_stack_is_logged(caplog):
+    caplog.set_level(logging.WARNING, logger="loop")
+    before = _lag_count()
+    monitor = loop_monitor.start_loop_monitor(10, 50, debug=True)
+    try:
+        await asyncio.sleep(0.05)
+        _blocking_call(0.2)
+        await asyncio.sleep(0.05)
+    finally:
+        await loop_monitor.stop_loop_monitor()
+
+    assert monitor.max_lag >= 0.15
+    assert _lag_count() - before >= 3
+    assert monitor.blocks == 1  # um log por bloqueio, não um por ciclo do watchdog
+    blocked = [r for r in caplog.records if "Event loop bloqueado" in r.getMessage()]
+    assert len(blocked) == 1 and "_blocking_call (test_loop_monitor.py:" in blocked[0].getMessage()
+    assert loop_monitor.loop_monitor() is None
+
+
+@pytest.mark.asyncio
+async def test_without_debug_only_lag_is_recorded(caplog):
+    caplog.set_level(logging.WARNING, logger="loop")
+    monitor = loop_monitor.start_loop_monitor(10, 20, debug=False)
+    try:
+        await asyncio.sleep(0.02)
+        _blocking_call(0.08)
+        await asyncio.sleep(0.03)
+    finally:
+        await loop_monitor.stop_loop_monitor()
+
+    assert monitor.max_lag >= 0.05
+    assert monitor.blocks == 0 and not caplog.records
+
+
+def test_disabled_when_interval_is_zero():
+    assert loop_monitor.start_loop_monitor(0, 100) is None
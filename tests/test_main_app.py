@@ -49,8 +49,9 @@ def reset_auth_client(monkeypatch):
     monkeypatch.setattr(main.core_auth, "_auth_client", None, raising=False)
 
 
-def test_auth_status_uninitialized(client):
-    resp = client.get("/debug/auth-status")
+def test_auth_status_uninitialized():
+    # sem lifespan (TestClient fora do `with`) ninguém criou o AuthClient
+    resp = TestClient(main.app).get("/debug/auth-status")
     assert resp.status_code == 200
     assert resp.headers.get("content-type", "").startswith("application/json")
 
@@ -61,6 +62,16 @@ def test_auth_status_uninitialized(client):
     assert body["cache_ttl"] is None
 
 
+def test_auth_status_reports_client_created_in_lifespan(client):
+    # o client do lifespan é o mesmo que require_user usa (módulo de auth único)
+    from app.config import settings
+
+    body = client.get("/debug/auth-status").json()
+    assert body["initialized"] is True
+    assert body["base_url"] == settings.auth_base_url.rstrip("/")
+    assert main.core_auth._ensure_client() is main.app.state.auth_client
+
+
 def test_auth_status_initialized(client, monkeypatch):
     class FakeAuthClient:
         def __init__(self):
@@ -68,6 +79,9 @@ def test_auth_status_initialized(client, monkeypatch):
             self._timeout = 7
             self._cache_ttl = 30
 
+        async def aclose(self):
+            pass
+
     # injeta um cliente “inicializado” no mesmo objeto core_auth usado pelo main
     monkeypatch.setattr(main.core_auth, "_auth_client", FakeAuthClient(), raising=False)
 
@@ -0,0 +1,143 @@
+import io
+import struct
+
+import pytest
+
+from app.utils import media_meta
+from app.utils.media_meta import BytesReader, FileReader, RangeReader, extract_metadata
+
+
+def box(kind: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I4s", 8 + len(payload), kind) + payload
+
+
+def full_box(kind: bytes, version: int, payload: bytes) -> bytes:
+    return box(kind, bytes([version, 0, 0, 0]) + payload)
+
+
+def tkhd(width: int, height: int) -> bytes:
+    # v0: datas/track_id/duração (20) + reservado/layer/volume (16) + matriz (36) + largura/altura 16.16
+    return full_box(b"tkhd", 0, b"\x00" * 20 + b"\x00" * 16 + b"\x00" * 36 + struct.pack(">II", width << 16, height << 16))
+
+
+def trak(handler: bytes, codec: bytes, width: int = 0, height: int = 0) -> bytes:
+    hdlr = full_box(b"hdlr", 0, b"\x00" * 4 + handler + b"\x00" * 12 + b"h\x00")
+    stsd = full_box(b"stsd", 0, struct.pack(">I", 1) + box(codec, b"\x00" * 16))
+    mdia = box(b"mdia", hdlr + box(b"minf", box(b"stbl", stsd)))
+    return box(b"trak", tkhd(width, height) + mdia)
+
+
+def mvhd(timescale: int, duration: int) -> bytes:
+    return full_box(b"mvhd", 0, b"\x00" * 8 + struct.pack(">II", timescale, duration) + b"\x00" * 80)
+
+
+FTYP = box(b"ftyp", b"isom\x00\x00\x02\x00isomiso2")
+MOOV = box(b"moov", mvhd(600, 600 * 95) + trak(b"vide", b"avc1", 1920, 1080) + trak(b"soun", b"mp4a"))
+
+
+class RecordingReader(BytesReader):
+    """Registra os intervalos lidos (inclusivos, cortados no fim do arquivo)."""
+
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.ranges = []
+
+    def read(self, offset: int, length: int) -> bytes:
+        chunk = super().read(offset, length)
+        if chunk:
+            self.ranges.append((offset, offset + len(chunk) - 1))
+        return chunk
+
+
+def test_mp4_moov_at_start_from_bytes():
+    meta = extract_metadata(BytesReader(FTYP + MOOV + box(b"mdat", b"\x00" * 100)))
+    assert meta.container == "mp4"
+    assert meta.duration_ms == 95_000
+    assert (meta.width, meta.height) == (1920, 1080)
+    assert meta.video_codec == "avc1"
+    assert meta.audio_codec == "mp4a"
+
+
+def test_mp4_moov_at_end_reads_only_headers_and_moov():
+    mdat = box(b"mdat", b"\x00" * (2 * 1024 * 1024))
+    data = FTYP + mdat + MOOV
+    reader = RecordingReader(data)
+
+    meta = extract_metadata(reader)
+
+    assert meta.duration_ms == 95_000 and meta.video_codec == "avc1"
+    fetched = sum(end - start + 1 for start, end in reader.ranges)
+    assert fetched < 128 * 1024  # só headers + moov, nunca o mdat inteiro
+    assert reader.ranges[-1] == (len(FTYP) + len(mdat), len(data) - 1)
+
+
+def test_file_reader_preserves_position():
+    f = io.BytesIO(FTYP + MOOV)
+    f.seek(5)
+    meta = extract_metadata(FileReader(f))
+    assert meta.width == 1920
+    assert f.tell() == 5
+
+
+def ebml_el(eid: int, payload: bytes) -> bytes:
+    id_bytes = eid.to_bytes((eid.bit_length() + 7) // 8, "big")
+    return id_bytes + (len(payload) | (1 << 56)).to_bytes(8, "big") + payload
+
+
+def test_matroska_tracks_found_through_seekhead():
+    header = ebml_el(0x1A45DFA3, ebml_el(0x4282, b"matroska"))
+    info = ebml_el(0x1549A966, ebml_el(0x2AD7B1, (1_000_000).to_bytes(3, "big")) + ebml_el(0x4489, struct.pack(">d", 7_250.0)))
+    video = ebml_el(0xAE, ebml_el(0x83, b"\x01") + ebml_el(0x86, b"V_VP9") + ebml_el(0xE0, ebml_el(0xB0, (1280).to_bytes(2, "big")) + ebml_el(0xBA, (720).to_bytes(2, "big"))))
+    audio = ebml_el(0xAE, ebml_el(0x83, b"\x02") + ebml_el(0x86, b"A_OPUS"))
+    tracks = ebml_el(0x1654AE6B, video + audio)
+    void = ebml_el(0xEC, b"\x00" * (300 * 1024))  # empurra Tracks para fora da janela inicial
+
+    def seekhead(tracks_pos: int) -> bytes:
+        seek = ebml_el(0x4DBB, ebml_el(0x53AB, (0x1654AE6B).to_bytes(4, "big")) + ebml_el(0x53AC, tracks_pos.to_bytes(8, "big")))
+        return ebml_el(0x114D9B74, seek)
+
+    tracks_pos = len(seekhead(0)) + len(info) + len(void)
+    segment_body = seekhead(tracks_pos) + info + void + tracks
+    data = header + ebml_el(0x18538067, segment_body)
+
+    meta = extract_metadata(BytesReader(data))
+    assert meta.container == "matroska"
+    assert meta.duration_ms == 7_250
+    assert (meta.width, meta.height) == (1280, 720)
+    assert meta.video_codec == "V_VP9"
+    assert meta.audio_codec == "A_OPUS"
+
+
+def test_unknown_content_returns_none():
+    assert extract_metadata(BytesReader(b"not a video at all")) is None
+
+
+def test_large_moov_is_parsed_box_by_box_without_loading_sample_tables():
+    class CountingReader(BytesReader):
+        def __init__(self, data: bytes):
+            super().__init__(data)
+            self.largest = 0
+
+        def read(self, offset: int, length: int) -> bytes:
+            self.largest = max(self.largest, length)
+            return super().read(offset, length)
+
+    # stsz de 4 MB dentro do stbl: o moov passa de MAX_MOOV_BYTES
+    stsz = box(b"stsz", b"\x00" * (4 * 1024 * 1024))
+    hdlr = full_box(b"hdlr", 0, b"\x00" * 4 + b"vide" + b"\x00" * 12 + b"h\x00")
+    stsd = full_box(b"stsd", 0, struct.pack(">I", 1) + box(b"hvc1", b"\x00" * 16))
+    video = box(b"trak", tkhd(3840, 2160) + box(b"mdia", hdlr + box(b"minf", box(b"stbl", stsd + stsz))))
+    moov = box(b"moov", mvhd(1000, 7_200_000) + video + trak(b"soun", b"mp4a"))
+    assert len(moov) > media_meta.MAX_MOOV_BYTES
+
+    reader = CountingReader(FTYP + moov)
+    meta = extract_metadata(reader)
+
+    assert meta.duration_ms == 7_200_000
+    assert (meta.width, meta.height, meta.video_codec, meta.audio_codec) == (3840, 2160, "hvc1", "mp4a")
+    assert reader.largest <= 64 * 1024  # headers e folhas; nunca o moov inteiro no heap
+
+
+def test_range_reader_is_abstract():
+    with pytest.raises(TypeError):
+        RangeReader()
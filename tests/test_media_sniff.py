@@ -0,0 +1,97 @@
+import struct
+
+import pytest
+
+from app.utils.media import sniff_container
+
+
+def box(kind: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I4s", 8 + len(payload), kind) + payload
+
+
+def mvhd(timescale: int, duration: int, version: int = 0) -> bytes:
+    if version == 1:
+        body = bytes([1, 0, 0, 0]) + b"\x00" * 16 + struct.pack(">IQ", timescale, duration)
+    else:
+        body = bytes(4) + b"\x00" * 8 + struct.pack(">II", timescale, duration)
+    return box(b"mvhd", body + b"\x00" * 80)
+
+
+def ebml_el(eid: int, payload: bytes) -> bytes:
+    id_bytes = eid.to_bytes((eid.bit_length() + 7) // 8, "big")
+    size = (len(payload) | (1 << 56)).to_bytes(8, "big")  # tamanho em 8 bytes
+    return id_bytes + size + payload
+
+
+FTYP = box(b"ftyp", b"isom\x00\x00\x02\x00isomiso2")
+
+
+def test_mp4_with_moov_first_reports_duration():
+    head = FTYP + box(b"moov", mvhd(1000, 12_345)) + box(b"mdat", b"\x00" * 32)
+    info = sniff_container(head)
+    assert info.container == "mp4"
+    assert info.duration_ms == 12_345
+
+
+def test_mp4_mvhd_version_1_and_moov_at_end():
+    head = FTYP + box(b"moov", mvhd(90_000, 90_000 * 61, version=1))
+    assert sniff_container(head).duration_ms == 61_000
+
+    moov_at_end = FTYP + struct.pack(">I4s", 1 << 20, b"mdat") + b"\x00" * 64
+    info = sniff_container(moov_at_end)
+    assert info.container == "mp4"
+    assert info.duration_ms is None  # fica para o parser completo
+
+
+def test_quicktime_brand_is_mov():
+    head = box(b"ftyp", b"qt  \x00\x00\x00\x00qt  ")
+    assert sniff_container(head).container == "mov"
+
+
+@pytest.mark.parametrize("major,compatible", [
+    (b"heic", b"mif1heic"), (b"avif", b"avifmif1miafMA1B"), (b"mif1", b"mif1heic"),
+    (b"M4A ", b"M4A mp42isom"),  # áudio lista brands de vídeo como compatíveis
+    (b"abcd", b"wxyz"),
+])
+def test_ftyp_with_non_video_brand_is_rejected(major, compatible):
+    head = box(b"ftyp", major + b"\x00\x00\x00\x00" + compatible)
+    assert sniff_container(head) is None
+
+
+@pytest.mark.parametrize("major,compatible", [(b"3gp5", b"3gp5isom"), (b"dash", b"iso6mp41"), (b"XYZW", b"mp42")])
+def test_ftyp_video_brands_are_accepted(major, compatible):
+    head = box(b"ftyp", major + b"\x00\x00\x00\x00" + compatible)
+    assert sniff_container(head).container == "mp4"
+
+
+def test_matroska_and_webm_with_segment_info_duration():
+    def mkv(doctype: bytes) -> bytes:
+        header = ebml_el(0x1A45DFA3, ebml_el(0x4282, doctype))
+        info = ebml_el(0x1549A966, ebml_el(0x2AD7B1, (1_000_000).to_bytes(3, "big")) + ebml_el(0x4489, struct.pack(">d", 4_500.0)))
+        return header + ebml_el(0x18538067, info)
+
+    webm = sniff_container(mkv(b"webm"))
+    assert webm.container == "webm" and webm.duration_ms == 4_500
+    assert sniff_container(mkv(b"matroska")).container == "matroska"
+    assert sniff_container(mkv(b"other")) is None
+
+
+def test_avi_duration_from_avih():
+    avih = struct.pack("<IIIII", 40_000, 0, 0, 0, 250) + b"\x00" * 36
+    head = b"RIFF" + struct.pack("<I", 1000) + b"AVI " + b"LIST" + struct.pack("<I", 200) + b"hdrl" + b"avih" + struct.pack("<I", len(avih)) + avih
+    info = sniff_container(head)
+    assert info.container == "avi"
+    assert info.duration_ms == 10_000
+
+
+@pytest.mark.parametrize("packet,offset", [(188, 0), (192, 4)])
+def test_mpegts_sync_bytes(packet, offset):
+    pkt = bytearray(packet * 3)
+    for i in range(3):
+        pkt[offset + i * packet] = 0x47
+    assert sniff_container(bytes(pkt)).container == "mpegts"
+
+
+@pytest.mark.parametrize("head", [b"", b"\x00\x01\x02", b"%PDF-1.7", b"\x89PNG\r\n\x1a\n" + b"\x00" * 200, b"G" + b"\x00" * 400])
+def test_rejects_non_video(head):
+    assert sniff_container(head) is None
@@ -0,0 +1,197 @@
+import base64
+import hashlib
+import uuid
+from decimal import Decimal
+
+import pytest
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.exceptions import ClientError
+
+import app.aws as aws_mod
+import app.utils.s3 as s3mod
+from tests.memory_aws import MemoryAWS
+from app.services.job_codec import decode_job
+
+
+@pytest.fixture
+def backend():
+    return MemoryAWS()
+
+
+def _sha(data: bytes) -> str:
+    return base64.b64encode(hashlib.sha256(data).digest()).decode()
+
+
+# ---------- S3 ----------
+
+def test_s3_put_get_range_and_head(backend):
+    s3 = backend.client("s3")
+    s3.put_object(Bucket="b", Key="k", Body=b"0123456789", ContentType="video/mp4", ChecksumSHA256=_sha(b"0123456789"))
+
+    assert s3.head_object(Bucket="b", Key="k")["ContentLength"] == 10
+    assert s3.get_object(Bucket="b", Key="k")["Body"].read() == b"0123456789"
+    assert s3.get_object(Bucket="b", Key="k", Range="bytes=2-4")["Body"].read() == b"234"
+    assert s3.get_object(Bucket="b", Key="k", Range="bytes=-3")["Body"].read() == b"789"
+
+    with pytest.raises(ClientError) as e:
+        s3.get_object(Bucket="b", Key="nope")
+    assert e.value.response["Error"]["Code"] == "NoSuchKey"
+
+
+def test_s3_rejects_wrong_checksum(backend):
+    with pytest.raises(ClientError) as e:
+        backend.client("s3").put_object(Bucket="b", Key="k", Body=b"abc", ChecksumSHA256=_sha(b"xyz"))
+    assert e.value.response["Error"]["Code"] == "BadDigest"
+
+
+def test_upload_multipart_end_to_end(backend, monkeypatch):
+    s3 = backend.client("s3")
+    monkeypatch.setattr(s3mod, "s3", s3, raising=True)
+    data = bytes(range(256)) * 4096  # 1 MiB
+
+    result = s3mod.upload_multipart("b", "video.mp4", data, "video/mp4", part_size=256 * 1024, concurrency=3)
+
+    assert result.parts == 4
+    digests = b"".join(hashlib.sha256(data[i:i + 256 * 1024]).digest() for i in range(0, len(data), 256 * 1024))
+    assert result.sha256 == f"{hashlib.sha256(digests).hexdigest()}-4"
+    assert s3.get_object(Bucket="b", Key="video.mp4")["Body"].read() == data
+    assert s3.list_multipart_uploads(Bucket="b")["Uploads"] == []
+
+
+def test_s3_complete_rejects_unknown_part(backend):
+    s3 = backend.client("s3")
+    upload_id = s3.create_multipart_upload(Bucket="b", Key="k")["UploadId"]
+    etag = s3.upload_part(Bucket="b", Key="k", UploadId=upload_id, PartNumber=1, Body=b"x")["ETag"]
+    with pytest.raises(ClientError):
+        s3.complete_multipart_upload(
+            Bucket="b", Key="k", UploadId=upload_id,
+            MultipartUpload={"Parts": [{"PartNumber": 1, "ETag": etag}, {"PartNumber": 2, "ETag": etag}]},
+        )
+
+
+# ---------- SQS ----------
+
+def test_sqs_send_batch_receive_and_visibility(backend):
+    sqs = backend.client("sqs")
+    url = sqs.create_queue(QueueName="jobs")["QueueUrl"]
+    resp = sqs.send_message_batch(QueueUrl=url, Entries=[{"Id": str(i), "MessageBody": f"m{i}"} for i in range(3)])
+    assert [e["Id"] for e in resp["Successful"]] == ["0", "1", "2"]
+
+    got = sqs.receive_message(QueueUrl=url, MaxNumberOfMessages=10, VisibilityTimeout=30)["Messages"]
+    assert [m["Body"] for m in got] == ["m0", "m1", "m2"]
+    assert sqs.receive_message(QueueUrl=url) == {}  # invisíveis até o timeout
+
+    sqs.delete_message(QueueUrl=url, ReceiptHandle=got[0]["ReceiptHandle"])
+    assert len(backend.sqs.queues[url]) == 2
+
+    with pytest.raises(ClientError) as e:
+        sqs.send_message_batch(QueueUrl=url, Entries=[{"Id": str(i), "MessageBody": "x"} for i in range(11)])
+    assert e.value.response["Error"]["Code"] == "TooManyEntriesInBatchRequest"
+
+
+# ---------- DynamoDB ----------
+
+@pytest.fixture
+def table(backend):
+    return backend.resource("dynamodb").create_table(
+        TableName="videos",
+        KeySchema=[{"AttributeName": "id_video", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "id_video", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST",
+    )
+
+
+def test_ddb_numbers_are_decimal_and_floats_rejected(table):
+    table.put_item(Item={"id_video": "v1", "size_bytes": 10})
+    assert table.get_item(Key={"id_video": "v1"})["Item"]["size_bytes"] == Decimal(10)
+    with pytest.raises(TypeError):
+        table.put_item(Item={"id_video": "v2", "ratio": 1.5})
+
+
+def test_ddb_conditional_put_and_update(table):
+    table.put_item(Item={"id_video": "v1", "status": "UPLOADED"}, ConditionExpression=Attr("id_video").not_exists())
+    with pytest.raises(table.meta.client.exceptions.ConditionalCheckFailedException):
+        table.put_item(Item={"id_video": "v1"}, ConditionExpression="attribute_not_exists(id_video)")
+
+    resp = table.update_item(
+        Key={"id_video": "v1"},
+        UpdateExpression="SET #s = :new, version = if_not_exists(version, :zero) + :one REMOVE tmp",
+        ConditionExpression="#s = :old",
+        ExpressionAttributeNames={"#s": "status"},
+        ExpressionAttributeValues={":new": "PROCESSING", ":old": "UPLOADED", ":zero": 0, ":one": 1},
+        ReturnValues="ALL_NEW",
+    )
+    assert resp["Attributes"] == {"id_video": "v1", "status": "PROCESSING", "version": Decimal(1)}
+
+    with pytest.raises(ClientError) as e:
+        table.update_item(
+            Key={"id_video": "v1"}, UpdateExpression="SET #s = :new",
+            ConditionExpression=Attr("status").eq("UPLOADED"),
+            ExpressionAttributeNames={"#s": "status"}, ExpressionAttributeValues={":new": "DONE"},
+        )
+    assert e.value.response["Error"]["Code"] == "ConditionalCheckFailedException"
+
+
+def test_ddb_query_scan_and_batch(backend, table):
+    ddb = backend.resource("dynamodb")
+    ddb.batch_write_item(RequestItems={"videos": [
+        {"PutRequest": {"Item": {"id_video": f"v{i}", "id": "u1" if i % 2 else "u2", "size": i}}} for i in range(6)
+    ]})
+
+    assert table.query(KeyConditionExpression=Key("id_video").eq("v3"))["Items"][0]["id"] == "u1"
+    scanned = table.scan(FilterExpression=Attr("id").eq("u1") & Attr("size").gte(3))["Items"]
+    assert sorted(i["id_video"] for i in scanned) == ["v3", "v5"]
+    scanned = table.scan(FilterExpression="id = :u OR #sz BETWEEN :a AND :b",
+                         ExpressionAttributeNames={"#sz": "size"},
+                         ExpressionAttributeValues={":u": "u1", ":a": 0, ":b": 0})["Items"]
+    assert sorted(i["id_video"] for i in scanned) == ["v0", "v1", "v3", "v5"]
+
+    got = ddb.batch_get_item(RequestItems={"videos": {"Keys": [{"id_video": "v1"}, {"id_video": "missing"}]}})
+    assert [i["id_video"] for i in got["Responses"]["videos"]] == ["v1"]
+    assert got["UnprocessedKeys"] == {}
+
+
+# ---------- app.aws ----------
+
+def test_app_aws_uses_memory_backend_and_reset_clears_state():
+    aws_mod.reset_clients()
+    try:
+        aws_mod.s3.put_object(Bucket="b", Key="k", Body=b"x")
+        aws_mod.table_videos.put_item(Item={"id_video": "v1"})
+        assert aws_mod.get_s3() is aws_mod.get_memory_backend().s3
+        assert aws_mod.table_videos.get_item(Key={"id_video": "v1"})["Item"] == {"id_video": "v1"}
+
+        aws_mod.reset_clients()
+        assert aws_mod.table_videos.get_item(Key={"id_video": "v1"}) == {}
+    finally:
+        aws_mod.reset_clients()
+
+
+def test_upload_flow_through_memory_backend(monkeypatch):
+    """Router -> S3 -> DynamoDB -> SQS sem nenhum mock de client."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.core.auth import require_user
+    from app.domain.models.user_model import UserContext
+
+    aws_mod.reset_clients()
+    queue = aws_mod.sqs.create_queue(QueueName=f"jobs-{uuid.uuid4().hex[:6]}")["QueueUrl"]
+    from app.config import settings
+    monkeypatch.setattr(settings, "sqs_queue_url", queue)
+    app.dependency_overrides[require_user] = lambda: UserContext(id=7, email="a@b.c", username="u", role="user", is_active=True)
+    mp4 = b"\x00\x00\x00\x18ftypisom\x00\x00\x02\x00isomiso2"
+    try:
+        with TestClient(app) as client:  # o shutdown do lifespan zera o backend: confere dentro do with
+            resp = client.post("/videos/upload", files={"file": ("a.mp4", mp4, "video/mp4")}, data={"titulo": "t", "autor": "a"})
+            assert resp.status_code == 202, resp.text
+            id_video = resp.json()["id_video"]
+
+            item = aws_mod.table_videos.get_item(Key={"id_video": id_video})["Item"]
+            bucket, _, key = item["file_path"][5:].partition("/")
+            assert aws_mod.s3.get_object(Bucket=bucket, Key=key)["Body"].read() == mp4
+
+            msg = aws_mod.sqs.receive_message(QueueUrl=queue, MessageAttributeNames=["All"])["Messages"][0]
+            assert decode_job(msg["Body"], msg["MessageAttributes"]).id_video == id_video
+    finally:
+        app.dependency_overrides.clear()
+        aws_mod.reset_clients()
@@ -112,3 +112,45 @@ def test_counters_and_histogram_register_increments():
         and f'method="{labels_lat["method"]}"' in line
         for line in after.splitlines()
     )
+
+
+def test_route_class_histograms_use_template_and_upload_size():
+    from fastapi import Request
+    from app.middleware.observability import ObservabilityMiddleware
+
+    app = FastAPI()
+    app.add_middleware(ObservabilityMiddleware)
+
+    @app.get("/videos/{id_video}")
+    async def status(id_video: str):
+        return {"id_video": id_video}
+
+    @app.post("/videos/upload")
+    async def upload(request: Request):
+        request.state.upload_bytes = 4 * 1024 * 1024
+        return {}
+
+    before = _metrics_text()
+    read_labels = {"path": "/videos/{id_video}", "method": "GET"}
+    base_read = _series_value(before, "http_read_request_duration_seconds", read_labels, suffix="_count")
+    base_upload = _series_value(before, "http_upload_request_duration_seconds", {"path": "/videos/upload"}, suffix="_count")
+    base_size_sum = _series_value(before, "video_upload_size_bytes", suffix="_sum")
+    base_per_mb = _series_value(before, "video_upload_seconds_per_mb", suffix="_count")
+
+    with TestClient(app) as client:
+        client.get("/videos/abc")
+        client.get("/videos/def")
+        client.post("/videos/upload")
+
+    after = _metrics_text()
+    # path pelo template da rota (não uma série por id)
+    assert _series_value(after, "http_read_request_duration_seconds", read_labels, suffix="_count") == base_read + 2
+    assert 'path="/videos/abc"' not in after
+    assert any(
+        line.startswith("http_read_request_duration_seconds_bucket") and 'le="0.0005"' in line
+        for line in after.splitlines()
+    )
+    assert _series_value(after, "http_upload_request_duration_seconds", {"path": "/videos/upload"}, suffix="_count") == base_upload + 1
+    assert 'http_upload_request_duration_seconds_bucket{le="600.0",path="/videos/upload"}' in after
+    assert _series_value(after, "video_upload_size_bytes", suffix="_sum") == base_size_sum + 4 * 1024 * 1024
+    assert _series_value(after, "video_upload_seconds_per_mb", suffix="_count") == base_per_mb + 1
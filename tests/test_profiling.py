@@ -0,0 +1,109 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import auth as core_auth
+from app.core import profiling
+from app.domain.models.user_model import UserContext
+from app.main import app
+from app.middleware.observability import ObservabilityMiddleware
+
+
+def _busy_loop_for_profiler(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def _user(role: str) -> UserContext:
+    return UserContext(id=1, username="u", email="u@x", role=role, is_active=True)
+
+
+def test_sampling_profiler_outputs_folded_stacks():
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy_loop_for_profiler, args=(stop,), name="busy")
+    worker.start()
+    try:
+        profiler = profiling.SamplingProfiler(interval=0.002).start()
+        time.sleep(0.1)
+        out = profiler.stop()
+    finally:
+        stop.set()
+        worker.join()
+
+    assert profiler.total > 5
+    busy = [line for line in out.splitlines() if line.startswith("busy;")]
+    assert busy and "_busy_loop_for_profiler (test_profiling.py:" in busy[0]
+    stack, count = busy[0].rsplit(" ", 1)
+    assert int(count) >= 1 and "sampling-profiler" not in out
+
+
+@pytest.mark.asyncio
+async def test_memory_profile_reports_allocations_made_during_window():
+    kept = []
+
+    async def allocate():
+        await asyncio.sleep(0.02)
+        kept.append(bytearray(2 * 1024 * 1024))
+
+    task = asyncio.create_task(allocate())
+    out = await profiling.profile_memory(0.1)
+    await task
+
+    weights = {line.rsplit(" ", 1)[0]: int(line.rsplit(" ", 1)[1]) for line in out.splitlines() if line}
+    top_stack, top_bytes = max(weights.items(), key=lambda kv: kv[1])
+    assert "test_profiling.py" in top_stack and top_bytes >= 2 * 1024 * 1024
+
+
+@pytest.mark.asyncio
+async def test_only_one_profile_at_a_time():
+    first = asyncio.create_task(profiling.profile_cpu(0.1))
+    await asyncio.sleep(0.01)
+    with pytest.raises(profiling.ProfilerBusy):
+        await profiling.profile_cpu(0.1)
+    await first
+
+
+def test_profile_endpoint_is_admin_only():
+    with TestClient(app) as client:
+        app.dependency_overrides[core_auth.require_user] = lambda: _user("user")
+        try:
+            assert client.get("/debug/profile", params={"seconds": 0.05}).status_code == 403
+            app.dependency_overrides[core_auth.require_user] = lambda: _user("admin")
+            r = client.get("/debug/profile", params={"seconds": 0.1, "interval_ms": 2})
+            assert r.status_code == 200 and r.headers["content-type"].startswith("text/plain")
+            assert "MainThread;" in r.text
+            assert client.get("/debug/profile/slow").json() == {"threshold_ms": 0, "captures": []}
+        finally:
+            app.dependency_overrides.clear()
+
+
+def test_slow_request_stacks_are_captured_once():
+    mini = FastAPI()
+    mini.add_middleware(ObservabilityMiddleware)
+
+    @mini.get("/slow")
+    async def slow():
+        time.sleep(0.25)  # bloqueia o event loop: é justamente o caso que queremos enxergar
+        return {}
+
+    @mini.get("/fast")
+    async def fast():
+        return {}
+
+    monitor = profiling.start_slow_request_monitor(50)
+    try:
+        client = TestClient(mini)
+        client.get("/fast")
+        client.get("/slow", headers={"X-Request-ID": "rid-slow"})
+    finally:
+        profiling.stop_slow_request_monitor()
+
+    assert len(monitor.captures) == 1
+    capture = monitor.captures[0]
+    assert capture["path"] == "/slow" and capture["request_id"] == "rid-slow"
+    assert capture["elapsed_ms"] >= 50
+    assert any(any(frame.startswith("slow (") for frame in stack) for stack in capture["stacks"].values())
@@ -4,6 +4,7 @@ from datetime import datetime, timezone
 import pytest
 
 # Importa o repo concreto e o módulo onde vive `table_videos`
+from app.domain.models.video_status import InvalidStatusTransition, StatusConflict
 from app.infrastructure.repositories.video_repo import VideoRepo
 import app.aws as aws_mod
 
@@ -53,32 +54,92 @@ def test_put_and_get_video(videos_table):
     assert fetched["file_path"].startswith("s3://")
 
 
-def test_update_status(videos_table):
-    repo = VideoRepo()
-
+def _seed(repo, status="UPLOADED", **extra):
     id_video = str(uuid.uuid4())
     now = datetime.now(timezone.utc).isoformat()
-
-    # Seed
     repo.put(
         {
             "id_video": id_video,
             "titulo": "Seed",
             "autor": "Teste",
-            "status": "PENDENTE",
+            "status": status,
             "file_path": "s3://bucket/seed.mp4",
             "data_criacao": now,
             "data_upload": now,
+            **extra,
         }
     )
+    return id_video, now
+
+
+def test_update_status(videos_table):
+    repo = VideoRepo()
+    id_video, now = _seed(repo)
 
-    # Atualiza
-    repo.update_status(id_video, "PROCESSANDO")
+    # Atualiza: devolve o item novo (ALL_NEW) sem outro get
+    updated = repo.update_status(id_video, "PROCESSING")
+    assert updated["status"] == "PROCESSING" and updated["version"] == 1
+    assert updated["titulo"] == "Seed"
 
     # Verifica
     got = repo.get(id_video)
     assert got is not None
-    assert got["status"] == "PROCESSANDO"
-    # Confere que data_upload foi atualizada para um ISO-8601
-    assert "data_upload" in got and isinstance(got["data_upload"], str)
-    assert "T" in got["data_upload"]  # heurística simples de ISO
+    assert got["status"] == "PROCESSING"
+    # data_upload é a do upload; a transição grava data_atualizacao (ISO-8601)
+    assert got["data_upload"] == now
+    assert "T" in got["data_atualizacao"]  # heurística simples de ISO
+
+
+def test_update_status_rejects_invalid_transitions(videos_table):
+    repo = VideoRepo()
+    id_video, _ = _seed(repo)
+
+    with pytest.raises(StatusConflict) as exc:
+        repo.update_status(id_video, "DONE")  # UPLOADED -> DONE pula o PROCESSING
+    assert exc.value.current["status"] == "UPLOADED"
+
+    repo.update_status(id_video, "PROCESSING")
+    with pytest.raises(StatusConflict):
+        repo.update_status(id_video, "PROCESSING")  # segundo worker no mesmo job
+    with pytest.raises(InvalidStatusTransition):
+        repo.update_status(id_video, "PENDENTE")
+    with pytest.raises(StatusConflict) as exc:
+        repo.update_status(str(uuid.uuid4()), "PROCESSING")  # não cria item fantasma
+    assert exc.value.current is None
+
+
+def test_update_status_with_expected_version(videos_table):
+    repo = VideoRepo()
+    id_video, _ = _seed(repo)  # item sem o campo version conta como 0
+
+    assert repo.update_status(id_video, "PROCESSING", expected_version=0)["version"] == 1
+    with pytest.raises(StatusConflict):
+        repo.update_status(id_video, "DONE", expected_version=0)  # alguém já mexeu
+    assert repo.update_status(id_video, "DONE", expected_version=1)["version"] == 2
+
+
+def test_update_status_many_reports_each_item(videos_table):
+    repo = VideoRepo()
+    ids = [_seed(repo, status="PROCESSING")[0] for _ in range(5)]
+    done, _ = _seed(repo, status="DONE")
+
+    results = repo.update_status_many([(i, "DONE") for i in ids] + [(done, "ERROR")])
+
+    assert [r.id_video for r in results] == ids + [done]
+    assert all(r.ok and r.item["status"] == "DONE" for r in results[:5])
+    assert not results[-1].ok and isinstance(results[-1].error, StatusConflict)
+    assert repo.get(done)["status"] == "DONE"
+
+
+def test_put_many_writes_all_items(videos_table):
+    repo = VideoRepo()
+    now = datetime.now(timezone.utc).isoformat()
+    ids = [str(uuid.uuid4()) for _ in range(30)]  # > 25: mais de um BatchWriteItem
+
+    repo.put_many(
+        {"id_video": id_video, "titulo": "Lote", "autor": "Teste", "status": "UPLOADED",
+         "file_path": f"s3://bucket/{id_video}.mp4", "data_criacao": now, "data_upload": now}
+        for id_video in ids
+    )
+
+    assert all(repo.get(id_video)["titulo"] == "Lote" for id_video in ids)
@@ -0,0 +1,86 @@
+import contextvars
+import json
+import logging
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.aws as aws_mod
+import app.core.auth as auth_mod
+from app.config import settings
+from app.core import timing
+from app.core.logging import JsonFormatter
+from app.main import app
+
+MP4_BYTES = b"\x00\x00\x00\x18ftypisom\x00\x00\x02\x00isomiso2"
+
+
+def test_timed_is_noop_outside_request():
+    timing._timings.set(None)
+    with timing.timed("s3"):
+        pass
+    assert timing.current_timings() is None
+
+
+def test_spans_accumulate_across_threads_and_format_header():
+    t = timing.start_request_timings()
+    timing.add_timing("ddb", 1.0)
+
+    # como o threadpool do anyio: a thread roda numa cópia do contexto, mesmo coletor
+    ctx = contextvars.copy_context()
+    th = threading.Thread(target=ctx.run, args=(timing.add_timing, "ddb", 2.5))
+    th.start()
+    th.join()
+    assert t.as_dict() == {"ddb": 3.5}
+    assert t.server_timing(10) == "ddb;dur=3.5, total;dur=10.0"
+    timing._timings.set(None)
+
+
+@pytest.fixture
+def upload_client(monkeypatch):
+    class FakeClient:
+        async def me(self, token):
+            return {"id": 7, "username": "u", "email": "u@x", "role": "user", "is_active": True}
+
+    monkeypatch.setattr(auth_mod, "_ensure_client", lambda: FakeClient())
+    aws_mod.reset_clients()
+    with TestClient(app, headers={"Authorization": "Bearer t"}) as client:
+        yield client
+    aws_mod.reset_clients()
+
+
+def test_upload_reports_stage_breakdown_in_header_and_access_log(upload_client, monkeypatch):
+    monkeypatch.setattr(settings, "server_timing_header", True)
+    records = []
+
+    class Capture(logging.Handler):
+        def emit(self, record):
+            records.append(record)
+
+    handler = Capture()
+    http_log = logging.getLogger("http")
+    http_log.addHandler(handler)
+    monkeypatch.setattr(http_log, "level", logging.INFO)
+    try:
+        r = upload_client.post(
+            "/videos/upload",
+            files={"file": ("a.mp4", MP4_BYTES, "video/mp4")},
+            data={"titulo": "t", "autor": "a"},
+        )
+    finally:
+        http_log.removeHandler(handler)
+
+    assert r.status_code == 202, r.text
+    stages = [part.split(";")[0] for part in r.headers["Server-Timing"].split(", ")]
+    assert stages == ["auth", "media", "body", "s3", "ddb", "sqs", "total"]
+
+    logged = json.loads(JsonFormatter().format(records[-1]))
+    assert set(logged["timings"]) == {"auth", "media", "body", "s3", "ddb", "sqs"}
+
+
+def test_server_timing_header_is_off_by_default(upload_client):
+    # tempos internos não vão para clientes públicos sem SERVER_TIMING_HEADER=true
+    assert type(settings).model_fields["server_timing_header"].default is False
+    r = upload_client.get("/videos/nao-existe")
+    assert "Server-Timing" not in r.headers
@@ -0,0 +1,156 @@
+from types import SimpleNamespace
+
+import boto3
+import httpx
+import pytest
+from botocore.stub import Stubber
+from fastapi.testclient import TestClient
+
+import app.aws as aws_mod
+import app.core.auth as core_auth
+from app.core import tracing
+from app.infrastructure.clients.auth_client import AuthClient
+from app.main import app
+
+MP4_BYTES = b"\x00\x00\x00\x18ftypisom\x00\x00\x02\x00isomiso2"
+TRACEPARENT = "00-0af7651916cd43dd8448eb211c80319c-b7ad6b7169203331-01"
+
+
+def _sqs_client():
+    return boto3.client(
+        "sqs", region_name="us-east-1", endpoint_url="http://sqs.local",
+        aws_access_key_id="test", aws_secret_access_key="test",
+    )
+
+
+# ---------- desligado: sem custo ----------
+
+def test_disabled_tracing_is_noop():
+    assert not tracing.tracing_enabled()
+    assert tracing.span("x") is tracing.span("y")  # mesmo nullcontext compartilhado
+    attrs = {"encoding": {"DataType": "String", "StringValue": "json"}}
+    assert tracing.inject_message_attributes(dict(attrs)) == attrs
+    assert tracing.inject_headers({"a": "b"}) == {"a": "b"}
+    assert tracing.current_trace_id() is None
+
+    registered = []
+    client = SimpleNamespace(meta=SimpleNamespace(events=SimpleNamespace(register=lambda *a: registered.append(a))))
+    assert tracing.instrument_tracing(client, "sqs") is client
+    assert registered == []  # nenhum hook botocore no caminho quente
+
+
+# ---------- ligado ----------
+
+@pytest.fixture
+def exporter():
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+    exp = InMemorySpanExporter()
+    assert tracing.setup_tracing(SimpleSpanProcessor(exp))
+    yield exp
+    tracing.shutdown_tracing()
+
+
+def test_boto3_calls_become_client_spans(exporter):
+    client = tracing.instrument_tracing(_sqs_client(), "sqs")
+    with Stubber(client) as stub:
+        stub.add_response("send_message", {"MessageId": "m1", "MD5OfMessageBody": "d41d8cd98f00b204e9800998ecf8427e"})
+        with tracing.span("parent"):
+            client.send_message(QueueUrl="http://sqs.local/1/q", MessageBody="")
+
+    spans = {s.name: s for s in exporter.get_finished_spans()}
+    assert spans["sqs.SendMessage"].attributes["rpc.method"] == "SendMessage"
+    assert spans["sqs.SendMessage"].parent.span_id == spans["parent"].context.span_id
+
+
+def test_boto3_span_closes_when_call_fails_before_sending(exporter):
+    from botocore.exceptions import ParamValidationError
+    from opentelemetry import trace
+
+    client = tracing.instrument_tracing(_sqs_client(), "sqs")
+    with tracing.span("parent"):
+        with pytest.raises(ParamValidationError):
+            client.send_message(QueueUrl="http://sqs.local/1/q")  # sem MessageBody
+        current = trace.get_current_span()
+
+    failed = {s.name: s for s in exporter.get_finished_spans()}["sqs.SendMessage"]
+    assert failed.status.status_code.name == "ERROR"
+    assert current.name == "parent"  # o span da chamada não ficou anexado ao contexto
+
+
+def test_storage_client_is_traced(exporter, monkeypatch):
+    import sys
+
+    import app.services.storage as storage
+
+    monkeypatch.setattr(storage.settings, "aws_backend", "boto3")
+    monkeypatch.setattr(storage.settings, "aws_endpoint_url", "http://localstack:4566")
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "test")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "test")
+    # o app.aws que o storage importou (test_aws_storage recarrega esses módulos)
+    aws = sys.modules[storage.get_s3_path_style.__module__]
+    aws.reset_clients()
+    try:
+        with Stubber(storage.get_s3_path_style()) as stub:
+            stub.add_response("put_object", {})
+            storage.upload_bytes("k", b"x")
+    finally:
+        aws.reset_clients()
+
+    assert "s3.PutObject" in {s.name for s in exporter.get_finished_spans()}
+
+
+def test_upload_trace_continues_incoming_context_and_reaches_sqs(monkeypatch):
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry import trace
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+    seen_headers = []
+
+    def handler(request):
+        seen_headers.append(dict(request.headers))
+        return httpx.Response(200, json={"id": 7, "username": "u", "email": "u@x", "role": "user", "is_active": True})
+
+    auth = AuthClient(base_url="http://auth.local")
+
+    async def fake_get_client():
+        return httpx.AsyncClient(base_url="http://auth.local", transport=httpx.MockTransport(handler))
+
+    monkeypatch.setattr(auth, "_get_client", fake_get_client)
+    aws_mod.reset_clients()
+    exp = InMemorySpanExporter()
+    try:
+        with TestClient(app) as client:
+            tracing.setup_tracing(SimpleSpanProcessor(exp))  # depois do startup (lifespan não liga sem OTEL_ENABLED)
+            core_auth.set_auth_client(auth)
+            queue = aws_mod.sqs.create_queue(QueueName="traced")["QueueUrl"]
+            monkeypatch.setattr("app.config.settings.sqs_queue_url", queue)
+            r = client.post(
+                "/videos/upload",
+                files={"file": ("a.mp4", MP4_BYTES, "video/mp4")},
+                data={"titulo": "t", "autor": "a"},
+                headers={"Authorization": "Bearer tok", "traceparent": TRACEPARENT},
+            )
+            assert r.status_code == 202, r.text
+            msg = aws_mod.sqs.receive_message(QueueUrl=queue, MessageAttributeNames=["All"])["Messages"][0]
+    finally:
+        tracing.shutdown_tracing()
+        aws_mod.reset_clients()
+
+    spans = {s.name: s for s in exp.get_finished_spans()}
+    trace_id = int(TRACEPARENT.split("-")[1], 16)
+    server = spans["POST /videos/upload"]
+    assert server.context.trace_id == trace_id
+    assert server.attributes["http.response.status_code"] == 202
+    assert spans["AuthClient.me"].parent.span_id == server.context.span_id
+    publish = spans["publish video job"]
+    assert publish.context.trace_id == trace_id
+
+    # o /me recebeu o contexto e o worker consegue continuar o trace da mensagem
+    assert seen_headers[0]["traceparent"].split("-")[1] == TRACEPARENT.split("-")[1]
+    ctx = tracing.context_from_message_attributes(msg["MessageAttributes"])
+    parent = trace.get_current_span(ctx).get_span_context()
+    assert parent.trace_id == trace_id and parent.span_id == publish.context.span_id
@@ -0,0 +1,92 @@
+import io
+import tempfile
+import tracemalloc
+
+import pytest
+from starlette.datastructures import UploadFile
+from starlette.formparsers import MultiPartParser
+
+import app.utils.s3 as s3mod
+import app.utils.spool as spool
+
+
+@pytest.fixture
+def restore_spool_globals():
+    max_file_size, tempdir = MultiPartParser.max_file_size, tempfile.tempdir
+    yield
+    MultiPartParser.max_file_size, tempfile.tempdir = max_file_size, tempdir
+
+
+def test_configure_spooling_sets_threshold_and_dir(monkeypatch, tmp_path, restore_spool_globals):
+    target = tmp_path / "spool"
+    monkeypatch.setattr(spool.settings, "upload_spool_max_memory_mb", 3, raising=False)
+    monkeypatch.setattr(spool.settings, "upload_spool_dir", str(target), raising=False)
+
+    spool.configure_spooling()
+
+    assert MultiPartParser.max_file_size == 3 * 1024 * 1024
+    assert tempfile.gettempdir() == str(target)
+    assert target.is_dir()
+
+
+@pytest.mark.asyncio
+async def test_upload_body_small_is_bytes_large_is_file(monkeypatch):
+    monkeypatch.setattr(spool.settings, "upload_spool_max_memory_mb", 1, raising=False)
+
+    small = UploadFile(io.BytesIO(b"abc"), size=3)
+    assert await spool.upload_body(small, spool.upload_size(small)) == b"abc"
+
+    raw = io.BytesIO(b"x" * (1024 * 1024 + 1))
+    raw.seek(10)
+    large = UploadFile(raw)
+    size = spool.upload_size(large)
+    assert size == 1024 * 1024 + 1
+    body = await spool.upload_body(large, size)
+    assert body is raw and raw.tell() == 0
+
+
+class _StreamingS3:
+    """Consome as partes como o botocore faria (sem guardar nada)."""
+
+    def __init__(self):
+        self.received = 0
+
+    def create_multipart_upload(self, **kwargs):
+        return {"UploadId": "up"}
+
+    def upload_part(self, **kwargs):
+        self.received += len(kwargs["Body"])
+        return {"ETag": f'"{kwargs["PartNumber"]}"'}
+
+    def complete_multipart_upload(self, **kwargs):
+        pass
+
+    def abort_multipart_upload(self, **kwargs):
+        pass
+
+
+def test_spooled_upload_peak_memory_stays_flat(monkeypatch, tmp_path):
+    """Arquivo bem maior que o threshold: o pico no heap fica em ~concorrência x parte."""
+    mb = 1024 * 1024
+    size = 48 * mb
+    path = tmp_path / "big.mp4"
+    with open(path, "wb") as f:
+        for _ in range(size // mb):
+            f.write(b"\x00" * mb)
+
+    fake = _StreamingS3()
+    monkeypatch.setattr(s3mod, "s3", fake, raising=True)
+    monkeypatch.setattr(s3mod.settings, "s3_multipart_threshold_mb", 1, raising=False)
+    monkeypatch.setattr(s3mod.settings, "s3_part_size_mb", 1, raising=False)
+    monkeypatch.setattr(s3mod.settings, "s3_upload_concurrency", 2, raising=False)
+
+    with open(path, "rb") as body:
+        tracemalloc.start()
+        try:
+            s3mod.put_object("b", "k", body, "video/mp4")
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    assert fake.received == size
+    assert peak < 8 * mb  # o arquivo inteiro (48 MB) nunca passa pelo heap
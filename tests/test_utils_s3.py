@@ -12,6 +12,7 @@ class DummyS3OK:
 
     def put_object(self, **kwargs):
         self.calls.append(kwargs)  # registra chamada e segue
+        return {}
 
 
 class Boom(Exception):
@@ -106,3 +107,152 @@ def test_put_object_failure_increments_error_and_reraises(monkeypatch):
 
     # métrica incrementada com status error
     assert ("inc", {"op": "put", "status": "error"}, 1) in counter.records
+
+
+# ---------- upload multipart ----------
+
+class DummyS3Multipart:
+    def __init__(self, fail_part=None, fail_times=0):
+        import threading
+        self.lock = threading.Lock()
+        self.parts = {}
+        self.attempts = {}
+        self.completed = None
+        self.aborted = False
+        self.fail_part = fail_part
+        self.fail_times = fail_times
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def create_multipart_upload(self, **kwargs):
+        return {"UploadId": "up-1"}
+
+    def upload_part(self, **kwargs):
+        import time
+        n = kwargs["PartNumber"]
+        with self.lock:
+            self.attempts[n] = self.attempts.get(n, 0) + 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            should_fail = n == self.fail_part and self.attempts[n] <= self.fail_times
+        time.sleep(0.01)
+        with self.lock:
+            self.in_flight -= 1
+        if should_fail:
+            raise Boom(f"parte {n}")
+        self.parts[n] = kwargs["Body"]
+        return {"ETag": f'"etag-{n}"'}
+
+    def complete_multipart_upload(self, **kwargs):
+        self.completed = kwargs
+
+    def abort_multipart_upload(self, **kwargs):
+        self.aborted = True
+
+
+def test_upload_multipart_parallel_parts_in_order(monkeypatch):
+    dummy = DummyS3Multipart()
+    monkeypatch.setattr(s3mod, "s3", dummy, raising=True)
+    data = bytes(range(256)) * 40  # 10240 bytes
+
+    result = s3mod.upload_multipart("b", "k", data, "video/mp4", part_size=1000, concurrency=3, max_retries=0)
+
+    assert result.size == len(data) and result.parts == 11
+    assert b"".join(dummy.parts[n] for n in sorted(dummy.parts)) == data
+    parts = dummy.completed["MultipartUpload"]["Parts"]
+    assert [p["PartNumber"] for p in parts] == list(range(1, 12))
+    assert parts[0]["ETag"] == '"etag-1"'
+    assert 1 < dummy.max_in_flight <= 3
+    assert dummy.aborted is False
+
+
+def test_upload_multipart_retries_only_failed_part(monkeypatch):
+    dummy = DummyS3Multipart(fail_part=2, fail_times=1)
+    monkeypatch.setattr(s3mod, "s3", dummy, raising=True)
+    monkeypatch.setattr(s3mod.time, "sleep", lambda s: None)
+
+    s3mod.upload_multipart("b", "k", b"x" * 30, "video/mp4", part_size=10, concurrency=2, max_retries=2)
+
+    assert dummy.attempts == {1: 1, 2: 2, 3: 1}
+    assert dummy.completed is not None
+
+
+def test_upload_multipart_aborts_when_part_exhausts_retries(monkeypatch):
+    dummy = DummyS3Multipart(fail_part=1, fail_times=99)
+    counter = DummyCounter()
+    monkeypatch.setattr(s3mod, "s3", dummy, raising=True)
+    monkeypatch.setattr(s3mod, "S3_OPS", counter, raising=True)
+    monkeypatch.setattr(s3mod.time, "sleep", lambda s: None)
+
+    with pytest.raises(Boom):
+        s3mod.upload_multipart("b", "k", b"x" * 30, "video/mp4", part_size=10, concurrency=1, max_retries=1)
+
+    assert dummy.aborted is True
+    assert dummy.completed is None
+    assert ("inc", {"op": "multipart", "status": "error"}, 1) in counter.records
+
+
+def test_put_object_switches_to_multipart_above_threshold(monkeypatch):
+    dummy = DummyS3Multipart()
+    monkeypatch.setattr(s3mod, "s3", dummy, raising=True)
+    monkeypatch.setattr(s3mod.settings, "s3_multipart_threshold_mb", 1, raising=False)
+    monkeypatch.setattr(s3mod.settings, "s3_part_size_mb", 1, raising=False)
+
+    s3mod.put_object("b", "k", b"\x01" * (1024 * 1024 + 1), "video/mp4")
+
+    assert sorted(dummy.parts) == [1, 2]
+    assert dummy.completed["UploadId"] == "up-1"
+
+
+# ---------- checksums ----------
+
+def test_put_object_lets_botocore_hash_and_reads_checksum_from_response(monkeypatch):
+    import base64, hashlib
+    digest = hashlib.sha256(b"video-bytes").digest()
+
+    class _ChecksumS3(DummyS3OK):
+        def put_object(self, **kwargs):
+            super().put_object(**kwargs)
+            return {"ETag": '"x"', "ChecksumSHA256": base64.b64encode(digest).decode()}
+
+    dummy_s3 = _ChecksumS3()
+    monkeypatch.setattr(s3mod, "s3", dummy_s3, raising=True)
+    monkeypatch.setattr(s3mod.hashlib, "sha256", None)  # nenhuma passada local sobre o corpo
+
+    result = s3mod.put_object("b", "k", b"video-bytes", "video/mp4")
+
+    assert dummy_s3.calls[0]["ChecksumAlgorithm"] == "SHA256"
+    assert "ChecksumSHA256" not in dummy_s3.calls[0]
+    assert result.sha256 == digest.hex()
+
+
+def test_put_object_hashes_locally_when_response_has_no_checksum(monkeypatch):
+    import hashlib
+    monkeypatch.setattr(s3mod, "s3", DummyS3OK(), raising=True)
+
+    result = s3mod.put_object("b", "k", b"video-bytes", "video/mp4")
+
+    assert result.sha256 == hashlib.sha256(b"video-bytes").hexdigest()
+
+
+def test_upload_multipart_checksums_per_part_and_whole_object(monkeypatch):
+    import base64, hashlib, io
+    dummy = DummyS3Multipart()
+    monkeypatch.setattr(s3mod, "s3", dummy, raising=True)
+    data = bytes(range(256)) * 20
+
+    hashed = []
+    real_sha256 = hashlib.sha256
+    monkeypatch.setattr(s3mod.hashlib, "sha256", lambda data=b"": hashed.append(len(data)) or real_sha256(data))
+
+    result = s3mod.upload_multipart("b", "k", io.BytesIO(data), "video/mp4", part_size=1000, concurrency=2)
+    hashed_bytes = sum(hashed)
+
+    parts = dummy.completed["MultipartUpload"]["Parts"]
+    digests = [hashlib.sha256(dummy.parts[p["PartNumber"]]).digest() for p in parts]
+    for part, digest in zip(parts, digests):
+        assert part["ChecksumSHA256"] == base64.b64encode(digest).decode()
+    # checksum composto do S3, derivado dos digests das partes
+    assert result.sha256 == f"{hashlib.sha256(b''.join(digests)).hexdigest()}-{len(parts)}"
+    # cada byte hasheado uma vez só (+ 32 bytes por parte no composto)
+    assert hashed_bytes == len(data) + 32 * len(parts)
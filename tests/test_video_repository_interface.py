@@ -54,3 +54,19 @@ def test_concrete_inmemory_repo_implements_contract_and_calls_super_to_cover_pas
     repo.update_status("vid-1", "DONE")
     got2 = repo.get("vid-1")
     assert got2 is not None and got2["status"] == "DONE"
+
+
+def test_default_update_status_many_isolates_failures():
+    class StrictRepo(IVideoRepository):
+        def put(self, item: dict) -> None: ...
+        def get(self, id_video: str): return None
+        def list_by_user(self, user_id) -> list: return []
+        def update_status(self, id_video: str, status: str, *, expected_version=None) -> dict:
+            if id_video == "ruim":
+                raise RuntimeError("conflito")
+            return {"id_video": id_video, "status": status}
+
+    results = StrictRepo().update_status_many([("a", "DONE"), ("ruim", "DONE"), ("b", "ERROR")])
+    assert [r.ok for r in results] == [True, False, True]
+    assert results[2].item == {"id_video": "b", "status": "ERROR"}
+    assert str(results[1].error) == "conflito"
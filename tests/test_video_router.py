@@ -1,5 +1,6 @@
 import io
 import json
+from types import SimpleNamespace
 import pytest
 from fastapi.testclient import TestClient
 
@@ -7,6 +8,10 @@ from app.main import app
 from app.routers import videos as videos_router
 from app.domain.repositories.video_repository_interface import IVideoRepository
 from app.auth import require_user  # << importa para sobrescrever
+from app.services.job_codec import decode_job
+
+# header mínimo de MP4 (box ftyp) para passar pelo sniffer de container
+MP4_BYTES = b"\x00\x00\x00\x18ftypisom\x00\x00\x02\x00isomiso2"
 
 # ========= Repositórios fakes =========
 class FakeRepoOK(IVideoRepository):
@@ -136,6 +141,7 @@ def test_upload_success(monkeypatch, client):
     calls = {}
     def fake_put_object(bucket, key, data, content_type):
         calls.update(dict(bucket=bucket, key=key, data=data, content_type=content_type))
+        return SimpleNamespace(sha256="ab" * 32)
     monkeypatch.setattr(videos_router, "put_object", fake_put_object, raising=True)
 
     class _SQS:
@@ -143,7 +149,7 @@ def test_upload_success(monkeypatch, client):
             calls["sqs"] = kwargs
     monkeypatch.setattr(videos_router, "sqs", _SQS(), raising=True)
 
-    files = {"file": ("video.mp4", b"\x00\x01\x02", "video/mp4")}
+    files = {"file": ("video.mp4", MP4_BYTES, "video/mp4")}
     data = {"titulo": " Meu vídeo ", "autor": " Iana "}
     resp = client.post("/videos/upload", files=files, data=data)
     assert resp.status_code == 202, resp.text
@@ -154,9 +160,71 @@ def test_upload_success(monkeypatch, client):
     assert body["s3_key"] == "folder/my.mp4"
     assert calls["bucket"] == "video-service-bucket"
     assert calls["key"] == "folder/my.mp4"
-    assert calls["data"] == b"\x00\x01\x02"
+    assert calls["data"] == MP4_BYTES
     assert calls["content_type"] == "video/mp4"
     assert "MessageBody" in calls["sqs"]
+    job = decode_job(calls["sqs"]["MessageBody"], calls["sqs"]["MessageAttributes"])
+    assert job.id_video == body["id_video"]
+    assert (job.bucket, job.key) == ("video-service-bucket", "folder/my.mp4")
+    assert job.size == len(MP4_BYTES)
+    assert job.sha256 == "ab" * 32
+    assert job.media["container"] == "mp4"
+
+def test_upload_runs_boto3_calls_off_the_event_loop(monkeypatch, client):
+    import asyncio
+
+    def on_loop() -> bool:
+        try:
+            asyncio.get_running_loop()
+            return True
+        except RuntimeError:
+            return False
+
+    seen = {}
+    monkeypatch.setattr(videos_router, "put_object", lambda *a, **k: seen.setdefault("s3", on_loop()), raising=True)
+    real_sniff = videos_router.sniff_container
+
+    def sniff(head):
+        seen["media"] = on_loop()  # leituras/seeks no spool não bloqueiam o loop
+        return real_sniff(head)
+    monkeypatch.setattr(videos_router, "sniff_container", sniff, raising=True)
+
+    class _Repo(FakeRepoOK):
+        def put(self, item: dict) -> None:
+            seen["ddb"] = on_loop()
+    app.dependency_overrides[videos_router.get_video_repo] = lambda: _Repo()
+
+    class _SQS:
+        def send_message(self, **kwargs):
+            seen["sqs"] = on_loop()
+    monkeypatch.setattr(videos_router, "sqs", _SQS(), raising=True)
+
+    files = {"file": ("video.mp4", MP4_BYTES, "video/mp4")}
+    resp = client.post("/videos/upload", files=files, data={"titulo": "t", "autor": "a"})
+    assert resp.status_code == 202, resp.text
+    assert seen == {"media": False, "s3": False, "ddb": False, "sqs": False}
+
+def test_upload_above_spool_threshold_hands_file_object_to_s3(monkeypatch, client):
+    from app.config import settings
+    monkeypatch.setattr(settings, "max_upload_mb", 200, raising=False)
+    monkeypatch.setattr(settings, "upload_spool_max_memory_mb", 0, raising=False)
+    monkeypatch.setattr(videos_router, "build_s3_key", lambda fname: ("folder", "folder/big.mp4"))
+
+    calls = {}
+    def fake_put_object(bucket, key, data, content_type):
+        calls["is_bytes"] = isinstance(data, bytes)
+        calls["content"] = data.read()
+    monkeypatch.setattr(videos_router, "put_object", fake_put_object, raising=True)
+
+    class _SQS:
+        def send_message(self, **kwargs): pass
+    monkeypatch.setattr(videos_router, "sqs", _SQS(), raising=True)
+
+    files = {"file": ("big.mp4", MP4_BYTES + b"\x00" * 2048, "video/mp4")}
+    resp = client.post("/videos/upload", files=files, data={"titulo": "t", "autor": "a"})
+    assert resp.status_code == 202, resp.text
+    assert calls["is_bytes"] is False
+    assert calls["content"] == MP4_BYTES + b"\x00" * 2048
 
 def test_upload_unsupported_mime(client):
     files = {"file": ("file.txt", b"hello", "text/plain")}
@@ -165,6 +233,15 @@ def test_upload_unsupported_mime(client):
     assert resp.status_code == 415
     assert "não suportado" in resp.json()["detail"].lower()
 
+def test_upload_rejects_mislabeled_content_before_s3(monkeypatch, client):
+    def should_not_upload(*args, **kwargs):
+        raise AssertionError("nada deveria ir para o S3")
+    monkeypatch.setattr(videos_router, "put_object", should_not_upload, raising=True)
+    files = {"file": ("video.mp4", b"%PDF-1.7 nao e video", "video/mp4")}
+    resp = client.post("/videos/upload", files=files, data={"titulo": "t", "autor": "a"})
+    assert resp.status_code == 415
+    assert "não reconhecido" in resp.json()["detail"]
+
 def test_upload_too_large(monkeypatch, client):
     from app.config import settings
     monkeypatch.setattr(settings, "max_upload_mb", 0, raising=False)
@@ -182,7 +259,7 @@ def test_upload_storage_failure(monkeypatch, client):
     def boom(*args, **kwargs):
         raise RuntimeError("S3 down")
     monkeypatch.setattr(videos_router, "put_object", boom, raising=True)
-    files = {"file": ("video.mp4", b"1", "video/mp4")}
+    files = {"file": ("video.mp4", MP4_BYTES, "video/mp4")}
     data = {"titulo": "t", "autor": "a"}
     resp = client.post("/videos/upload", files=files, data=data)
     assert resp.status_code == 502
@@ -199,7 +276,7 @@ def test_upload_sqs_failure(monkeypatch, client_no_raise):
         def send_message(self, **kwargs):
             raise RuntimeError("SQS indisponível")
     monkeypatch.setattr(videos_router, "sqs", _SQS(), raising=True)
-    files = {"file": ("video.mp4", b"1", "video/mp4")}
+    files = {"file": ("video.mp4", MP4_BYTES, "video/mp4")}
     data = {"titulo": "t", "autor": "a"}
     resp = client_no_raise.post("/videos/upload", files=files, data=data)
     assert resp.status_code == 500
@@ -232,3 +309,151 @@ def test_get_download_success(monkeypatch, client):
     resp = client.get("/videos/download/abc")
     assert resp.status_code == 200
     assert resp.json()["presigned_url"] == "https://signed.example/url"
+
+# ========= POST /videos/upload:batch =========
+class FakeRepoBatch(FakeRepoOK):
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+    def put(self, item: dict) -> None:
+        raise AssertionError("o lote deve usar put_many")
+    def put_many(self, items) -> None:
+        self.batches.append(list(items))
+
+def test_upload_batch_returns_result_per_file(monkeypatch, client):
+    from app.config import settings
+    monkeypatch.setattr(settings, "max_upload_mb", 200, raising=False)
+    monkeypatch.setattr(settings, "sqs_queue_url", "http://localhost:4566/000000000000/queue", raising=False)
+    repo = FakeRepoBatch()
+    app.dependency_overrides[videos_router.get_video_repo] = lambda: repo
+    monkeypatch.setattr(videos_router, "build_s3_key", lambda fname: ("f", f"f/{fname}"))
+    stored = []
+    def fake_put_object(bucket, key, data, content_type):
+        stored.append(key)
+        return SimpleNamespace(sha256="cd" * 32)
+    monkeypatch.setattr(videos_router, "put_object", fake_put_object, raising=True)
+
+    batches = []
+    class _SQS:
+        def send_message_batch(self, QueueUrl, Entries):
+            batches.append(Entries)
+            return {"Successful": [{"Id": e["Id"]} for e in Entries], "Failed": []}
+    monkeypatch.setattr(videos_router, "sqs", _SQS(), raising=True)
+
+    files = [("files", (f"v{i}.mp4", MP4_BYTES, "video/mp4")) for i in range(12)]
+    files.insert(3, ("files", ("notes.txt", b"hello", "text/plain")))
+    resp = client.post("/videos/upload:batch", files=files, data={"autor": " Iana "})
+    assert resp.status_code == 202, resp.text
+
+    body = resp.json()
+    assert (body["accepted"], body["failed"]) == (12, 1)
+    results = body["results"]
+    assert [r["filename"] for r in results][:4] == ["v0.mp4", "v1.mp4", "v2.mp4", "notes.txt"]
+    assert results[3]["status_code"] == 415 and results[3]["video"] is None
+    assert results[0]["video"]["titulo"] == "v0" and results[0]["video"]["autor"] == "Iana"
+    assert sorted(stored) == sorted(f"f/v{i}.mp4" for i in range(12))
+
+    # um único batch_writer e SendMessageBatch em blocos de até 10
+    assert len(repo.batches) == 1 and len(repo.batches[0]) == 12
+    assert [len(b) for b in batches] == [10, 2]
+    ids = {r["video"]["id_video"] for r in results if r["video"]}
+    jobs = {decode_job(e["MessageBody"], e["MessageAttributes"]).id_video for b in batches for e in b}
+    assert jobs == ids
+
+def test_upload_batch_marks_unpublished_jobs_and_validates_titles(monkeypatch, client):
+    from app.config import settings
+    monkeypatch.setattr(settings, "max_upload_mb", 200, raising=False)
+    app.dependency_overrides[videos_router.get_video_repo] = lambda: FakeRepoBatch()
+    monkeypatch.setattr(videos_router, "put_object", lambda *a, **k: None, raising=True)
+    class _SQS:
+        def send_message_batch(self, QueueUrl, Entries):
+            return {"Successful": [{"Id": "0"}], "Failed": [{"Id": "1", "SenderFault": False, "Code": "InternalError"}]}
+    monkeypatch.setattr(videos_router, "sqs", _SQS(), raising=True)
+
+    files = [("files", ("a.mp4", MP4_BYTES, "video/mp4")), ("files", ("b.mp4", MP4_BYTES, "video/mp4"))]
+    resp = client.post("/videos/upload:batch", files=files, data={"autor": "a", "titulos": ["A", "B"]})
+    assert resp.status_code == 202, resp.text
+    results = resp.json()["results"]
+    assert [r["status_code"] for r in results] == [202, 500]
+    assert [r["video"]["titulo"] for r in results] == ["A", "B"]
+
+    resp = client.post("/videos/upload:batch", files=files, data={"autor": "a", "titulos": ["só um"]})
+    assert resp.status_code == 422
+
+    monkeypatch.setattr(settings, "upload_batch_max_files", 1, raising=False)
+    resp = client.post("/videos/upload:batch", files=files, data={"autor": "a"})
+    assert resp.status_code == 413
+
+def test_upload_batch_isolates_unexpected_errors_and_observes_size_per_file(monkeypatch, client):
+    from prometheus_client import REGISTRY
+    from app.config import settings
+    monkeypatch.setattr(settings, "max_upload_mb", 200, raising=False)
+    app.dependency_overrides[videos_router.get_video_repo] = lambda: FakeRepoBatch()
+
+    monkeypatch.setattr(videos_router, "put_object", lambda *a, **k: None, raising=True)
+    real_upload_body = videos_router.upload_body
+
+    async def flaky_upload_body(file, size):
+        if file.filename == "bad.mp4":
+            raise OSError("spool ilegível")  # não é HTTPException: não pode derrubar o lote
+        return await real_upload_body(file, size)
+    monkeypatch.setattr(videos_router, "upload_body", flaky_upload_body, raising=True)
+
+    class _SQS:
+        def send_message_batch(self, QueueUrl, Entries):
+            return {"Successful": [{"Id": e["Id"]} for e in Entries], "Failed": []}
+    monkeypatch.setattr(videos_router, "sqs", _SQS(), raising=True)
+
+    size_count = lambda: REGISTRY.get_sample_value("video_upload_size_bytes_count") or 0.0
+    size_sum = lambda: REGISTRY.get_sample_value("video_upload_size_bytes_sum") or 0.0
+    before_count, before_sum = size_count(), size_sum()
+
+    files = [("files", (name, MP4_BYTES, "video/mp4")) for name in ("a.mp4", "bad.mp4", "b.mp4")]
+    resp = client.post("/videos/upload:batch", files=files, data={"autor": "a"})
+    assert resp.status_code == 202, resp.text
+    results = resp.json()["results"]
+    assert [r["status_code"] for r in results] == [202, 500, 202]
+    assert "spool ilegível" in results[1]["detail"]
+
+    # uma observação por arquivo aceito, com o tamanho do arquivo (não o total do lote)
+    assert size_count() - before_count == 2
+    assert size_sum() - before_sum == 2 * len(MP4_BYTES)
+
+def test_upload_batch_maps_persistence_failure_to_per_file_errors(monkeypatch, client):
+    from prometheus_client import REGISTRY
+    from app.config import settings
+    monkeypatch.setattr(settings, "max_upload_mb", 200, raising=False)
+    monkeypatch.setattr(videos_router, "build_s3_key", lambda fname: ("f", f"f/{fname}"))
+    monkeypatch.setattr(videos_router, "put_object", lambda *a, **k: None, raising=True)
+
+    class _FlakyRepo(FakeRepoOK):
+        def put_many(self, items) -> None:
+            raise RuntimeError("BatchWriteItem indisponível")
+        def put(self, item: dict) -> None:
+            if item["titulo"] == "bad":
+                raise RuntimeError("linha recusada")
+    app.dependency_overrides[videos_router.get_video_repo] = lambda: _FlakyRepo()
+
+    deleted, published = [], []
+    class _S3:
+        def delete_object(self, Bucket, Key):
+            deleted.append(Key)
+    monkeypatch.setattr(videos_router, "s3", _S3(), raising=True)
+    class _SQS:
+        def send_message_batch(self, QueueUrl, Entries):
+            published.extend(decode_job(e["MessageBody"], e["MessageAttributes"]).id_video for e in Entries)
+            return {"Successful": [{"Id": e["Id"]} for e in Entries], "Failed": []}
+    monkeypatch.setattr(videos_router, "sqs", _SQS(), raising=True)
+
+    errors = lambda: REGISTRY.get_sample_value("video_upload_batch_files_total", {"status": "error"}) or 0.0
+    before = errors()
+    files = [("files", (f"{name}.mp4", MP4_BYTES, "video/mp4")) for name in ("ok", "bad")]
+    resp = client.post("/videos/upload:batch", files=files, data={"autor": "a"})
+
+    assert resp.status_code == 202, resp.text
+    results = resp.json()["results"]
+    assert [r["status_code"] for r in results] == [202, 500]
+    assert "linha recusada" in results[1]["detail"] and results[1]["video"] is None
+    assert deleted == ["f/bad.mp4"]  # sem linha no DynamoDB, o objeto não fica órfão
+    assert published == [results[0]["video"]["id_video"]]
+    assert errors() - before == 1
@@ -0,0 +1,173 @@
+import uuid
+
+import pytest
+from prometheus_client import REGISTRY
+
+import app.aws as aws_mod
+from app.infrastructure.repositories import write_behind as wb
+from app.infrastructure.repositories.video_repo import VideoRepo
+from app.services.job_codec import decode_job
+
+
+def _item(titulo: str = "wb") -> dict:
+    return {"id_video": str(uuid.uuid4()), "titulo": titulo, "autor": "a", "status": "UPLOADED"}
+
+
+@pytest.fixture
+def buffered(monkeypatch):
+    monkeypatch.setattr("app.config.settings.aws_backend", "memory")
+    aws_mod.reset_clients()  # tabela e resource do mesmo backend em memória
+    buffer = wb.start_write_behind(max_items=1000, flush_ms=20, max_retries=3)
+    try:
+        yield buffer
+    finally:
+        wb.stop_write_behind()
+        aws_mod.reset_clients()
+
+
+def test_puts_are_batched_and_drained_on_stop(buffered, monkeypatch):
+    real = aws_mod.get_ddb()
+    calls = []
+
+    class _CountingDDB:
+        def batch_write_item(self, RequestItems):
+            calls.append(sum(len(v) for v in RequestItems.values()))
+            return real.batch_write_item(RequestItems=RequestItems)
+
+    monkeypatch.setattr(aws_mod, "ddb", _CountingDDB())
+    repo = VideoRepo()
+    items = [_item() for _ in range(60)]
+    written = [buffered.put(item) for item in items]
+
+    assert repo.get(items[-1]["id_video"])["titulo"] == "wb"  # visível antes do flush
+    wb.stop_write_behind()
+    assert all(w.done() and w.exception() is None for w in written)
+
+    assert wb.write_behind() is None and buffered.pending(items[0]["id_video"]) is None
+    assert sum(calls) == 60 and max(calls) <= wb.BATCH_WRITE_MAX and len(calls) >= 3
+    assert all(repo.get(item["id_video"]) is not None for item in items)
+    assert REGISTRY.get_sample_value("dynamodb_write_behind_buffer_items") == 0
+    assert REGISTRY.get_sample_value("dynamodb_write_behind_flush_seconds_count") >= 3
+
+
+def test_unprocessed_items_are_retried(buffered, monkeypatch):
+    real = aws_mod.get_ddb()
+    calls = []
+
+    class _ThrottledDDB:
+        def batch_write_item(self, RequestItems):
+            calls.append(RequestItems)
+            (table, requests), = RequestItems.items()
+            if len(calls) == 1:  # primeira chamada: metade volta como UnprocessedItems
+                real.batch_write_item(RequestItems={table: requests[:1]})
+                return {"UnprocessedItems": {table: requests[1:]}}
+            return real.batch_write_item(RequestItems=RequestItems)
+
+    monkeypatch.setattr(aws_mod, "ddb", _ThrottledDDB())
+    monkeypatch.setattr(buffered, "backoff", 0.001)
+    repo = VideoRepo()
+    items = [_item() for _ in range(2)]
+    repo.put_many(items)
+    buffered.flush()
+
+    assert len(calls) == 2 and len(next(iter(calls[1].values()))) == 1
+    assert all(aws_mod.table_videos.get_item(Key={"id_video": i["id_video"]}).get("Item") for i in items)
+    assert buffered.failed == 0
+
+
+def test_items_are_dropped_after_max_retries(buffered, monkeypatch):
+    class _DownDDB:
+        def batch_write_item(self, RequestItems):
+            raise RuntimeError("DynamoDB indisponível")
+
+    monkeypatch.setattr(aws_mod, "ddb", _DownDDB())
+    monkeypatch.setattr(buffered, "backoff", 0.001)
+    before = REGISTRY.get_sample_value("dynamodb_write_behind_failed_items_total") or 0.0
+    with pytest.raises(wb.WriteBehindDropped):
+        VideoRepo().put(_item())  # o request falha: nada de 202/job para item descartado
+
+    assert buffered.failed == 1
+    assert REGISTRY.get_sample_value("dynamodb_write_behind_failed_items_total") - before == 1
+
+
+def test_full_buffer_reports_so_repo_writes_synchronously():
+    buffer = wb.WriteBehindBuffer(max_items=1)  # sem thread: nada sai do buffer
+    first, second = _item(), _item()
+    assert buffer.put(first) is not None
+    assert buffer.put(second) is None
+    assert buffer.pending(first["id_video"]) is first and buffer.pending(second["id_video"]) is None
+
+
+def test_upload_job_is_published_only_after_the_row_is_written(buffered, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app.auth import require_user
+    from app.domain.models.user_model import UserContext
+    from app.main import app
+    from app.routers import videos as videos_router
+
+    published = []
+
+    class _SQS:
+        def send_message(self, **kwargs):
+            id_video = decode_job(kwargs["MessageBody"], kwargs["MessageAttributes"]).id_video
+            # o worker que receber o job já encontra a linha gravada na tabela
+            published.append(aws_mod.table_videos.get_item(Key={"id_video": id_video}).get("Item") is not None)
+
+    monkeypatch.setattr(videos_router, "sqs", _SQS())
+    app.dependency_overrides[require_user] = lambda: UserContext(id=1, username="u", email="u@x", role="user", is_active=True)
+    try:
+        client = TestClient(app)  # sem lifespan: o buffer da fixture segue ativo
+        files = {"file": ("a.mp4", b"\x00\x00\x00\x18ftypisom\x00\x00\x02\x00isomiso2", "video/mp4")}
+        resp = client.post("/videos/upload", files=files, data={"titulo": "t", "autor": "a"})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert resp.status_code == 202, resp.text
+    assert published == [True]
+
+
+def test_update_status_waits_only_for_its_own_row(monkeypatch):
+    import threading
+
+    monkeypatch.setattr("app.config.settings.aws_backend", "memory")
+    aws_mod.reset_clients()
+    buffer = wb.WriteBehindBuffer()  # sem thread: o flusher é simulado abaixo
+    monkeypatch.setattr("app.infrastructure.repositories.video_repo.write_behind", lambda: buffer)
+    mine, other = _item(), _item()
+    buffer.put(mine)
+    buffer.put(other)  # nunca é gravado: um flush() da fila inteira travaria o update
+
+    def flush_only_mine():
+        aws_mod.table_videos.put_item(Item=mine)
+        buffer._settle([buffer._pending[mine["id_video"]]], set(), None)
+
+    threading.Timer(0.05, flush_only_mine).start()
+    try:
+        updated = VideoRepo().update_status(mine["id_video"], "PROCESSING")
+    finally:
+        aws_mod.reset_clients()
+
+    assert updated["status"] == "PROCESSING"
+    assert buffer.pending(other["id_video"]) is other
+
+
+def test_stop_fails_leftover_entries_and_refuses_new_puts():
+    buffer = wb.WriteBehindBuffer()  # thread nunca iniciada: nada drena a fila
+    written = buffer.put(_item())
+    buffer.stop()
+
+    with pytest.raises(wb.WriteBehindDropped):
+        written.result(timeout=1)
+    assert buffer.put(_item()) is None
+
+
+def test_duplicate_id_in_batch_resolves_with_the_stored_item(buffered):
+    buffer = wb.WriteBehindBuffer(flush_interval=0.02)  # enfileira antes de subir a thread: um lote só
+    first = _item("primeiro")
+    second = dict(first, titulo="segundo")
+    futures = [buffer.put(first), buffer.put(second)]
+    buffer.start().stop()
+
+    assert [f.result() for f in futures] == [second, second]
+    assert aws_mod.table_videos.get_item(Key={"id_video": first["id_video"]})["Item"]["titulo"] == "segundo"